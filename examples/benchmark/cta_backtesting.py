@@ -0,0 +1,115 @@
+"""
+Compare VectorBacktestingEngine against BacktestingEngine on time cost,
+and check trades generated by both engines are the same.
+
+Random walk minute bars are used, so no database is required.
+"""
+
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import numpy as np
+
+from vnpy.app.cta_strategy.backtesting import BacktestingEngine
+from vnpy.app.cta_strategy.vector_backtesting import VectorBacktestingEngine
+from vnpy.app.cta_strategy.strategies.atr_rsi_strategy import AtrRsiStrategy
+from vnpy.app.cta_strategy.strategies.boll_channel_strategy import BollChannelStrategy
+from vnpy.app.cta_strategy.strategies.double_ma_strategy import DoubleMaStrategy
+from vnpy.app.cta_strategy.strategies.king_keltner_strategy import KingKeltnerStrategy
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+
+
+def create_bars(count: int):
+    """"""
+    np.random.seed(0)
+    close = 3000 + np.cumsum(np.random.normal(0, 2, count)).round()
+    spread = np.abs(np.random.normal(0, 2, (3, count))).round()
+
+    bars = []
+    dt = datetime(2015, 1, 5, 9)
+    for i in range(count):
+        bar = BarData(
+            symbol="IF888",
+            exchange=Exchange.CFFEX,
+            datetime=dt,
+            interval=Interval.MINUTE,
+            volume=100,
+            open_price=close[i] + spread[0][i] - spread[1][i],
+            high_price=close[i] + spread[0][i] + spread[2][i],
+            low_price=close[i] - spread[1][i] - spread[2][i],
+            close_price=close[i],
+            gateway_name="DB"
+        )
+        bars.append(bar)
+
+        # 240 minute bars each day
+        dt += timedelta(minutes=1)
+        if dt.hour == 13:
+            dt += timedelta(hours=20)
+
+    return bars
+
+
+def run(engine_class: type, strategy_class: type, bars: list):
+    """"""
+    engine = engine_class()
+    engine.output = lambda msg: None
+    engine.set_parameters(
+        vt_symbol="IF888.CFFEX",
+        interval="1m",
+        start=bars[0].datetime,
+        end=bars[-1].datetime,
+        rate=0.3 / 10000,
+        slippage=0.2,
+        size=300,
+        pricetick=0.2,
+        capital=1_000_000,
+    )
+    engine.add_strategy(strategy_class, {})
+
+    if engine_class is VectorBacktestingEngine:
+        engine.set_history_data(bars)
+    else:
+        engine.history_data = bars
+
+    start = perf_counter()
+    engine.run_backtesting()
+    cost = perf_counter() - start
+
+    trades = [
+        (t.datetime, t.direction, t.offset, t.price, t.volume, t.time)
+        for t in engine.get_all_trades()
+    ]
+    closes = [
+        (r.date, r.close_price) for r in engine.get_all_daily_results()
+    ]
+    return cost, trades, closes
+
+
+def main():
+    """"""
+    bars = create_bars(240 * 250)
+    print(f"K线数量：{len(bars)}")
+
+    for strategy_class in [
+        AtrRsiStrategy,
+        BollChannelStrategy,
+        DoubleMaStrategy,
+        KingKeltnerStrategy,
+    ]:
+        cost, trades, closes = run(BacktestingEngine, strategy_class, bars)
+        vector_cost, vector_trades, vector_closes = run(
+            VectorBacktestingEngine, strategy_class, bars
+        )
+
+        same = trades == vector_trades and closes == vector_closes
+        print(
+            f"{strategy_class.__name__}\t成交：{len(trades)}\t"
+            f"原引擎：{cost:.2f}s\t向量化引擎：{vector_cost:.2f}s\t"
+            f"结果一致：{same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
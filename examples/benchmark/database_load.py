@@ -0,0 +1,94 @@
+"""
+Compare loading bar data as BarData objects against loading as structured
+array, with rows per second printed for each database driver.
+
+Random walk minute bars are saved into temporary SQLite and numpy databases
+in .vntrader folder, which are cleaned after test.
+"""
+
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import numpy as np
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database.initialize import init
+from vnpy.trader.object import BarData
+
+
+SYMBOL = "benchmark"
+PROFILES = {
+    "sqlite": {"driver": "sqlite", "database": "benchmark.db"},
+    "numpy": {"driver": "numpy", "database": "benchmark_numpy_db"},
+}
+
+
+def create_bars(count: int):
+    """"""
+    np.random.seed(0)
+    close = 3000 + np.cumsum(np.random.normal(0, 2, count)).round()
+
+    bars = []
+    dt = datetime(2015, 1, 5, 9)
+    for i in range(count):
+        bar = BarData(
+            symbol=SYMBOL,
+            exchange=Exchange.CFFEX,
+            datetime=dt,
+            interval=Interval.MINUTE,
+            volume=100,
+            open_price=close[i],
+            high_price=close[i] + 1,
+            low_price=close[i] - 1,
+            close_price=close[i],
+            gateway_name="DB"
+        )
+        bars.append(bar)
+
+        # 240 minute bars each day
+        dt += timedelta(minutes=1)
+        if dt.hour == 13:
+            dt += timedelta(hours=20)
+
+    return bars
+
+
+def measure(func, *args):
+    """"""
+    start = perf_counter()
+    data = func(*args)
+    cost = perf_counter() - start
+    return len(data), cost
+
+
+def main():
+    """"""
+    bars = create_bars(240 * 250)
+    print(f"K线数量：{len(bars)}")
+
+    args = (
+        SYMBOL,
+        Exchange.CFFEX,
+        Interval.MINUTE,
+        bars[0].datetime,
+        bars[-1].datetime
+    )
+
+    for name, settings in PROFILES.items():
+        manager = init(settings)
+        manager.clean(SYMBOL)
+        manager.save_bar_data(bars)
+
+        count, cost = measure(manager.load_bar_data, *args)
+        array_count, array_cost = measure(manager.load_bar_array, *args)
+
+        print(
+            f"{name}\t对象加载：{count / cost:,.0f}行/秒\t"
+            f"数组加载：{array_count / array_cost:,.0f}行/秒"
+        )
+
+        manager.clean(SYMBOL)
+
+
+if __name__ == "__main__":
+    main()
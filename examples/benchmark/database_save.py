@@ -0,0 +1,117 @@
+"""
+Compare saving bar and tick data with the bulk upsert path of SqlManager
+against the legacy model object path (chunks of 50 rows).
+
+Random walk data is saved into temporary SQLite database in .vntrader
+folder by default, set PROFILE to benchmark other SQL database.
+"""
+
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import numpy as np
+from peewee import chunked
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database.initialize import init
+from vnpy.trader.object import BarData, TickData
+
+
+SYMBOL = "benchmark"
+PROFILE = {"driver": "sqlite", "database": "benchmark.db"}
+
+
+def create_data(count: int):
+    """"""
+    np.random.seed(0)
+    close = 3000 + np.cumsum(np.random.normal(0, 2, count)).round()
+
+    bars = []
+    ticks = []
+    dt = datetime(2015, 1, 5, 9)
+    for i in range(count):
+        bar = BarData(
+            symbol=SYMBOL,
+            exchange=Exchange.CFFEX,
+            datetime=dt,
+            interval=Interval.MINUTE,
+            volume=100,
+            open_price=close[i],
+            high_price=close[i] + 1,
+            low_price=close[i] - 1,
+            close_price=close[i],
+            gateway_name="DB"
+        )
+        bars.append(bar)
+
+        tick = TickData(
+            symbol=SYMBOL,
+            exchange=Exchange.CFFEX,
+            datetime=dt,
+            name=SYMBOL,
+            volume=100 * i,
+            last_price=close[i],
+            bid_price_1=close[i] - 0.2,
+            ask_price_1=close[i] + 0.2,
+            bid_volume_1=10,
+            ask_volume_1=10,
+            gateway_name="DB"
+        )
+        ticks.append(tick)
+
+        dt += timedelta(minutes=1)
+
+    return bars, ticks
+
+
+def save_legacy(model, objs):
+    """
+    Saving path before bulk upsert, one model object for each row.
+    """
+    dicts = [obj.to_dict() for obj in objs]
+    with model._meta.database.atomic():
+        for c in chunked(dicts, 50):
+            model.insert_many(c).on_conflict_replace().execute()
+
+
+def measure(manager, func, datas):
+    """"""
+    manager.clean(SYMBOL)
+
+    start = perf_counter()
+    func(datas)
+    cost = perf_counter() - start
+
+    return len(datas) / cost
+
+
+def main():
+    """"""
+    bars, ticks = create_data(100_000)
+    manager = init(PROFILE)
+
+    legacy_bar = measure(
+        manager,
+        lambda datas: save_legacy(
+            manager.class_bar, [manager.class_bar.from_bar(d) for d in datas]
+        ),
+        bars
+    )
+    bulk_bar = measure(manager, manager.save_bar_data, bars)
+    print(f"K线\t原写入：{legacy_bar:,.0f}行/秒\t批量写入：{bulk_bar:,.0f}行/秒")
+
+    legacy_tick = measure(
+        manager,
+        lambda datas: save_legacy(
+            manager.class_tick, [manager.class_tick.from_tick(d) for d in datas]
+        ),
+        ticks
+    )
+    bulk_tick = measure(manager, manager.save_tick_data, ticks)
+    print(f"Tick\t原写入：{legacy_tick:,.0f}行/秒\t批量写入：{bulk_tick:,.0f}行/秒")
+
+    manager.clean(SYMBOL)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compare BinaryCodec against PickleCodec of vnpy.rpc, on size of packed
+data and time cost of pack/unpack for ticks, orders and contract lists.
+"""
+
+from datetime import datetime
+from time import perf_counter
+
+from vnpy.event import Event
+from vnpy.rpc import BinaryCodec, PickleCodec
+from vnpy.trader.constant import Direction, Exchange, Offset, Product, Status
+from vnpy.trader.event import EVENT_ORDER, EVENT_TICK
+from vnpy.trader.object import ContractData, OrderData, TickData
+
+
+def create_tick(i: int):
+    """"""
+    tick = TickData(
+        gateway_name="CTP",
+        symbol=f"rb{1900 + i % 12}",
+        exchange=Exchange.SHFE,
+        datetime=datetime.now(),
+        name="螺纹钢",
+        volume=100000 + i,
+        open_interest=2000000,
+        last_price=3500 + i % 10,
+        last_volume=3,
+        limit_up=3800,
+        limit_down=3200,
+        open_price=3480,
+        high_price=3520,
+        low_price=3470,
+        pre_close=3490,
+    )
+
+    for n in range(1, 6):
+        setattr(tick, f"bid_price_{n}", tick.last_price - n)
+        setattr(tick, f"ask_price_{n}", tick.last_price + n)
+        setattr(tick, f"bid_volume_{n}", 10 * n)
+        setattr(tick, f"ask_volume_{n}", 20 * n)
+
+    return tick
+
+
+def create_order(i: int):
+    """"""
+    return OrderData(
+        gateway_name="CTP",
+        symbol="rb1905",
+        exchange=Exchange.SHFE,
+        orderid=f"1_-123456_{i}",
+        direction=Direction.LONG,
+        offset=Offset.OPEN,
+        price=3500.0,
+        volume=10.0,
+        traded=5.0,
+        status=Status.PARTTRADED,
+        time="09:30:00",
+    )
+
+
+def create_contract(i: int):
+    """"""
+    return ContractData(
+        gateway_name="CTP",
+        symbol=f"rb{i}",
+        exchange=Exchange.SHFE,
+        name=f"螺纹钢{i}",
+        product=Product.FUTURES,
+        size=10,
+        pricetick=1.0,
+        history_data=True,
+    )
+
+
+def run_benchmark(name: str, data: list, codec, count: int):
+    """
+    Pack and unpack every item in data for count rounds.
+    """
+    packed = [codec.pack(d) for d in data]
+    size = sum(len(p) for p in packed) / len(packed)
+
+    start = perf_counter()
+    for _ in range(count):
+        for d in data:
+            codec.pack(d)
+    pack_cost = (perf_counter() - start) / count / len(data)
+
+    start = perf_counter()
+    for _ in range(count):
+        for p in packed:
+            codec.unpack(p)
+    unpack_cost = (perf_counter() - start) / count / len(data)
+
+    print(
+        f"{name:<10}{codec.name:<10}"
+        f"size {size:>10.0f} bytes    "
+        f"pack {pack_cost * 1_000_000:>10.2f} us    "
+        f"unpack {unpack_cost * 1_000_000:>10.2f} us"
+    )
+
+
+def main():
+    """"""
+    ticks = [["", Event(EVENT_TICK, create_tick(i))] for i in range(1000)]
+    orders = [["", Event(EVENT_ORDER, create_order(i))] for i in range(1000)]
+    contracts = [[True, [create_contract(i) for i in range(2000)]]]
+
+    for name, data, count in [
+        ("tick", ticks, 20),
+        ("order", orders, 20),
+        ("contracts", contracts, 5),
+    ]:
+        for codec in [PickleCodec(), BinaryCodec()]:
+            run_benchmark(name, data, codec, count)
+
+
+if __name__ == "__main__":
+    main()
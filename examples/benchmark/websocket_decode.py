@@ -0,0 +1,107 @@
+"""
+Compare decoders of vnpy.api.websocket against the plain json.loads(
+zlib.decompress(...)) used by gateways before, on synthetic Huobi (gzip)
+and OKEX (raw deflate) depth messages.
+"""
+
+import gzip
+import json
+import zlib
+from time import perf_counter
+
+from vnpy.api.websocket import JsonDecoder, ZlibJsonDecoder
+from vnpy.api.websocket.decoder import json_loads
+
+
+def create_huobi_depth(i: int, depth: int):
+    """"""
+    return {
+        "ch": "market.btcusdt.depth.step0",
+        "ts": 1550000000000 + i,
+        "tick": {
+            "bids": [[3500.0 - n * 0.01 - i % 7, 1.0 + n] for n in range(depth)],
+            "asks": [[3501.0 + n * 0.01 + i % 7, 2.0 + n] for n in range(depth)],
+            "ts": 1550000000000 + i,
+            "version": 100000 + i,
+        }
+    }
+
+
+def create_okex_depth(i: int, depth: int):
+    """"""
+    return {
+        "table": "spot/depth5",
+        "data": [{
+            "instrument_id": "BTC-USDT",
+            "asks": [[str(3501.0 + n * 0.1), str(1.0 + n), 1] for n in range(depth)],
+            "bids": [[str(3500.0 - n * 0.1), str(2.0 + n), 1] for n in range(depth)],
+            "timestamp": f"2019-02-01T00:00:{i % 60:02d}.000Z",
+        }]
+    }
+
+
+def compress_gzip(text: str):
+    """"""
+    return gzip.compress(text.encode())
+
+
+def compress_deflate(text: str):
+    """"""
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(text.encode()) + compressor.flush()
+
+
+class LegacyDecoder(JsonDecoder):
+    """
+    Decode in the way of gateways before decoder was introduced.
+    """
+
+    def __init__(self, wbits: int):
+        """"""
+        self.wbits = wbits
+
+    def decode(self, data: bytes):
+        """"""
+        return json.loads(zlib.decompress(data, self.wbits))
+
+
+def run_benchmark(name: str, packets: list, decoder, count: int):
+    """
+    Decode every packet for count rounds.
+    """
+    start = perf_counter()
+    for _ in range(count):
+        for p in packets:
+            decoder.decode(p)
+    cost = (perf_counter() - start) / count / len(packets)
+
+    print(
+        f"{name:<16}{type(decoder).__name__:<18}"
+        f"{cost * 1_000_000:>10.2f} us/message"
+    )
+
+
+def main():
+    """"""
+    print(f"json backend: {json_loads.__module__}")
+
+    for depth in [20, 150]:
+        huobi = [
+            compress_gzip(json.dumps(create_huobi_depth(i, depth)))
+            for i in range(1000)
+        ]
+        okex = [
+            compress_deflate(json.dumps(create_okex_depth(i, depth)))
+            for i in range(1000)
+        ]
+
+        for name, packets, wbits in [
+            (f"huobi depth{depth}", huobi, 31),
+            (f"okex depth{depth}", okex, -zlib.MAX_WBITS),
+        ]:
+            for decoder in [LegacyDecoder(wbits), ZlibJsonDecoder(wbits)]:
+                run_benchmark(name, packets, decoder, 10)
+
+
+if __name__ == "__main__":
+    main()
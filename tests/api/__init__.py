@@ -0,0 +1,3 @@
+from .test_async_rest_client import *
+from .test_async_websocket_client import *
+from .test_rest_client import *
@@ -0,0 +1,155 @@
+"""
+Test if async rest client sends requests within expected limits
+"""
+import asyncio
+import unittest
+from collections import defaultdict
+from threading import current_thread
+
+from aiohttp import web
+
+from vnpy.api.event_loop import get_event_loop
+from vnpy.api.rest import RequestPriority
+from vnpy.api.rest.async_rest_client import AsyncRestClient
+
+
+class RecordServer:
+
+    def __init__(self):
+        self.running = defaultdict(int)
+        self.max_running = defaultdict(int)
+        self.max_total = 0
+        self.paths = []
+
+    async def handle(self, request: web.Request):
+        name = request.path.strip("/").rstrip("0123456789")
+        self.paths.append(request.path_qs)
+
+        self.running[name] += 1
+        self.max_running[name] = max(self.max_running[name], self.running[name])
+        self.max_total = max(self.max_total, sum(self.running.values()))
+
+        await asyncio.sleep(0.05)
+
+        self.running[name] -= 1
+        return web.json_response(
+            {"path": request.path}, headers={"X-RateLimit-Remaining": "299"}
+        )
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{name}", self.handle)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return self.runner.addresses[0][1]
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class NonceClient(AsyncRestClient):
+
+    def __init__(self):
+        super().__init__()
+        self.nonce = 0
+        self.callback_threads = set()
+        self.headers = []
+
+    def sign(self, request):
+        self.nonce += 1
+        request.params = {"nonce": self.nonce}
+        return request
+
+    def on_response(self, data, request):
+        self.callback_threads.add(current_thread().ident)
+        self.headers.append(request.response.headers["x-ratelimit-remaining"])
+
+
+class TestAsyncRestClient(unittest.TestCase):
+
+    def setUp(self):
+        loop = get_event_loop()
+
+        self.server = RecordServer()
+        port = asyncio.run_coroutine_threadsafe(
+            self.server.start(), loop
+        ).result()
+        self.addCleanup(
+            lambda: asyncio.run_coroutine_threadsafe(
+                self.server.stop(), loop
+            ).result()
+        )
+
+        self.client = NonceClient()
+        self.client.init(f"http://127.0.0.1:{port}")
+        self.addCleanup(self.client.stop)
+
+    def add_requests(self):
+        for i in range(6):
+            self.client.add_request(
+                "GET", f"/query{i}", self.client.on_response
+            )
+        for i in range(3):
+            self.client.add_request(
+                "GET",
+                f"/order{i}",
+                self.client.on_response,
+                priority=RequestPriority.high
+            )
+
+    def test_serial(self):
+        # Requests added before start are queued and sent after start.
+        self.add_requests()
+        self.client.start(3)
+        self.client.join()
+
+        paths = self.server.paths
+        self.assertEqual(len(paths), 9)
+        self.assertEqual(self.server.max_total, 1)
+        self.assertEqual(len(self.client.callback_threads), 1)
+
+        # Headers are still case insensitive.
+        self.assertEqual(self.client.headers, ["299"] * 9)
+
+        # Nonce reaches server in increasing order.
+        nonces = [int(p.split("nonce=")[1]) for p in paths]
+        self.assertEqual(nonces, sorted(nonces))
+
+        # High priority requests waiting in queue are sent first.
+        names = [p.split("?")[0] for p in paths]
+        self.assertEqual(names[:3], ["/order0", "/order1", "/order2"])
+
+    def test_concurrent(self):
+        self.client.concurrent = True
+        self.client.start(3)
+        self.add_requests()
+        self.client.join()
+
+        self.assertEqual(len(self.server.paths), 9)
+        self.assertEqual(self.server.max_running["query"], 3)
+        self.assertEqual(self.server.max_running["order"], 1)
+        self.assertGreater(self.server.max_total, 3)
+
+        # High priority requests are not blocked by queries waiting.
+        names = [p.split("?")[0] for p in self.server.paths]
+        self.assertLess(names.index("/order0"), names.index("/query5"))
+
+        orders = [name for name in names if "order" in name]
+        self.assertEqual(orders, ["/order0", "/order1", "/order2"])
+
+    def test_stop(self):
+        self.client.start(3)
+        self.add_requests()
+        self.client.stop()
+
+        # Requests dropped are not waited.
+        self.client.join()
+        self.assertLess(len(self.server.paths), 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Test if async websocket client connects, sends and stops on shared loop
+"""
+import asyncio
+import unittest
+from threading import Event
+
+from aiohttp import web
+
+from vnpy.api.event_loop import get_event_loop
+from vnpy.api.websocket.async_websocket_client import AsyncWebsocketClient
+
+
+class EchoServer:
+
+    def __init__(self):
+        self.connections = 0
+
+    async def handle(self, request: web.Request):
+        self.connections += 1
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        async for msg in ws:
+            if msg.data == '"close"':
+                break
+            await ws.send_str(msg.data)
+
+        await ws.close()
+        return ws
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/ws", self.handle)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return self.runner.addresses[0][1]
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class RecordClient(AsyncWebsocketClient):
+
+    def __init__(self):
+        super().__init__()
+        self.connected = Event()
+        self.disconnected = Event()
+        self.received = Event()
+        self.connected_count = 0
+        self.packets = []
+
+    def on_connected(self):
+        self.connected_count += 1
+        self.disconnected.clear()
+        self.connected.set()
+
+    def on_disconnected(self):
+        self.connected.clear()
+        self.disconnected.set()
+
+    def on_packet(self, packet):
+        self.packets.append(packet)
+        self.received.set()
+
+
+class TestAsyncWebsocketClient(unittest.TestCase):
+
+    def setUp(self):
+        loop = get_event_loop()
+
+        self.server = EchoServer()
+        port = asyncio.run_coroutine_threadsafe(
+            self.server.start(), loop
+        ).result()
+        self.addCleanup(
+            lambda: asyncio.run_coroutine_threadsafe(
+                self.server.stop(), loop
+            ).result()
+        )
+
+        self.client = RecordClient()
+        self.client.init(f"http://127.0.0.1:{port}/ws")
+        self.addCleanup(self.client.stop)
+
+    def test_send_packet(self):
+        self.client.start()
+        self.assertTrue(self.client.connected.wait(5))
+
+        self.client.send_packet({"id": 1})
+        self.assertTrue(self.client.received.wait(5))
+        self.assertEqual(self.client.packets, [{"id": 1}])
+
+        self.client.stop()
+        self.client.join()
+        self.assertTrue(self.client.disconnected.is_set())
+        self.assertEqual(self.client.connected_count, 1)
+
+    def test_reconnect(self):
+        self.client.start()
+        self.assertTrue(self.client.connected.wait(5))
+
+        # Connection closed by server is connected again.
+        self.client.send_packet("close")
+        self.assertTrue(self.client.disconnected.wait(5))
+        self.assertTrue(self.client.connected.wait(5))
+        self.assertEqual(self.server.connections, 2)
+
+        self.client.stop()
+        self.client.join()
+        self.assertTrue(self.client.disconnected.is_set())
+
+    def test_stop_before_connected(self):
+        # Stop and join return without waiting for connection.
+        self.client.start()
+        self.client.stop()
+        self.client.join()
+        self.assertEqual(self.client.packets, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Test if rest client sends requests in expected order
+"""
+import json
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread, current_thread
+
+from vnpy.api.rest import RequestPriority, RestClient
+
+
+class RecordHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.running += 1
+            server.max_running = max(server.max_running, server.running)
+            server.paths.append(self.path)
+
+        time.sleep(0.05)
+
+        with server.lock:
+            server.running -= 1
+
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class NonceClient(RestClient):
+
+    def __init__(self):
+        super().__init__()
+        self.nonce = 0
+        self.callback_threads = set()
+
+    def sign(self, request):
+        self.nonce += 1
+        request.path = f"{request.path}?nonce={self.nonce}"
+        return request
+
+    def on_response(self, data, request):
+        self.callback_threads.add(current_thread().ident)
+
+
+class TestRestClient(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RecordHandler)
+        self.server.lock = Lock()
+        self.server.running = 0
+        self.server.max_running = 0
+        self.server.paths = []
+
+        thread = Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        host, port = self.server.server_address
+        self.client = NonceClient()
+        self.client.init(f"http://{host}:{port}")
+        self.addCleanup(self.client.stop)
+
+    def add_requests(self):
+        for i in range(6):
+            self.client.add_request(
+                "GET", f"/query{i}", self.client.on_response
+            )
+        for i in range(3):
+            self.client.add_request(
+                "GET",
+                f"/order{i}",
+                self.client.on_response,
+                priority=RequestPriority.high
+            )
+
+    def test_serial(self):
+        self.add_requests()
+        self.client.start(3)
+        self.client.join()
+
+        paths = self.server.paths
+        self.assertEqual(self.server.max_running, 1)
+        self.assertEqual(len(self.client.callback_threads), 1)
+
+        # Nonce reaches server in increasing order.
+        nonces = [int(p.split("nonce=")[1]) for p in paths]
+        self.assertEqual(nonces, sorted(nonces))
+
+        # High priority requests waiting in queue are sent first.
+        names = [p.split("?")[0] for p in paths]
+        self.assertEqual(names[:3], ["/order0", "/order1", "/order2"])
+
+    def test_concurrent(self):
+        self.client.concurrent = True
+        self.add_requests()
+        self.client.start(3)
+        self.client.join()
+
+        self.assertEqual(len(self.server.paths), 9)
+        self.assertGreater(self.server.max_running, 1)
+
+        # High priority requests are still sent one by one in order.
+        orders = [p.split("?")[0] for p in self.server.paths if "order" in p]
+        self.assertEqual(orders, ["/order0", "/order1", "/order2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
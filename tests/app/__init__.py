@@ -1 +1,3 @@
+from .test_backtesting import *
 from .test_csv_loader import *
+from .test_data_recorder import *
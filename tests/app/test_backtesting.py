@@ -0,0 +1,409 @@
+"""
+Test if backtesting and optimization work fine
+"""
+import math
+import random
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from vnpy.app.cta_strategy.backtesting import (
+    BacktestingEngine,
+    BacktestingMode,
+    OptimizationSetting,
+    sort_by_settings,
+)
+from vnpy.app.cta_strategy.strategies.double_ma_strategy import DoubleMaStrategy
+from vnpy.app.cta_strategy.strategies.turtle_signal_strategy import TurtleSignalStrategy
+from vnpy.app.cta_strategy.vector_backtesting import (
+    SharedBarData,
+    VectorBacktestingEngine,
+)
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+
+
+def create_bars(count: int, minutes: int = 1):
+    dt = datetime(2019, 1, 2, 9, 30)
+    return [
+        BarData(
+            gateway_name="DB",
+            symbol="IF88",
+            exchange=Exchange.CFFEX,
+            datetime=dt + timedelta(minutes=i * minutes),
+            interval=Interval.MINUTE,
+            open_price=4000 + i,
+            high_price=4001 + i,
+            low_price=3999 + i,
+            close_price=4000 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def create_wave_bars(days: int):
+    """
+    Bars of every 15 minutes in trading hours, with price in waves.
+    """
+    bars = []
+    start = datetime(2019, 1, 1)
+
+    for day in range(days):
+        dt = start + timedelta(days=day, hours=9, minutes=30)
+        for _ in range(22):
+            n = len(bars)
+            price = 4000 + 100 * math.sin(n / 25) + 30 * math.sin(n / 4)
+            bars.append(
+                BarData(
+                    gateway_name="DB",
+                    symbol="IF88",
+                    exchange=Exchange.CFFEX,
+                    datetime=dt,
+                    interval=Interval.MINUTE,
+                    volume=n,
+                    open_price=price - 2,
+                    high_price=price + 8,
+                    low_price=price - 8,
+                    close_price=price,
+                )
+            )
+            dt += timedelta(minutes=15)
+
+    return bars
+
+
+def set_parameters(engine: BacktestingEngine, end: datetime = datetime(2019, 2, 1)):
+    engine.set_parameters(
+        vt_symbol="IF88.CFFEX",
+        interval="1m",
+        start=datetime(2019, 1, 1),
+        end=end,
+        rate=0.3 / 10000,
+        slippage=0.2,
+        size=300,
+        pricetick=0.2,
+        capital=1_000_000,
+    )
+
+
+class TestVectorBacktesting(unittest.TestCase):
+
+    def run_engine(self, engine: BacktestingEngine, strategy_class, bars):
+        set_parameters(engine)
+        engine.add_strategy(strategy_class, {})
+
+        if isinstance(engine, VectorBacktestingEngine):
+            engine.set_history_data(bars)
+        else:
+            engine.history_data = bars
+
+        engine.run_backtesting()
+        df = engine.calculate_result()
+
+        trades = [
+            (t.datetime, t.direction, t.offset, t.price, t.volume)
+            for t in engine.trades.values()
+        ]
+        return trades, df
+
+    def test_same_result(self):
+        bars = create_wave_bars(30)
+
+        for strategy_class in [DoubleMaStrategy, TurtleSignalStrategy]:
+            with self.subTest(strategy=strategy_class.__name__):
+                trades, df = self.run_engine(
+                    BacktestingEngine(), strategy_class, bars
+                )
+                vector_trades, vector_df = self.run_engine(
+                    VectorBacktestingEngine(), strategy_class, bars
+                )
+
+                self.assertGreater(len(trades), 0)
+                self.assertEqual(vector_trades, trades)
+
+                # Trade objects in daily results are compared by above.
+                columns = [c for c in df.columns if c != "trades"]
+                self.assertEqual(
+                    vector_df[columns].to_dict(), df[columns].to_dict()
+                )
+
+
+class TestOptimizationSetting(unittest.TestCase):
+
+    def setUp(self):
+        self.setting = OptimizationSetting()
+        self.setting.add_parameter("a", 1, 3, 1)
+        self.setting.add_parameter("b", 10, 40, 10)
+        self.setting.add_parameter("c", 0.5)
+
+    def test_get_setting(self):
+        settings = self.setting.generate_setting()
+        self.assertEqual(len(settings), self.setting.get_size())
+
+        for index, setting in enumerate(settings):
+            got = self.setting.get_setting(index)
+            self.assertEqual(got, setting)
+            self.assertEqual(list(got), ["a", "b", "c"])
+
+    def test_random_seed(self):
+        random.seed(7)
+        first = self.setting.generate_setting_random(5)
+        random.seed(7)
+        second = self.setting.generate_setting_random(5)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(set(str(s) for s in first)), 5)
+
+        exclude = set(str(s) for s in first)
+        rest = self.setting.generate_setting_random(100, exclude)
+        self.assertEqual(len(rest), self.setting.get_size() - 5)
+        self.assertTrue(exclude.isdisjoint(str(s) for s in rest))
+
+    def test_sort_by_settings(self):
+        settings = self.setting.generate_setting()
+        results = [(str(setting), 0, {}) for setting in settings]
+        shuffled = random.sample(results, len(results))
+
+        self.assertEqual(sort_by_settings(shuffled, settings), results)
+
+
+class TestHalvingOptimization(unittest.TestCase):
+
+    def setUp(self):
+        self.bars = create_wave_bars(30)
+
+        self.setting = OptimizationSetting()
+        self.setting.set_target("total_net_pnl")
+        self.setting.add_parameter("fast_window", 4, 12, 2)
+        self.setting.add_parameter("slow_window", 20, 40, 5)
+
+    def run_halving(self, seed: int, callback=None):
+        engine = BacktestingEngine()
+        set_parameters(engine, self.bars[-1].datetime)
+        engine.add_strategy(DoubleMaStrategy, {})
+
+        def load_data():
+            engine.history_data = [
+                bar for bar in self.bars
+                if engine.start <= bar.datetime <= engine.end
+            ]
+
+        random.seed(seed)
+        with patch.object(engine, "load_data", load_data):
+            return engine.run_halving_optimization(
+                self.setting, count=9, eta=3, output=False, callback=callback
+            )
+
+    def test_seed(self):
+        results = self.run_halving(3)
+        self.assertEqual(len(results), 1)
+
+        self.assertEqual(
+            [r[:2] for r in self.run_halving(3)], [r[:2] for r in results]
+        )
+
+    def test_callback(self):
+        progress = []
+        results = self.run_halving(
+            3, lambda result, count, total: progress.append((count, total))
+        )
+
+        # Rounds of 9, 3 and 1 settings
+        self.assertEqual(progress, [(n, 13) for n in range(1, 14)])
+        self.assertEqual(len(results), 1)
+
+
+class TestOptimizationStop(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = BacktestingEngine()
+        self.engine.set_parameters(
+            vt_symbol="IF88.CFFEX",
+            interval="1m",
+            start=datetime(2019, 1, 1),
+            end=datetime(2019, 2, 1),
+            rate=0.3 / 10000,
+            slippage=0.2,
+            size=300,
+            pricetick=0.2,
+            capital=1_000_000,
+            mode=BacktestingMode.TICK,
+        )
+        self.engine.add_strategy(DoubleMaStrategy, {})
+
+        self.setting = OptimizationSetting()
+        self.setting.set_target("sharpe_ratio")
+        self.setting.add_parameter("fast_window", 5, 20, 5)
+        self.setting.add_parameter("slow_window", 30, 60, 10)
+
+    def test_begin(self):
+        self.engine.stop_optimization()
+        self.engine.begin_optimization()
+        self.assertTrue(self.engine.optimization_active)
+
+        self.engine.request_optimization()
+        self.engine.stop_optimization()
+        self.engine.begin_optimization()
+        self.assertFalse(self.engine.optimization_active)
+
+        # Request is consumed by the run started
+        self.engine.begin_optimization()
+        self.assertTrue(self.engine.optimization_active)
+
+    def test_stop_before_run(self):
+        for run in [
+            self.engine.run_optimization,
+            self.engine.run_random_optimization,
+            self.engine.run_halving_optimization,
+        ]:
+            with self.subTest(run=run.__name__):
+                self.engine.request_optimization()
+                self.engine.stop_optimization()
+
+                result_values = run(self.setting, output=False, use_store=False)
+                self.assertEqual(result_values, [])
+                self.assertFalse(self.engine.optimization_active)
+
+    def test_stop_ga(self):
+        self.engine.request_optimization()
+        self.engine.stop_optimization()
+
+        results = self.engine.run_ga_optimization(
+            self.setting, population_size=10, ngen_size=2, output=False
+        )
+        self.assertEqual(results, [])
+
+
+class TestOptimizationStore(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = BacktestingEngine()
+        self.engine.set_parameters(
+            vt_symbol="IF88.CFFEX",
+            interval="1m",
+            start=datetime(2019, 1, 1),
+            end=datetime(2019, 2, 1),
+            rate=0.3 / 10000,
+            slippage=0.2,
+            size=300,
+            pricetick=0.2,
+            capital=1_000_000,
+        )
+        self.engine.add_strategy(DoubleMaStrategy, {})
+
+    def get_store(self, bars: list):
+        self.engine.history_data = list(bars)
+        return self.engine.get_optimization_store()
+
+    def test_data_fingerprint(self):
+        bars = create_bars(10)
+        path = self.get_store(bars).path
+        self.assertEqual(self.get_store(bars).path, path)
+
+        # Data updated in database for the same range
+        self.assertNotEqual(self.get_store(bars[:-1]).path, path)
+        self.assertNotEqual(self.get_store(create_bars(11)).path, path)
+
+    def test_no_end(self):
+        self.engine.end = None
+        self.assertFalse(self.engine.check_store_end())
+
+    def test_resume(self):
+        bars = create_wave_bars(30)
+        loaded = []
+
+        def load_data():
+            loaded.append(self.engine.start)
+            self.engine.history_data = list(bars)
+
+        setting = OptimizationSetting()
+        setting.set_target("total_net_pnl")
+        setting.add_parameter("fast_window", 4, 8, 2)
+        setting.add_parameter("slow_window", 20, 30, 10)
+
+        with patch.object(self.engine, "load_data", load_data):
+            store = self.get_store(bars)
+            store.clear()
+            self.addCleanup(store.clear)
+
+            first = self.engine.run_optimization(setting, False, True)
+            self.assertEqual(len(store.load()), 6)
+
+            # Saved results are returned without running again
+            with patch("multiprocessing.Pool") as pool:
+                second = self.engine.run_optimization(setting, False, True)
+                pool.assert_not_called()
+
+        self.assertEqual([r[:2] for r in second], [r[:2] for r in first])
+
+        # Data is loaded only once for each run
+        self.assertEqual(len(loaded), 2)
+
+    def test_resume_ga(self):
+        bars = create_wave_bars(30)
+
+        def load_data():
+            self.engine.history_data = list(bars)
+
+        setting = OptimizationSetting()
+        setting.set_target("total_net_pnl")
+        setting.add_parameter("fast_window", 4, 8, 2)
+        setting.add_parameter("slow_window", 20, 30, 10)
+
+        with patch.object(self.engine, "load_data", load_data):
+            store = self.get_store(bars)
+            store.clear()
+            self.addCleanup(store.clear)
+
+            results = []
+            counts = []
+            for _ in range(2):
+                random.seed(5)
+                results.append(self.engine.run_ga_optimization(
+                    setting, 6, 2, output=False, use_store=True
+                ))
+                counts.append(store.path.stat().st_size)
+
+        # Individuals of the same seed are all read from store, and no
+        # record is appended.
+        self.assertEqual(counts[1], counts[0])
+        self.assertEqual(results[0], results[1])
+
+
+class TestSharedBarData(unittest.TestCase):
+
+    def test_load(self):
+        # Bars cross days and months
+        bars = create_bars(100, 60 * 11)
+        engine = VectorBacktestingEngine()
+        engine.set_history_data(bars)
+
+        shared_data = SharedBarData.create(engine)
+        self.addCleanup(shared_data.close)
+
+        loaded = VectorBacktestingEngine()
+        shared_data.load(loaded)
+
+        self.assertEqual(loaded.datetime_list, engine.datetime_list)
+        self.assertEqual(loaded.ordinal_array.tolist(), engine.ordinal_array.tolist())
+        self.assertEqual(loaded.day_array.tolist(), engine.day_array.tolist())
+        self.assertEqual(loaded.close_array.tolist(), engine.close_array.tolist())
+
+        # Conversion is shared by engines in the same process.
+        other = VectorBacktestingEngine()
+        shared_data.load(other)
+        self.assertIs(other.datetime_list, loaded.datetime_list)
+        self.assertIs(other.price_lists, loaded.price_lists)
+
+    def test_empty(self):
+        engine = VectorBacktestingEngine()
+        shared_data = SharedBarData.create(engine)
+        self.addCleanup(shared_data.close)
+
+        shared_data.load(engine)
+        self.assertEqual(engine.datetime_list, [])
+        self.assertEqual(len(engine.price_lists), len(SharedBarData.columns))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Test if data recorder saves data in batch
+"""
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from vnpy.app.data_recorder import RecorderEngine
+from vnpy.event import EventEngine
+from vnpy.trader.constant import Exchange
+from vnpy.trader.object import BarData, TickData
+
+
+def create_ticks(symbol: str, count: int):
+    dt = datetime(2019, 1, 1, 9)
+    return [
+        TickData(
+            gateway_name="DB",
+            symbol=symbol,
+            exchange=Exchange.SHFE,
+            datetime=dt + timedelta(seconds=i),
+            last_price=i,
+        )
+        for i in range(count)
+    ]
+
+
+class TestDataRecorder(unittest.TestCase):
+
+    def setUp(self) -> None:
+        patcher = patch("vnpy.app.data_recorder.engine.database_manager")
+        self.database_manager = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # only flush by size or on close during test
+        patcher = patch.object(RecorderEngine, "flush_interval", 60)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # no main engine is necessary without adding recordings
+        self.engine = RecorderEngine(None, EventEngine())
+        self.addCleanup(self.engine.close)
+
+    def get_saved_ticks(self):
+        ticks = []
+        for call in self.database_manager.save_tick_data.call_args_list:
+            ticks.extend(call[0][0])
+        return ticks
+
+    def test_flush_by_size(self):
+        ticks = create_ticks("rb1905", self.engine.buffer_size)
+
+        for tick in ticks:
+            self.engine.record_tick(tick)
+
+        for _ in range(50):
+            if self.get_saved_ticks():
+                break
+            time.sleep(0.1)
+
+        saved = self.get_saved_ticks()
+        self.assertEqual(len(ticks), len(saved), "full buffer should be saved")
+        self.assertEqual(1, self.database_manager.save_tick_data.call_count)
+
+    def test_flush_on_close(self):
+        ticks = create_ticks("rb1905", 10) + create_ticks("hc1905", 10)
+
+        for tick in ticks:
+            self.engine.record_tick(tick)
+        self.engine.close()
+
+        saved = self.get_saved_ticks()
+        self.assertEqual(len(ticks), len(saved), "all data should be saved on close")
+        self.assertEqual(1, self.database_manager.save_tick_data.call_count)
+        self.assertEqual(0, self.engine.get_statistics()["queue_size"])
+
+    def test_save_separately(self):
+        self.database_manager.save_tick_data.side_effect = Exception("tick")
+
+        ticks = create_ticks("rb1905", 10)
+        for tick in ticks:
+            self.engine.record_tick(tick)
+
+        bar = BarData(
+            gateway_name="DB",
+            symbol="rb1905",
+            exchange=Exchange.SHFE,
+            datetime=datetime(2019, 1, 1, 9),
+        )
+        self.engine.record_bar(bar)
+        self.engine.close()
+
+        # Failed ticks do not block bars, and are reported as dropped.
+        self.database_manager.save_bar_data.assert_called_once_with([bar])
+        self.assertEqual(len(ticks), self.engine.get_statistics()["dropped_count"])
+
+    def test_retry(self):
+        self.database_manager.save_tick_data.side_effect = [Exception("tick"), None]
+
+        ticks = create_ticks("rb1905", self.engine.buffer_size + 1)
+        for tick in ticks:
+            self.engine.record_tick(tick)
+        self.engine.close()
+
+        # Failed buffer is saved again with the tick added later.
+        self.assertEqual(2, self.database_manager.save_tick_data.call_count)
+        saved = self.database_manager.save_tick_data.call_args[0][0]
+        self.assertEqual(ticks, saved)
+        self.assertEqual(0, self.engine.get_statistics()["dropped_count"])
+
+
+if __name__ == "__main__":
+    unittest.main()
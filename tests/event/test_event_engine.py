@@ -0,0 +1,233 @@
+"""
+Test if event engine works fine
+"""
+import unittest
+from collections import defaultdict
+from threading import Event as ThreadEvent, current_thread
+from time import sleep
+from types import SimpleNamespace
+
+from vnpy.event import Event, EventEngine, BatchEventEngine, ShardedEventEngine, shard_safe
+from vnpy.event.engine import is_shard_safe
+from vnpy.trader.engine import MainEngine, OmsEngine
+
+
+class TestEventEngine(unittest.TestCase):
+
+    engine_class = EventEngine
+
+    def setUp(self) -> None:
+        self.engine = self.engine_class()
+        self.engine.start()
+
+    def tearDown(self) -> None:
+        self.engine.stop()
+
+    def wait_for(self, type: str):
+        """
+        Put a marker event after all events put and wait until processed.
+        """
+        done = ThreadEvent()
+        self.engine.register(type, lambda event: done.set())
+        self.engine.put(Event(type))
+        self.assertTrue(done.wait(5), "event is not processed in time")
+
+    def test_dispatch_order(self):
+        received = []
+        self.engine.register("eTest", lambda event: received.append(("type", event.data)))
+        self.engine.register_general(
+            lambda event: received.append(("general", event.data))
+            if event.type == "eTest" else None
+        )
+
+        for i in range(100):
+            self.engine.put(Event("eTest", i))
+        self.wait_for("eDone")
+
+        expected = []
+        for i in range(100):
+            expected.append(("type", i))
+            expected.append(("general", i))
+        self.assertEqual(received, expected)
+
+    def test_unregister(self):
+        received = []
+
+        def handler(event: Event):
+            received.append(event.data)
+
+        self.engine.register("eTest", handler)
+        self.engine.register("eTest", handler)
+        self.engine.put(Event("eTest", 1))
+        self.wait_for("eDone")
+
+        self.engine.unregister("eTest", handler)
+        self.engine.put(Event("eTest", 2))
+        self.wait_for("eDone2")
+
+        self.assertEqual(received, [1])
+
+    def test_conflation(self):
+        self.engine.add_conflation("eTick.", lambda event: event.data[0])
+
+        # Block event thread, so that following events wait in queue.
+        started = ThreadEvent()
+        release = ThreadEvent()
+
+        def block(event: Event):
+            started.set()
+            release.wait(5)
+
+        self.engine.register("eBlock", block)
+        self.engine.put(Event("eBlock"))
+        self.assertTrue(started.wait(5))
+
+        received = []
+        self.engine.register("eTick.", lambda event: received.append(event.data))
+        self.engine.register("eTrade.", lambda event: received.append(event.data))
+
+        self.engine.put(Event("eTick.", ("A", 1)))
+        self.engine.put(Event("eTick.", ("B", 1)))
+        self.engine.put(Event("eTrade.", ("A", 1)))
+        self.engine.put(Event("eTrade.", ("A", 2)))
+        self.engine.put(Event("eTick.", ("A", 2)))
+        self.engine.put(Event("eTick.", ("A", 3)))
+
+        release.set()
+        self.wait_for("eDone")
+
+        self.assertEqual(received, [("A", 3), ("B", 1), ("A", 1), ("A", 2)])
+        self.assertEqual(self.engine.get_conflation_counts("eTick."), {"A": 2})
+
+        # Ticks put after processing are not merged into processed ones.
+        self.engine.put(Event("eTick.", ("A", 4)))
+        self.wait_for("eDone2")
+        self.assertEqual(received[-1], ("A", 4))
+
+    def test_profiling(self):
+        self.engine.start_profiling(slow_threshold=0.005)
+
+        def slow_handler(event: Event):
+            if event.data:
+                sleep(0.01)
+
+        self.engine.register("eTest", slow_handler)
+        self.engine.put(Event("eTest", True))
+        self.engine.put(Event("eTest", False))
+        self.wait_for("eDone")
+
+        profile = self.engine.get_profile(reset=True)
+        name = slow_handler.__qualname__
+        self.assertEqual(profile["wait"]["eTest"]["count"], 2)
+        self.assertEqual(profile["handler"][name]["count"], 2)
+        self.assertGreaterEqual(profile["handler"][name]["max"], 0.01)
+        self.assertEqual(profile["slow"], {name: 1})
+
+        self.assertEqual(self.engine.get_profile()["handler"], {})
+        self.engine.stop_profiling()
+
+    def test_timer(self):
+        received = []
+        self.engine.register("eTimer.fast", lambda event: received.append(event.type))
+        self.engine.add_timer("eTimer.fast", 0.05)
+
+        called = ThreadEvent()
+        self.engine.call_later(0.2, called.set)
+        timer_id = self.engine.call_later(0.1, lambda: received.append("cancelled"))
+        self.engine.cancel_call(timer_id)
+
+        self.assertTrue(called.wait(5))
+        self.engine.remove_timer("eTimer.fast")
+        sleep(0.1)
+
+        self.assertNotIn("cancelled", received)
+        self.assertGreaterEqual(len(received), 3)
+        self.assertLessEqual(len(received), 6)
+
+    def test_timer_interval(self):
+        for interval in [0, -1]:
+            with self.assertRaises(ValueError):
+                self.engine.add_timer("eTimer.invalid", interval)
+
+
+class TestBatchEventEngine(TestEventEngine):
+
+    engine_class = BatchEventEngine
+
+
+class Data:
+
+    def __init__(self, vt_symbol: str, value: int):
+        self.vt_symbol = vt_symbol
+        self.value = value
+
+
+class TestShardedEventEngine(TestEventEngine):
+
+    engine_class = ShardedEventEngine
+
+    def test_conflation(self):
+        self.assertFalse(self.engine.supports_conflation)
+
+        logs = []
+        main_engine = SimpleNamespace(
+            event_engine=self.engine, write_log=logs.append
+        )
+        self.assertFalse(MainEngine.enable_tick_conflation(main_engine))
+        self.assertEqual(len(logs), 1)
+
+        main_engine.event_engine = EventEngine()
+        self.assertTrue(MainEngine.enable_tick_conflation(main_engine))
+
+    def test_oms_handlers(self):
+        oms_engine = OmsEngine(SimpleNamespace(), self.engine)
+        self.assertTrue(is_shard_safe(oms_engine.process_tick_event))
+        self.assertTrue(is_shard_safe(oms_engine.process_depth_event))
+
+        for handler in [
+            oms_engine.process_order_event,
+            oms_engine.process_trade_event,
+            oms_engine.process_position_event,
+            oms_engine.process_account_event,
+            oms_engine.process_contract_event,
+        ]:
+            self.assertFalse(is_shard_safe(handler))
+
+    def test_shard_ordering(self):
+        received = defaultdict(list)
+        threads = defaultdict(set)
+        serial_threads = set()
+
+        @shard_safe
+        def shard_handler(event: Event):
+            received[event.data.vt_symbol].append(event.data.value)
+            threads[event.data.vt_symbol].add(current_thread())
+
+        def serial_handler(event: Event):
+            serial_threads.add(current_thread())
+
+        self.engine.register("eTick.", shard_handler)
+        self.engine.register("eTick.", serial_handler)
+
+        symbols = [f"{i}.TEST" for i in range(8)]
+        for value in range(50):
+            for vt_symbol in symbols:
+                self.engine.put(Event("eTick.", Data(vt_symbol, value)))
+
+        for _ in range(50):
+            if sum(len(values) for values in received.values()) == 400:
+                break
+            sleep(0.1)
+
+        for vt_symbol in symbols:
+            self.assertEqual(received[vt_symbol], list(range(50)))
+            self.assertEqual(len(threads[vt_symbol]), 1)
+
+        self.wait_for("eDone")
+        self.assertEqual(len(serial_threads), 1)
+        all_shard_threads = set().union(*threads.values())
+        self.assertTrue(serial_threads.isdisjoint(all_shard_threads))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,3 @@
+from .test_rpc import *
+from .test_rpc_gateway import *
+from .test_codec import *
@@ -0,0 +1,243 @@
+"""
+Test if rpc codecs pack and unpack data without loss
+"""
+import unittest
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from vnpy.event import Event
+from vnpy.rpc.codec import TAG_OBJECT, TAG_PICKLE, BinaryCodec, PickleCodec
+from vnpy.trader.constant import (
+    Direction,
+    Exchange,
+    Interval,
+    Offset,
+    OptionType,
+    OrderType,
+    Product,
+    Status
+)
+from vnpy.trader.event import EVENT_TICK
+from vnpy.trader.object import (
+    AccountData,
+    BarData,
+    CancelRequest,
+    ContractData,
+    DepthData,
+    HistoryRequest,
+    LogData,
+    OrderData,
+    OrderRequest,
+    PositionData,
+    SubscribeRequest,
+    TickData,
+    TradeData
+)
+
+DT = datetime(2019, 3, 1, 9, 30, 15, 500000)
+
+
+@dataclass
+class CustomData:
+    value: set
+
+
+def create_objects():
+    """
+    One object of each class registered in BinaryCodec.
+    """
+    tick = TickData(
+        gateway_name="CTP",
+        symbol="rb1905",
+        exchange=Exchange.SHFE,
+        datetime=DT,
+        name="螺纹钢",
+        volume=100,
+        last_price=3500.5,
+        bid_price_1=3500,
+        ask_volume_5=7,
+    )
+
+    return [
+        tick,
+        Event(EVENT_TICK, tick),
+        BarData(
+            gateway_name="DB",
+            symbol="rb1905",
+            exchange=Exchange.SHFE,
+            datetime=DT,
+            interval=Interval.MINUTE,
+            volume=10,
+            open_price=1,
+            high_price=2,
+            low_price=0.5,
+            close_price=1.5,
+        ),
+        OrderData(
+            gateway_name="CTP",
+            symbol="rb1905",
+            exchange=Exchange.SHFE,
+            orderid="1_2_3",
+            type=OrderType.STOP,
+            direction=Direction.SHORT,
+            offset=Offset.CLOSETODAY,
+            price=3500,
+            volume=2,
+            traded=1,
+            status=Status.PARTTRADED,
+            time="09:30:15",
+        ),
+        TradeData(
+            gateway_name="CTP",
+            symbol="rb1905",
+            exchange=Exchange.SHFE,
+            orderid="1_2_3",
+            tradeid="T1",
+            direction=Direction.LONG,
+            offset=Offset.OPEN,
+            price=3500,
+            volume=1,
+            time="09:30:15",
+        ),
+        PositionData(
+            gateway_name="CTP",
+            symbol="rb1905",
+            exchange=Exchange.SHFE,
+            direction=Direction.NET,
+            volume=3,
+            pnl=-10.5,
+        ),
+        AccountData(
+            gateway_name="CTP",
+            accountid="123",
+            balance=1000000,
+            frozen=100,
+        ),
+        ContractData(
+            gateway_name="CTP",
+            symbol="IO1905-C-3800",
+            exchange=Exchange.CFFEX,
+            name="期权",
+            product=Product.OPTION,
+            size=100,
+            pricetick=0.2,
+            stop_supported=True,
+            option_strike=3800,
+            option_underlying="IF1905.CFFEX",
+            option_type=OptionType.CALL,
+            option_expiry=DT,
+        ),
+        SubscribeRequest(symbol="rb1905", exchange=Exchange.SHFE),
+        OrderRequest(
+            symbol="rb1905",
+            exchange=Exchange.SHFE,
+            direction=Direction.LONG,
+            type=OrderType.LIMIT,
+            volume=1,
+            price=3500,
+            offset=Offset.CLOSEYESTERDAY,
+        ),
+        CancelRequest(orderid="1_2_3", symbol="rb1905", exchange=Exchange.SHFE),
+        HistoryRequest(
+            symbol="rb1905",
+            exchange=Exchange.SHFE,
+            start=DT,
+            interval=Interval.DAILY,
+        ),
+        LogData(gateway_name="CTP", msg="连接成功"),
+    ]
+
+
+class TestBinaryCodec(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = BinaryCodec()
+
+    def assert_round_trip(self, obj):
+        data = self.codec.pack(obj)
+        result = self.codec.unpack(data)
+
+        self.assertIs(type(result), type(obj))
+        self.assertEqual(vars(result), vars(obj))
+        return data
+
+    def test_registered_classes(self):
+        objects = create_objects()
+
+        classes = {type(obj) for obj in objects}
+        registered = {schema.cls for schema in self.codec.schemas}
+        self.assertEqual(registered - classes, {DepthData})
+
+        for obj in objects:
+            with self.subTest(cls=type(obj).__name__):
+                data = self.assert_round_trip(obj)
+                self.assertEqual(data[1:2], TAG_OBJECT)
+
+    def test_extra_attributes(self):
+        log = LogData(gateway_name="CTP", msg="")
+        result = self.codec.unpack(self.codec.pack(log))
+        self.assertEqual(result.time, log.time)
+
+        tick = create_objects()[0]
+        result = self.codec.unpack(self.codec.pack(tick))
+        self.assertEqual(result.vt_symbol, "rb1905.SHFE")
+
+    def test_depth_data(self):
+        depth = DepthData(
+            gateway_name="HUOBI",
+            symbol="btcusdt",
+            exchange=Exchange.HUOBI,
+            datetime=DT,
+            bids=np.array([[100, 1], [99.5, 2]], dtype=float),
+            is_delta=True,
+        )
+        result = self.codec.unpack(self.codec.pack(depth))
+
+        self.assertEqual(result.vt_symbol, depth.vt_symbol)
+        self.assertEqual(result.datetime, DT)
+        self.assertTrue(result.is_delta)
+        self.assertEqual(result.bids.tolist(), depth.bids.tolist())
+        self.assertEqual(result.asks.shape, (0, 2))
+
+    def test_containers(self):
+        value = [
+            None, True, False, 1, -2 ** 70, 1.5, "中文", b"\x00\x01",
+            (1, "a"), {"a": [1, 2], 3: None}, DT, Direction.LONG,
+            [True, {"tick": create_objects()[0]}],
+        ]
+        self.assertEqual(self.codec.unpack(self.codec.pack(value)), value)
+
+    def test_pickle_fallback(self):
+        # Field value not fitting schema, e.g. empty string of enum field
+        order = OrderData(
+            gateway_name="CTP",
+            symbol="rb1905",
+            exchange=Exchange.SHFE,
+            orderid="1",
+        )
+        data = self.assert_round_trip(order)
+        self.assertEqual(data[1:2], TAG_PICKLE)
+
+        # Class not registered
+        custom = CustomData({1, 2})
+        data = self.assert_round_trip(custom)
+        self.assertEqual(data[1:2], TAG_PICKLE)
+
+        # Datetime with timezone
+        result = self.codec.unpack(self.codec.pack(DT.astimezone()))
+        self.assertEqual(result, DT.astimezone())
+
+    def test_unpack_pickle_codec(self):
+        obj = create_objects()[1]
+        result = self.codec.unpack(PickleCodec().pack(obj))
+        self.assertEqual(vars(result), vars(obj))
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            self.codec.unpack(b"\x00abc")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Test if rpc server and client work fine
+"""
+import socket
+import time
+import unittest
+from concurrent.futures import wait
+from queue import Empty, Queue
+from threading import Lock
+
+from vnpy.rpc import RpcClient, RpcServer
+
+
+def get_free_address():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"tcp://127.0.0.1:{port}"
+
+
+class TopicClient(RpcClient):
+
+    def __init__(self):
+        super().__init__(timeout=5)
+        self.received = Queue()
+
+    def callback(self, topic, data):
+        self.received.put((topic, data))
+
+
+class TestRpc(unittest.TestCase):
+
+    def setUp(self):
+        rep_address = get_free_address()
+        pub_address = get_free_address()
+
+        self.server = RpcServer()
+        self.server.register(self.add)
+        self.server.start(rep_address, pub_address)
+        self.addCleanup(self.server.stop)
+
+        self.client = TopicClient()
+        self.client.start(rep_address, pub_address)
+        self.addCleanup(self.client.stop)
+
+    @staticmethod
+    def add(a, b):
+        return a + b
+
+    def publish_until_received(self, topics, expected):
+        """
+        Publish repeatedly since subscription reaches server asynchronously.
+        """
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            for topic in topics:
+                self.server.publish(topic, topic)
+            try:
+                return self.client.received.get(timeout=0.1)
+            except Empty:
+                pass
+        self.fail(f"{expected} not received")
+
+    def test_call(self):
+        self.assertEqual(self.client.add(1, 2), 3)
+
+    def test_topic_filter(self):
+        self.client.subscribe_topic("eTick.A")
+        topic, data = self.publish_until_received(
+            ["eTick.B", "eTick.A"], "eTick.A"
+        )
+        self.assertEqual(topic, "eTick.A")
+
+        # Only subscribed topic received
+        time.sleep(0.2)
+        while not self.client.received.empty():
+            topic, _ = self.client.received.get()
+            self.assertEqual(topic, "eTick.A")
+
+        self.client.unsubscribe_topic("eTick.A")
+        self.client.subscribe_topic("eTick.B")
+        self.publish_until_received(["eTick.B"], "eTick.B")
+
+        time.sleep(0.2)
+        while not self.client.received.empty():
+            self.client.received.get()
+
+        for _ in range(10):
+            self.server.publish("eTick.A", "eTick.A")
+        time.sleep(0.2)
+        self.assertTrue(self.client.received.empty())
+
+
+class CallRecorder:
+    """
+    Functions registered are not bound to test case, otherwise zmq context
+    may be terminated before sockets closed when garbage collecting cycle.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.running = 0
+        self.max_running = 0
+        self.calls = []
+
+    def run_slowly(self, i):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            self.calls.append(i)
+
+        time.sleep(0.02)
+
+        with self.lock:
+            self.running -= 1
+        return i
+
+    def send_order(self, i):
+        return self.run_slowly(i)
+
+    def query(self, i):
+        return self.run_slowly(i)
+
+
+class TestRpcSerial(unittest.TestCase):
+
+    def setUp(self):
+        rep_address = get_free_address()
+        pub_address = get_free_address()
+
+        self.recorder = CallRecorder()
+
+        self.server = RpcServer(worker_count=4)
+        self.server.register(self.recorder.send_order, serial=True)
+        self.server.register(self.recorder.query)
+        self.server.start(rep_address, pub_address)
+        self.addCleanup(self.server.stop)
+
+        self.client = TopicClient()
+        self.client.start(rep_address, pub_address)
+        self.addCleanup(self.client.stop)
+
+    def test_serial(self):
+        futures = [
+            self.client.call_async("send_order", (i,)) for i in range(10)
+        ]
+        wait(futures)
+
+        self.assertEqual([f.result() for f in futures], list(range(10)))
+        self.assertEqual(self.recorder.calls, list(range(10)))
+        self.assertEqual(self.recorder.max_running, 1)
+
+    def test_parallel(self):
+        futures = [
+            self.client.call_async("query", (i,)) for i in range(10)
+        ]
+        wait(futures)
+
+        self.assertGreater(self.recorder.max_running, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Test if rpc gateway keeps state events in order of sequence
+"""
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+from vnpy.event import Event
+from vnpy.gateway.rpc import RpcGateway
+from vnpy.trader.constant import Direction, Exchange, Status
+from vnpy.trader.event import EVENT_ORDER, EVENT_TICK
+from vnpy.trader.object import OrderData
+
+SESSION = 1
+
+
+def create_order_event(i: int):
+    order = OrderData(
+        gateway_name="CTP",
+        symbol="rb1905",
+        exchange=Exchange.SHFE,
+        orderid=str(i),
+        direction=Direction.LONG,
+        volume=1,
+        status=Status.NOTTRADED,
+    )
+    return Event(EVENT_ORDER, order)
+
+
+def create_future(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class TestRpcGateway(unittest.TestCase):
+
+    def setUp(self):
+        self.event_engine = MagicMock()
+        self.gateway = RpcGateway(self.event_engine)
+        self.gateway.client = MagicMock()
+
+        self.gateway.session = SESSION
+        self.gateway.seq = 5
+
+    def get_orderids(self):
+        return [
+            call[0][0].data.orderid
+            for call in self.event_engine.put.call_args_list
+            if call[0][0].type == EVENT_ORDER
+        ]
+
+    def push(self, seq: int):
+        event = create_order_event(seq)
+        self.gateway.client_callback(EVENT_ORDER, (SESSION, seq, event))
+
+    def test_in_order(self):
+        self.push(6)
+        self.push(7)
+        self.push(7)
+
+        self.assertEqual(self.get_orderids(), ["6", "7"])
+        self.assertEqual(self.gateway.seq, 7)
+        self.gateway.client.call_async.assert_not_called()
+
+    def test_gap_resync(self):
+        self.push(6)
+        self.push(8)
+
+        # Missing seq 7 triggers replay of updates since seq 6
+        self.gateway.client.call_async.assert_called_once()
+        name, args = self.gateway.client.call_async.call_args[0]
+        self.assertEqual(name, "get_updates")
+        self.assertEqual(args, (SESSION, 6))
+        self.assertTrue(self.gateway.syncing)
+
+        # Data pushed while syncing is buffered
+        self.push(9)
+        self.assertEqual(self.get_orderids(), ["6"])
+
+        updates = [(7, create_order_event(7)), (8, create_order_event(8))]
+        self.gateway.process_updates(create_future(updates))
+
+        self.assertFalse(self.gateway.syncing)
+        self.assertEqual(self.get_orderids(), ["6", "7", "8", "9"])
+        self.assertEqual(self.gateway.seq, 9)
+
+    def test_session_changed(self):
+        event = create_order_event(1)
+        self.gateway.client_callback(EVENT_ORDER, (SESSION + 1, 1, event))
+
+        name, args = self.gateway.client.call_async.call_args[0]
+        self.assertEqual(name, "get_updates")
+
+        # Updates not available in new session, so get snapshot instead
+        self.gateway.process_updates(create_future(None))
+        name = self.gateway.client.call_async.call_args[0][0]
+        self.assertEqual(name, "get_snapshot")
+
+    def test_not_numbered(self):
+        self.gateway.client_callback(
+            EVENT_TICK, (SESSION, 0, Event(EVENT_TICK + "x", "tick"))
+        )
+        self.assertEqual(self.gateway.seq, 5)
+        self.event_engine.put.assert_called_once()
+
+    def test_reconnect(self):
+        setting = {
+            "主动请求地址": "tcp://127.0.0.1:2014",
+            "推送订阅地址": "tcp://127.0.0.1:4102",
+            "序列化格式": "pickle",
+        }
+
+        with patch("vnpy.gateway.rpc.rpc_gateway.RpcClient") as client_class:
+            clients = [MagicMock(), MagicMock()]
+            client_class.side_effect = clients
+
+            self.gateway.client = None
+            self.gateway.connect(setting)
+            clients[0].stop.assert_not_called()
+
+            self.gateway.connect(setting)
+            clients[0].stop.assert_called_once()
+            self.assertIs(self.gateway.client, clients[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
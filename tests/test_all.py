@@ -1,7 +1,10 @@
 # tests/runner.py
 import unittest
 
+import api
 import app
+import event
+import rpc
 # import your test modules
 import test_import_all
 import trader
@@ -14,6 +17,9 @@ suite = unittest.TestSuite()
 suite.addTests(loader.loadTestsFromModule(test_import_all))
 suite.addTests(loader.loadTestsFromModule(trader))
 suite.addTests(loader.loadTestsFromModule(app))
+suite.addTests(loader.loadTestsFromModule(event))
+suite.addTests(loader.loadTestsFromModule(api))
+suite.addTests(loader.loadTestsFromModule(rpc))
 
 
 # initialize a runner, pass it your suite and run it
@@ -1,2 +1,3 @@
 from .test_database import *
 from .test_settings import *
+from .test_orderbook import *
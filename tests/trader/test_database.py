@@ -12,7 +12,10 @@ from vnpy.trader.object import BarData, TickData
 
 os.environ["VNPY_TESTING"] = "1"
 
-profiles = {Driver.SQLITE: {"driver": "sqlite", "database": "test_db.db"}}
+profiles = {
+    Driver.SQLITE: {"driver": "sqlite", "database": "test_db.db"},
+    Driver.NUMPY: {"driver": "numpy", "database": "test_numpy_db"},
+}
 if "VNPY_TEST_ONLY_SQLITE" not in os.environ:
     profiles.update(
         {
@@ -116,6 +119,41 @@ class TestDatabase(unittest.TestCase):
                 self.manager.save_bar_data([bar])
                 self.assertBarCount(1, "there should be only one item after upsert")
 
+    def test_upsert_duplicate_bar(self):
+        for driver, settings in profiles.items():
+            with self.subTest(driver=driver, settings=settings):
+                self.connect(settings)
+                first = copy(bar)
+                first.volume = 123.0
+                last = copy(bar)
+                last.volume = 456.0
+                self.manager.save_bar_data([first, last])
+                self.assertBarCount(1, "there should be only one item after upsert")
+
+                got = self.manager.get_newest_bar_data(
+                    bar.symbol, bar.exchange, bar.interval
+                )
+                self.assertEqual(got.volume, last.volume, "the last duplicated bar should win")
+
+    def test_sqlite_pragmas(self):
+        self.connect(profiles[Driver.SQLITE])
+        db = self.manager.class_bar._meta.database
+        pragmas = {
+            name: db.pragma(name)
+            for name in ["synchronous", "cache_size", "journal_mode"]
+        }
+
+        self.manager.save_bar_data([bar])
+        with db.atomic():
+            self.manager.save_tick_data([tick])
+
+        # Pragmas for bulk saving are restored after, and journal mode
+        # of the database file is left unchanged.
+        self.assertEqual(
+            {name: db.pragma(name) for name in pragmas}, pragmas
+        )
+        self.assertBarCount(1, "there should be only one item after save")
+
     def test_save_load_bar(self):
         for driver, settings in profiles.items():
             with self.subTest(driver=driver, settings=settings):
@@ -142,6 +180,41 @@ class TestDatabase(unittest.TestCase):
 
                 self.assertTickCount(1, "there should be only one item after save")
 
+    def test_load_bar_array(self):
+        for driver, settings in profiles.items():
+            with self.subTest(driver=driver, settings=settings):
+                self.connect(settings)
+                self.manager.save_bar_data([bar])
+
+                array = self.manager.load_bar_array(
+                    symbol=bar.symbol,
+                    exchange=bar.exchange,
+                    interval=bar.interval,
+                    start=bar.datetime - timedelta(days=1),
+                    end=now()
+                )
+                self.assertEqual(1, len(array), "there should be only one item after save")
+                self.assertEqual(
+                    bar.datetime.replace(microsecond=0),
+                    array["datetime"][0].tolist().replace(microsecond=0),
+                    "datetime of bar array mismatched"
+                )
+
+    def test_load_tick_array(self):
+        for driver, settings in profiles.items():
+            with self.subTest(driver=driver, settings=settings):
+                self.connect(settings)
+                self.manager.save_tick_data([tick])
+
+                array = self.manager.load_tick_array(
+                    symbol=tick.symbol,
+                    exchange=tick.exchange,
+                    start=tick.datetime - timedelta(days=1),
+                    end=now()
+                )
+                self.assertEqual(1, len(array), "there should be only one item after save")
+                self.assertEqual(0, array["bid_price_2"][0], "empty field should be zero")
+
     def test_newest_bar(self):
         for driver, settings in profiles.items():
             with self.subTest(driver=driver, settings=settings):
@@ -0,0 +1,166 @@
+"""
+Test if order book works fine
+"""
+import random
+import unittest
+import zlib
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.engine import OmsEngine
+from vnpy.trader.event import EVENT_DEPTH
+from vnpy.trader.object import DepthData, TickData
+from vnpy.trader.constant import Exchange
+from vnpy.trader.utility import OrderBook, format_number
+
+
+class TestOrderBook(unittest.TestCase):
+
+    def setUp(self):
+        self.book = OrderBook()
+        self.book.apply_snapshot(
+            bids=[(100, 1), (99.5, 2), (101, 3)],
+            asks=[(103, 4), (102, 5), (104.5, 6)],
+        )
+
+    def test_snapshot(self):
+        bids, asks = self.book.top(5)
+        self.assertEqual(bids, [(101, 3), (100, 1), (99.5, 2)])
+        self.assertEqual(asks, [(102, 5), (103, 4), (104.5, 6)])
+
+        self.book.apply_snapshot(bids=[(90, 1)], asks=[])
+        self.assertEqual(self.book.top(5), ([(90, 1)], []))
+
+    def test_delta(self):
+        self.book.apply_delta(
+            bids=[(101, 0), (100.5, 7), (100, 8), (98, 0)],
+            asks=[(102, 0), (101.5, 9)],
+        )
+
+        bids, asks = self.book.top(2)
+        self.assertEqual(bids, [(100.5, 7), (100, 8)])
+        self.assertEqual(asks, [(101.5, 9), (103, 4)])
+        self.assertEqual(len(self.book.bids), 3)
+        self.assertEqual(len(self.book.asks), 3)
+
+    def test_random_delta(self):
+        self.book.clear()
+
+        levels = {}
+        for _ in range(5000):
+            price = random.randint(1, 200) / 2
+            volume = random.choice([0, 1, 2, 3])
+            self.book.bids.update(price, volume)
+
+            if volume:
+                levels[price] = volume
+            else:
+                levels.pop(price, None)
+
+        expected = sorted(levels.items(), reverse=True)
+        self.assertEqual(self.book.bids.top(len(expected)), expected)
+
+    def test_checksum(self):
+        text = "101:3:102:-5:100:1:103:-4:99.5:2:104.5:-6"
+        value = zlib.crc32(text.encode())
+        if value >= 2 ** 31:
+            value -= 2 ** 32
+
+        self.assertEqual(self.book.checksum(25, ask_sign=-1), value)
+        self.assertNotEqual(self.book.checksum(25), value)
+
+        self.book.apply_delta(bids=[(100, 0), (99.5, 0)], asks=[])
+        text = "101:3:102:5:103:4:104.5:6"
+        self.assertEqual(
+            self.book.checksum(25) & 0xffffffff,
+            zlib.crc32(text.encode())
+        )
+
+    def test_format_number(self):
+        self.assertEqual(format_number(3500.0), "3500")
+        self.assertEqual(format_number(3500), "3500")
+        self.assertEqual(format_number(0.1), "0.1")
+        self.assertEqual(format_number(1e-05), "0.00001")
+        self.assertEqual(format_number(-2.5e-07), "-0.00000025")
+
+    def test_update_tick(self):
+        tick = TickData(
+            symbol="BTCUSD",
+            exchange=Exchange.BITFINEX,
+            datetime=None,
+            gateway_name="BITFINEX",
+        )
+        self.book.update_tick(tick)
+
+        self.assertEqual(tick.bid_price_1, 101)
+        self.assertEqual(tick.bid_volume_3, 2)
+        self.assertEqual(tick.bid_price_4, 0)
+        self.assertEqual(tick.ask_price_1, 102)
+        self.assertEqual(tick.ask_volume_3, 6)
+        self.assertEqual(tick.ask_volume_5, 0)
+
+
+class TestDepthData(unittest.TestCase):
+
+    def setUp(self):
+        book = OrderBook()
+        book.apply_snapshot(
+            bids=[(100, 1), (99.5, 2), (101, 3)],
+            asks=[(103, 4), (102, 5), (104.5, 6)],
+        )
+        self.depth = book.to_depth(
+            "BTCUSD", Exchange.BITFINEX, datetime.now(), "BITFINEX", 2
+        )
+
+    def create_delta(self, bids, asks):
+        return DepthData(
+            symbol="BTCUSD",
+            exchange=Exchange.BITFINEX,
+            datetime=datetime.now(),
+            bids=np.array(bids, dtype=float).reshape(-1, 2),
+            asks=np.array(asks, dtype=float).reshape(-1, 2),
+            is_delta=True,
+            gateway_name="BITFINEX",
+        )
+
+    def test_to_depth(self):
+        self.assertEqual(self.depth.vt_symbol, "BTCUSD.BITFINEX")
+        self.assertEqual(self.depth.bids.tolist(), [[101, 3], [100, 1]])
+        self.assertEqual(self.depth.asks.tolist(), [[102, 5], [103, 4]])
+
+        depth = OrderBook().to_depth(
+            "BTCUSD", Exchange.BITFINEX, datetime.now(), "BITFINEX"
+        )
+        self.assertEqual(depth.bids.shape, (0, 2))
+
+    def test_apply_delta(self):
+        delta = self.create_delta([[101, 0], [100.5, 7]], [])
+        depth = self.depth.apply_delta(delta)
+
+        self.assertEqual(depth.bids.tolist(), [[100.5, 7], [100, 1]])
+        self.assertIs(depth.asks, self.depth.asks)
+        self.assertFalse(depth.is_delta)
+
+    def test_oms_engine(self):
+        main_engine = SimpleNamespace()
+        oms_engine = OmsEngine(main_engine, EventEngine())
+
+        delta = self.create_delta([], [[101.5, 9]])
+        oms_engine.process_depth_event(Event(EVENT_DEPTH, delta))
+        self.assertIsNone(main_engine.get_depth("BTCUSD.BITFINEX"))
+
+        oms_engine.process_depth_event(Event(EVENT_DEPTH, self.depth))
+        oms_engine.process_depth_event(Event(EVENT_DEPTH, delta))
+
+        depth = main_engine.get_depth("BTCUSD.BITFINEX")
+        self.assertEqual(
+            depth.asks.tolist(), [[101.5, 9], [102, 5], [103, 4]]
+        )
+        self.assertEqual(main_engine.get_all_depths(), [depth])
+
+
+if __name__ == '__main__':
+    unittest.main()
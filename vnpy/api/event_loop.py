@@ -0,0 +1,28 @@
+"""
+Asyncio event loop shared by all async API clients, which runs in one
+background thread for the whole process.
+"""
+
+import asyncio
+from threading import Lock, Thread
+from typing import Optional
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the shared event loop, start it if not running yet.
+    """
+    global _loop
+
+    with _lock:
+        if not _loop:
+            _loop = asyncio.new_event_loop()
+
+            thread = Thread(target=_loop.run_forever, daemon=True)
+            thread.start()
+
+    return _loop
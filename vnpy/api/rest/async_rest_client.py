@@ -0,0 +1,243 @@
+import asyncio
+import json
+from itertools import count
+from threading import Lock
+from typing import Any, Callable, Dict, List, Union
+
+import aiohttp
+from multidict import CIMultiDict
+
+from vnpy.api.event_loop import get_event_loop
+from .rest_client import Request, RequestPriority, RestClient
+
+
+class AsyncResponse(object):
+    """
+    Response read from aiohttp, with the same attributes used from
+    requests.Response.
+    """
+
+    def __init__(self, status_code: int, text: str, headers: CIMultiDict):
+        """"""
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+
+    def json(self):
+        """"""
+        return json.loads(self.text)
+
+
+class AsyncRestClient(RestClient):
+    """
+    RestClient running on the asyncio event loop shared by all async
+    clients, instead of worker threads of its own.
+
+    Callbacks are the same as RestClient, but they are called in the event
+    loop thread, so do not block in them (e.g. with the request function).
+    Requests are processed in order by default, set concurrent to True
+    before start to process query requests in parallel.
+    """
+
+    def __init__(self):
+        """"""
+        super().__init__()
+
+        self._loop: asyncio.AbstractEventLoop = None
+        self._session: aiohttp.ClientSession = None
+
+        # Queue for each priority, which is shared if not concurrent.
+        self._queues: Dict[RequestPriority, asyncio.PriorityQueue] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._count = count()
+
+        # Requests added before start are sent after queues created.
+        self._pending: List[Request] = []
+        self._pending_lock = Lock()
+
+    def start(self, n: int = 3):
+        """
+        Start rest client with session count n, requests are processed in
+        the same way as RestClient.start.
+        """
+        if self._active:
+            return
+
+        self._loop = get_event_loop()
+
+        # Requests added before start are all queued before workers
+        # running, so that they are processed by priority.
+        with self._pending_lock:
+            self._active = True
+
+            items = [self._create_item(request) for request in self._pending]
+            self._pending.clear()
+
+            self._loop.call_soon_threadsafe(self._start_workers, n, items)
+
+    def stop(self):
+        """
+        Stop rest client immediately.
+        """
+        if not self._active:
+            return
+        self._active = False
+
+        asyncio.run_coroutine_threadsafe(self._stop_async(), self._loop)
+
+    def join(self):
+        """
+        Wait till all requests are processed.
+
+        This function cannot be called from callback function.
+        """
+        if not self._loop:
+            return
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._join_async(), self._loop
+        )
+        future.result()
+
+    def add_request(
+        self,
+        method: str,
+        path: str,
+        callback: Callable,
+        params: dict = None,
+        data: Union[dict, str, bytes] = None,
+        headers: dict = None,
+        on_failed: Callable = None,
+        on_error: Callable = None,
+        extra: Any = None,
+        priority: RequestPriority = RequestPriority.normal,
+    ):
+        """
+        Add a new request, see RestClient.add_request for parameters.
+        """
+        request = Request(
+            method,
+            path,
+            params,
+            data,
+            headers,
+            callback,
+            on_failed,
+            on_error,
+            extra,
+            priority,
+        )
+
+        with self._pending_lock:
+            if self._active:
+                self._put(request)
+            else:
+                self._pending.append(request)
+
+        return request
+
+    def _put(self, request: Request):
+        """
+        Put request into queue in event loop, high priority ones first
+        and then in order of adding.
+        """
+        item = self._create_item(request)
+        self._loop.call_soon_threadsafe(self._put_item, item)
+
+    def _create_item(self, request: Request):
+        """"""
+        return request.priority.value, next(self._count), request
+
+    def _put_item(self, item: tuple):
+        """"""
+        priority = item[2].priority
+        self._queues[priority].put_nowait(item)
+
+    def _start_workers(self, n: int, items: List[tuple]):
+        """"""
+        if not self.concurrent:
+            queue = asyncio.PriorityQueue()
+            self._queues = {priority: queue for priority in RequestPriority}
+            queues = [queue]
+        else:
+            self._queues = {
+                priority: asyncio.PriorityQueue() for priority in RequestPriority
+            }
+            queues = [self._queues[RequestPriority.normal]] * n
+            queues.append(self._queues[RequestPriority.high])
+
+        for item in items:
+            self._put_item(item)
+
+        connector = aiohttp.TCPConnector(limit=len(queues))
+        self._session = aiohttp.ClientSession(connector=connector)
+        self._tasks = [
+            asyncio.ensure_future(self._run_async(queue)) for queue in queues
+        ]
+
+    async def _stop_async(self):
+        """
+        Cancel requests processing and drop those still in queue.
+        """
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+        for queue in set(self._queues.values()):
+            while not queue.empty():
+                queue.get_nowait()
+                queue.task_done()
+
+        await self._session.close()
+
+    async def _join_async(self):
+        """"""
+        for queue in set(self._queues.values()):
+            await queue.join()
+
+    async def _run_async(self, queue: asyncio.PriorityQueue):
+        """
+        Process requests in queue one by one.
+        """
+        while True:
+            _, _, request = await queue.get()
+
+            try:
+                await self._send_async_request(request)
+            finally:
+                queue.task_done()
+
+    async def _send_async_request(self, request: Request):
+        """
+        Sending request to server and get result.
+        """
+        try:
+            request = self.sign(request)
+
+            url = self.make_full_url(request.path)
+
+            proxy = None
+            if self.proxies:
+                proxy = "http://" + self.proxies["http"]
+
+            # None value is skipped in query string, same as requests.
+            params = request.params
+            if params:
+                params = {k: str(v) for k, v in params.items() if v is not None}
+
+            async with self._session.request(
+                request.method,
+                url,
+                headers=request.headers,
+                params=params,
+                data=request.data,
+                proxy=proxy,
+            ) as response:
+                text = await response.text()
+
+            request.response = AsyncResponse(
+                response.status, text, CIMultiDict(response.headers)
+            )
+            self._process_response(request)
+        except Exception:
+            self._process_exception(request)
@@ -1,10 +1,11 @@
 import sys
 import traceback
+from collections import deque
 from datetime import datetime
 from enum import Enum
 from multiprocessing.dummy import Pool
-from queue import Empty, Queue
-from typing import Any, Callable, Optional, Union
+from threading import Condition
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
 
 import requests
 
@@ -16,6 +17,11 @@ class RequestStatus(Enum):
     error = 3  # Exception raised
 
 
+class RequestPriority(Enum):
+    high = 0  # Trading request, e.g. send and cancel order
+    normal = 1  # Query request
+
+
 class Request(object):
     """
     Request object for status check.
@@ -32,6 +38,7 @@ class Request(object):
         on_failed: Callable = None,
         on_error: Callable = None,
         extra: Any = None,
+        priority: RequestPriority = RequestPriority.normal,
     ):
         """"""
         self.method = method
@@ -44,6 +51,7 @@ class Request(object):
         self.on_failed = on_failed
         self.on_error = on_error
         self.extra = extra
+        self.priority = priority
 
         self.response = None
         self.status = RequestStatus.ready
@@ -73,6 +81,60 @@ class Request(object):
         )
 
 
+class RequestQueue(object):
+    """
+    Requests queued by priority, a worker can wait for requests of several
+    priorities at the same time.
+    """
+
+    def __init__(self):
+        """"""
+        self._condition = Condition()
+        self._queues: Dict[RequestPriority, Deque[Request]] = {
+            priority: deque() for priority in RequestPriority
+        }
+        self._unfinished = 0
+
+    def put(self, request: Request):
+        """"""
+        with self._condition:
+            self._queues[request.priority].append(request)
+            self._unfinished += 1
+            self._condition.notify_all()
+
+    def get(
+        self,
+        priorities: List[RequestPriority],
+        timeout: float
+    ) -> Optional[Request]:
+        """
+        Get request of the highest priority, return None if timeout.
+        """
+        queues = [self._queues[priority] for priority in priorities]
+
+        with self._condition:
+            self._condition.wait_for(lambda: any(queues), timeout)
+
+            for queue in queues:
+                if queue:
+                    return queue.popleft()
+            return None
+
+    def task_done(self):
+        """"""
+        with self._condition:
+            self._unfinished -= 1
+            if not self._unfinished:
+                self._condition.notify_all()
+
+    def join(self):
+        """
+        Wait till all requests are processed.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: not self._unfinished)
+
+
 class RestClient(object):
     """
     HTTP Client designed for all sorts of trading RESTFul API.
@@ -81,6 +143,10 @@ class RestClient(object):
     * Reimplement on_failed function to handle Non-2xx responses.
     * Use on_failed parameter in add_request function for individual Non-2xx response handling.
     * Reimplement on_error function to handle exception msg.
+    * Use high priority in add_request function for trading requests, which
+      are processed before query requests waiting in queue.
+    * Set concurrent to True before start to process query requests with
+      several sessions in parallel.
     """
 
     def __init__(self):
@@ -89,11 +155,16 @@ class RestClient(object):
         self.url_base = ''  # type: str
         self._active = False
 
-        self._queue = Queue()
+        self._queue = RequestQueue()
         self._pool = None  # type: Pool
 
         self.proxies = None
 
+        # Requests are processed one by one by default, so that trading
+        # requests reach server in order, nonce in signature keeps
+        # increasing and callbacks are called in one thread.
+        self.concurrent = False
+
     def init(self, url_base: str, proxy_host: str = "", proxy_port: int = 0):
         """
         Init rest client with url_base which is the API root address.
@@ -112,13 +183,33 @@ class RestClient(object):
     def start(self, n: int = 3):
         """
         Start rest client with session count n.
+
+        If concurrent is False, all requests are processed in order by one
+        session, high priority ones first.
+
+        If concurrent is True, normal priority requests are processed by n
+        sessions in parallel, and high priority requests are processed in
+        order by one more session, so their callbacks may be called in
+        different threads at the same time.
         """
         if self._active:
             return
 
         self._active = True
-        self._pool = Pool(n)
-        self._pool.apply_async(self._run)
+
+        if not self.concurrent:
+            self._pool = Pool(1)
+            self._pool.apply_async(
+                self._run, ([RequestPriority.high, RequestPriority.normal],)
+            )
+            return
+
+        self._pool = Pool(n + 1)
+
+        for _ in range(n):
+            self._pool.apply_async(self._run, ([RequestPriority.normal],))
+
+        self._pool.apply_async(self._run, ([RequestPriority.high],))
 
     def stop(self):
         """
@@ -143,6 +234,7 @@ class RestClient(object):
         on_failed: Callable = None,
         on_error: Callable = None,
         extra: Any = None,
+        priority: RequestPriority = RequestPriority.normal,
     ):
         """
         Add a new request.
@@ -155,6 +247,7 @@ class RestClient(object):
         :param on_failed: callback function if Non-2xx status, type, type: (code, dict, Request)
         :param on_error: callback function when catching Python exception, type: (etype, evalue, tb, Request)
         :param extra: Any extra data which can be used when handling callback
+        :param priority: use high for trading requests
         :return: Request
         """
         request = Request(
@@ -167,22 +260,26 @@ class RestClient(object):
             on_failed,
             on_error,
             extra,
+            priority,
         )
         self._queue.put(request)
         return request
 
-    def _run(self):
+    def _run(self, priorities: List[RequestPriority]):
+        """
+        Process requests of priorities with one session.
+        """
         try:
             session = self._create_session()
             while self._active:
+                request = self._queue.get(priorities, timeout=1)
+                if not request:
+                    continue
+
                 try:
-                    request = self._queue.get(timeout=1)
-                    try:
-                        self._process_request(request, session)
-                    finally:
-                        self._queue.task_done()
-                except Empty:
-                    pass
+                    self._process_request(request, session)
+                finally:
+                    self._queue.task_done()
         except Exception:
             et, ev, tb = sys.exc_info()
             self.on_error(et, ev, tb, None)
@@ -253,29 +350,42 @@ class RestClient(object):
                 proxies=self.proxies,
             )
             request.response = response
-            status_code = response.status_code
-            if status_code // 100 == 2:  # 2xx codes are all successful
-                if status_code == 204:
-                    json_body = None
-                else:
-                    json_body = response.json()
-
-                request.callback(json_body, request)
-                request.status = RequestStatus.success
+            self._process_response(request)
+        except Exception:
+            self._process_exception(request)
+
+    def _process_response(self, request: Request):
+        """
+        Call callback function according to status code of response.
+        """
+        response = request.response
+        status_code = response.status_code
+        if status_code // 100 == 2:  # 2xx codes are all successful
+            if status_code == 204:
+                json_body = None
             else:
-                request.status = RequestStatus.failed
+                json_body = response.json()
 
-                if request.on_failed:
-                    request.on_failed(status_code, request)
-                else:
-                    self.on_failed(status_code, request)
-        except Exception:
-            request.status = RequestStatus.error
-            t, v, tb = sys.exc_info()
-            if request.on_error:
-                request.on_error(t, v, tb, request)
+            request.callback(json_body, request)
+            request.status = RequestStatus.success
+        else:
+            request.status = RequestStatus.failed
+
+            if request.on_failed:
+                request.on_failed(status_code, request)
             else:
-                self.on_error(t, v, tb, request)
+                self.on_failed(status_code, request)
+
+    def _process_exception(self, request: Request):
+        """
+        Call error callback function with exception being handled.
+        """
+        request.status = RequestStatus.error
+        t, v, tb = sys.exc_info()
+        if request.on_error:
+            request.on_error(t, v, tb, request)
+        else:
+            self.on_error(t, v, tb, request)
 
     def make_full_url(self, path: str):
         """
@@ -1 +1,2 @@
+from .decoder import JsonDecoder, ZlibJsonDecoder
 from .websocket_client import WebsocketClient
@@ -0,0 +1,163 @@
+import asyncio
+import sys
+from concurrent.futures import Future
+
+import aiohttp
+
+from vnpy.api.event_loop import get_event_loop
+from .websocket_client import WebsocketClient
+
+
+class AsyncWebsocketClient(WebsocketClient):
+    """
+    WebsocketClient running on the asyncio event loop shared by all async
+    clients, instead of worker and ping threads of its own.
+
+    Callbacks are the same as WebsocketClient, but they are called in the
+    event loop thread, so do not block in them. Ping is sent by aiohttp
+    heartbeat every ping_interval seconds.
+    """
+
+    def __init__(self):
+        """"""
+        super().__init__()
+
+        self._loop: asyncio.AbstractEventLoop = None
+        self._future: Future = None
+        self._send_queue: asyncio.Queue = None
+
+    def start(self):
+        """
+        Start the client and on_connected function is called after webscoket
+        is connected succesfully.
+
+        Please don't send packet untill on_connected fucntion is called.
+        """
+        if self._active:
+            return
+
+        self._active = True
+        self._loop = get_event_loop()
+        self._future = asyncio.run_coroutine_threadsafe(self._run(), self._loop)
+
+    def stop(self):
+        """
+        Stop the client.
+        """
+        self._active = False
+
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._put_packet, None)
+
+    def join(self):
+        """
+        Wait till the client finishes.
+
+        This function cannot be called from callback function.
+        """
+        if self._future:
+            self._future.result()
+
+    def _send_text(self, text: str):
+        """
+        Send a text string to server.
+        """
+        if self._ws:
+            self._loop.call_soon_threadsafe(self._put_packet, text)
+
+    def _send_binary(self, data: bytes):
+        """
+        Send bytes data to server.
+        """
+        if self._ws:
+            self._loop.call_soon_threadsafe(self._put_packet, data)
+
+    def _put_packet(self, packet):
+        """
+        Packets are sent in order by sending task, None to close connection.
+        """
+        if self._send_queue:
+            self._send_queue.put_nowait(packet)
+
+    async def _run_send(self, ws: aiohttp.ClientWebSocketResponse):
+        """"""
+        while True:
+            packet = await self._send_queue.get()
+
+            if packet is None:
+                await ws.close()
+                return
+            elif isinstance(packet, str):
+                await ws.send_str(packet)
+            else:
+                await ws.send_bytes(packet)
+
+    async def _run(self):
+        """
+        Keep running till stop is called.
+        """
+        proxy = None
+        if self.proxy_host and self.proxy_port:
+            proxy = f"http://{self.proxy_host}:{self.proxy_port}"
+
+        async with aiohttp.ClientSession() as session:
+            while self._active:
+                try:
+                    await self._run_connection(session, proxy)
+                except Exception:
+                    et, ev, tb = sys.exc_info()
+                    self.on_error(et, ev, tb)
+
+                    # Wait before reconnecting, not to block other clients.
+                    await asyncio.sleep(1)
+
+    async def _run_connection(self, session: aiohttp.ClientSession, proxy: str):
+        """
+        Connect and receive data till connection is closed.
+        """
+        ws = await session.ws_connect(
+            self.host,
+            proxy=proxy,
+            headers=self.header,
+            heartbeat=self.ping_interval,
+            ssl=False,
+        )
+
+        # Stop is called during connecting.
+        if not self._active:
+            await ws.close()
+            return
+
+        self._send_queue = asyncio.Queue()
+        sender = asyncio.ensure_future(self._run_send(ws))
+        self._ws = ws
+
+        try:
+            self.on_connected()
+
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    text = msg.data
+                elif msg.type == aiohttp.WSMsgType.BINARY:
+                    text = msg.data
+                else:
+                    break
+
+                if self.record_received_text:
+                    self._record_last_received_text(text)
+
+                try:
+                    data = self.unpack_data(text)
+                except ValueError as e:
+                    print("websocket unable to parse data: " + str(text))
+                    raise e
+
+                self.on_packet(data)
+        finally:
+            self._ws = None
+            self._send_queue = None
+
+            sender.cancel()
+            await ws.close()
+
+            self.on_disconnected()
@@ -0,0 +1,50 @@
+"""
+Decoders for websocket messages, faster json library is used if installed.
+"""
+
+import json
+import zlib
+from typing import Any, Union
+
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        json_loads = ujson.loads
+    except ImportError:
+        json_loads = json.loads
+
+
+class JsonDecoder(object):
+    """
+    Decode json text or bytes.
+    """
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        """"""
+        return json_loads(data)
+
+
+class ZlibJsonDecoder(JsonDecoder):
+    """
+    Decode json compressed by zlib, e.g. wbits of 31 for gzip data and
+    -zlib.MAX_WBITS for raw deflate data.
+    """
+
+    def __init__(self, wbits: int = zlib.MAX_WBITS):
+        """"""
+        self.wbits = wbits
+
+        # Output buffer is created with size of the last message, so that
+        # it doesn't grow several times for each large message.
+        self.bufsize = zlib.DEF_BUF_SIZE
+
+    def decode(self, data: bytes) -> Any:
+        """"""
+        text = zlib.decompress(data, self.wbits, self.bufsize)
+        self.bufsize = max(len(text), zlib.DEF_BUF_SIZE)
+        return json_loads(text)
@@ -9,6 +9,8 @@ from time import sleep
 
 import websocket
 
+from .decoder import JsonDecoder
+
 
 class WebsocketClient(object):
     """
@@ -20,7 +22,8 @@ class WebsocketClient(object):
     Use stop to stop threads and disconnect websocket before destroying the client
     object (especially when exiting the programme).
 
-    Default serialization format is json.
+    Default serialization format is json, set decoder to another one or
+    override unpack_data to use other format.
 
     Callbacks to overrides:
     * unpack_data
@@ -50,7 +53,11 @@ class WebsocketClient(object):
         self.ping_interval = 60     # seconds
         self.header = {}
 
-        # For debugging
+        self.decoder = JsonDecoder()
+
+        # For debugging, disable recording received text for high frequency
+        # data which is not readable, e.g. compressed data.
+        self.record_received_text = True
         self._last_sent_text = None
         self._last_received_text = None
 
@@ -176,7 +183,8 @@ class WebsocketClient(object):
                             self._disconnect()
                             continue
 
-                        self._record_last_received_text(text)
+                        if self.record_received_text:
+                            self._record_last_received_text(text)
 
                         try:
                             data = self.unpack_data(text)
@@ -200,14 +208,13 @@ class WebsocketClient(object):
             self.on_error(et, ev, tb)
         self._disconnect()
 
-    @staticmethod
-    def unpack_data(data: str):
+    def unpack_data(self, data: str):
         """
-        Default serialization format is json.
+        Decode data with decoder, default serialization format is json.
 
         override this method if you want to use other serialization format.
         """
-        return json.loads(data)
+        return self.decoder.decode(data)
 
     def _run_ping(self):
         """"""
@@ -23,6 +23,7 @@ APP_NAME = "CtaBacktester"
 EVENT_BACKTESTER_LOG = "eBacktesterLog"
 EVENT_BACKTESTER_BACKTESTING_FINISHED = "eBacktesterBacktestingFinished"
 EVENT_BACKTESTER_OPTIMIZATION_FINISHED = "eBacktesterOptimizationFinished"
+EVENT_BACKTESTER_OPTIMIZATION_PROGRESS = "eBacktesterOptimizationProgress"
 
 
 class BacktesterEngine(BaseEngine):
@@ -243,7 +244,7 @@ class BacktesterEngine(BaseEngine):
         else:
             self.write_log("开始多进程参数优化")
 
-        self.result_values = None
+        self.result_values = []
 
         engine = self.backtesting_engine
         engine.clear_data()
@@ -269,12 +270,15 @@ class BacktesterEngine(BaseEngine):
         if use_ga:
             self.result_values = engine.run_ga_optimization(
                 optimization_setting,
-                output=False
+                output=False,
+                use_store=True
             )
         else:
             self.result_values = engine.run_optimization(
                 optimization_setting,
-                output=False
+                output=False,
+                use_store=True,
+                callback=self.process_optimization_result
             )
 
         # Clear thread object handler.
@@ -285,6 +289,23 @@ class BacktesterEngine(BaseEngine):
         event = Event(EVENT_BACKTESTER_OPTIMIZATION_FINISHED)
         self.event_engine.put(event)
 
+    def process_optimization_result(self, result: tuple, count: int, total: int):
+        """
+        Keep result finished, and put progress event of (count, total).
+        """
+        self.result_values.append(result)
+
+        event = Event(EVENT_BACKTESTER_OPTIMIZATION_PROGRESS, (count, total))
+        self.event_engine.put(event)
+
+    def stop_optimization(self):
+        """"""
+        if not self.thread:
+            return
+
+        self.backtesting_engine.stop_optimization()
+        self.write_log("正在停止参数优化")
+
     def start_optimization(
         self,
         class_name: str,
@@ -304,6 +325,9 @@ class BacktesterEngine(BaseEngine):
             self.write_log("已有任务在运行中，请等待完成")
             return False
 
+        # Stop clicked before running starts in thread is kept.
+        self.backtesting_engine.request_optimization()
+
         self.write_log("-" * 40)
         self.thread = Thread(
             target=self.run_optimization,
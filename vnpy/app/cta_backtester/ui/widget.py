@@ -7,6 +7,7 @@ from ..engine import (
     EVENT_BACKTESTER_LOG,
     EVENT_BACKTESTER_BACKTESTING_FINISHED,
     EVENT_BACKTESTER_OPTIMIZATION_FINISHED,
+    EVENT_BACKTESTER_OPTIMIZATION_PROGRESS,
     OptimizationSetting
 )
 from vnpy.trader.constant import Interval, Direction
@@ -23,6 +24,7 @@ class BacktesterManager(QtWidgets.QWidget):
     signal_log = QtCore.pyqtSignal(Event)
     signal_backtesting_finished = QtCore.pyqtSignal(Event)
     signal_optimization_finished = QtCore.pyqtSignal(Event)
+    signal_optimization_progress = QtCore.pyqtSignal(Event)
 
     def __init__(self, main_engine: MainEngine, event_engine: EventEngine):
         """"""
@@ -90,6 +92,12 @@ class BacktesterManager(QtWidgets.QWidget):
         optimization_button = QtWidgets.QPushButton("参数优化")
         optimization_button.clicked.connect(self.start_optimization)
 
+        self.stop_button = QtWidgets.QPushButton("停止优化")
+        self.stop_button.clicked.connect(self.stop_optimization)
+        self.stop_button.setEnabled(False)
+
+        self.optimization_progress = QtWidgets.QProgressBar()
+
         self.result_button = QtWidgets.QPushButton("优化结果")
         self.result_button.clicked.connect(self.show_optimization_result)
         self.result_button.setEnabled(False)
@@ -116,6 +124,7 @@ class BacktesterManager(QtWidgets.QWidget):
         for button in [
             backtesting_button,
             optimization_button,
+            self.stop_button,
             downloading_button,
             self.result_button,
             self.order_button,
@@ -148,6 +157,8 @@ class BacktesterManager(QtWidgets.QWidget):
         left_vbox.addWidget(self.candle_button)
         left_vbox.addStretch()
         left_vbox.addWidget(optimization_button)
+        left_vbox.addWidget(self.stop_button)
+        left_vbox.addWidget(self.optimization_progress)
         left_vbox.addWidget(self.result_button)
 
         # Result part
@@ -199,12 +210,16 @@ class BacktesterManager(QtWidgets.QWidget):
             self.process_backtesting_finished_event)
         self.signal_optimization_finished.connect(
             self.process_optimization_finished_event)
+        self.signal_optimization_progress.connect(
+            self.process_optimization_progress_event)
 
         self.event_engine.register(EVENT_BACKTESTER_LOG, self.signal_log.emit)
         self.event_engine.register(
             EVENT_BACKTESTER_BACKTESTING_FINISHED, self.signal_backtesting_finished.emit)
         self.event_engine.register(
             EVENT_BACKTESTER_OPTIMIZATION_FINISHED, self.signal_optimization_finished.emit)
+        self.event_engine.register(
+            EVENT_BACKTESTER_OPTIMIZATION_PROGRESS, self.signal_optimization_progress.emit)
 
     def process_log_event(self, event: Event):
         """"""
@@ -234,6 +249,17 @@ class BacktesterManager(QtWidgets.QWidget):
         """"""
         self.write_log("请点击[优化结果]按钮查看")
         self.result_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+
+    def process_optimization_progress_event(self, event: Event):
+        """
+        Update progress bar, results finished can be viewed before all done.
+        """
+        count, total = event.data
+        self.optimization_progress.setMaximum(total)
+        self.optimization_progress.setValue(count)
+
+        self.result_button.setEnabled(True)
 
     def start_backtesting(self):
         """"""
@@ -307,7 +333,7 @@ class BacktesterManager(QtWidgets.QWidget):
         optimization_setting, use_ga = dialog.get_setting()
         self.target_display = dialog.target_display
 
-        self.backtester_engine.start_optimization(
+        result = self.backtester_engine.start_optimization(
             class_name,
             vt_symbol,
             interval,
@@ -322,7 +348,14 @@ class BacktesterManager(QtWidgets.QWidget):
             use_ga
         )
 
-        self.result_button.setEnabled(False)
+        if result:
+            self.result_button.setEnabled(False)
+            self.stop_button.setEnabled(True)
+            self.optimization_progress.reset()
+
+    def stop_optimization(self):
+        """"""
+        self.backtester_engine.stop_optimization()
 
     def start_downloading(self):
         """"""
@@ -343,7 +376,12 @@ class BacktesterManager(QtWidgets.QWidget):
 
     def show_optimization_result(self):
         """"""
-        result_values = self.backtester_engine.get_result_values()
+        # Results may be still adding while optimization running
+        result_values = sorted(
+            self.backtester_engine.get_result_values() or [],
+            reverse=True,
+            key=lambda result: result[1]
+        )
 
         dialog = OptimizationResultMonitor(
             result_values,
@@ -1,10 +1,16 @@
+from ast import literal_eval
 from collections import defaultdict
 from datetime import date, datetime, timedelta
 from typing import Callable
 from itertools import product
-from functools import lru_cache
+from functools import lru_cache, partial
+from pathlib import Path
 from time import time
+import hashlib
+import inspect
 import multiprocessing
+import multiprocessing.pool
+import pickle
 import random
 
 import numpy as np
@@ -17,7 +23,7 @@ from vnpy.trader.constant import (Direction, Offset, Exchange,
                                   Interval, Status)
 from vnpy.trader.database import database_manager
 from vnpy.trader.object import OrderData, TradeData, BarData, TickData
-from vnpy.trader.utility import round_to
+from vnpy.trader.utility import round_to, get_folder_path
 
 from .base import (
     BacktestingMode,
@@ -33,6 +39,13 @@ creator.create("FitnessMax", base.Fitness, weights=(1.0,))
 creator.create("Individual", list, fitness=creator.FitnessMax)
 
 
+class OptimizationStopped(Exception):
+    """
+    Raised inside genetic algorithm when optimization is stopped.
+    """
+    pass
+
+
 class OptimizationSetting:
     """
     Setting for runnning optimization.
@@ -94,6 +107,174 @@ class OptimizationSetting:
             settings_ga.append(param)
         return settings_ga
 
+    def get_size(self):
+        """
+        Get count of all parameter combinations.
+        """
+        size = 1
+        for values in self.params.values():
+            size *= len(values)
+        return size
+
+    def get_setting(self, index: int):
+        """
+        Get setting by index, in the same order of generate_setting.
+        """
+        setting = {}
+
+        for name, values in reversed(list(self.params.items())):
+            index, n = divmod(index, len(values))
+            setting[name] = values[n]
+
+        return dict(reversed(list(setting.items())))
+
+    def generate_setting_random(self, count: int, exclude: set = None):
+        """
+        Sample settings randomly without generating all combinations,
+        setting with str in exclude is not sampled again.
+        """
+        exclude = exclude or set()
+
+        size = self.get_size()
+        count = min(count, size - len(exclude))
+        if count <= 0:
+            return []
+
+        settings = []
+        sample_count = min(count + len(exclude), size)
+
+        for index in random.sample(range(size), sample_count):
+            setting = self.get_setting(index)
+            if str(setting) in exclude:
+                continue
+
+            settings.append(setting)
+            if len(settings) >= count:
+                break
+
+        return settings
+
+    def generate_setting_tpe(
+        self,
+        results: list,
+        count: int,
+        gamma: float = 0.25,
+        candidate_count: int = 24
+    ):
+        """
+        Suggest settings by Tree-structured Parzen Estimator, with results
+        of (setting, target value) evaluated already.
+
+        Values of each parameter are counted in good results (the top
+        gamma of all) and the other results. Candidates are sampled by
+        frequency in good results, and the ones with the highest ratio of
+        good frequency to bad frequency are suggested.
+        """
+        exclude = set(str(setting) for setting, _ in results)
+
+        results = sorted(results, reverse=True, key=lambda result: result[1])
+        good_count = max(1, int(len(results) * gamma))
+        good = [setting for setting, _ in results[:good_count]]
+        bad = [setting for setting, _ in results[good_count:]]
+
+        # Frequency of each value, with 1 added as prior
+        densities = {}
+
+        for name, values in self.params.items():
+            good_weights = [1 + sum(s[name] == v for s in good) for v in values]
+            bad_weights = [1 + sum(s[name] == v for s in bad) for v in values]
+
+            good_total = sum(good_weights)
+            bad_total = sum(bad_weights)
+
+            ratios = [
+                (g / good_total) / (b / bad_total)
+                for g, b in zip(good_weights, bad_weights)
+            ]
+            densities[name] = (values, good_weights, ratios)
+
+        # Sample candidates and score them
+        candidates = {}
+
+        for _ in range(count * candidate_count):
+            setting = {}
+            score = 1
+
+            for name, (values, good_weights, ratios) in densities.items():
+                n = random.choices(range(len(values)), good_weights)[0]
+                setting[name] = values[n]
+                score *= ratios[n]
+
+            key = str(setting)
+            if key not in exclude:
+                candidates[key] = (score, setting)
+
+        candidates = sorted(
+            candidates.values(), reverse=True, key=lambda c: c[0]
+        )
+        settings = [setting for _, setting in candidates[:count]]
+
+        # Fill with random settings if candidates not enough
+        if len(settings) < count:
+            exclude.update(str(setting) for setting in settings)
+            settings.extend(
+                self.generate_setting_random(count - len(settings), exclude)
+            )
+
+        return settings
+
+
+class OptimizationStore:
+    """
+    Optimization results saved in file, one record is appended for each
+    result finished, so that results are kept if optimization interrupted.
+    """
+
+    def __init__(self, path: Path):
+        """"""
+        self.path = path
+
+    def load(self):
+        """
+        Load statistics of all results saved, key is str of setting.
+        """
+        saved = {}
+
+        if not self.path.exists():
+            return saved
+
+        with open(self.path, "rb+") as f:
+            while True:
+                pos = f.tell()
+
+                try:
+                    setting, statistics = pickle.load(f)
+                except EOFError:
+                    break
+                # The last record may be incomplete if interrupted, which
+                # is removed so that new records can be appended.
+                except Exception:  # noqa
+                    f.truncate(pos)
+                    break
+
+                saved[setting] = statistics
+
+        return saved
+
+    def save(self, result: tuple):
+        """
+        Append result of (setting, target value, statistics).
+        """
+        setting, _, statistics = result
+
+        with open(self.path, "ab") as f:
+            pickle.dump((setting, statistics), f)
+
+    def clear(self):
+        """"""
+        if self.path.exists():
+            self.path.unlink()
+
 
 class BacktestingEngine:
     """"""
@@ -142,6 +323,9 @@ class BacktestingEngine:
         self.daily_results = {}
         self.daily_df = None
 
+        self.optimization_active = False
+        self.optimization_requested = False
+
     def clear_data(self):
         """
         Clear all data of last backtesting.
@@ -512,47 +696,235 @@ class BacktestingEngine:
 
         plt.show()
 
-    def run_optimization(self, optimization_setting: OptimizationSetting, output=True):
-        """"""
-        # Get optimization setting and target
+    def run_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        output=True,
+        use_store=False,
+        callback: Callable = None
+    ):
+        """
+        Callback is called with each result as soon as finished, count of
+        results finished and total count.
+        """
+        if not self.check_optimization_setting(optimization_setting):
+            return
+
         settings = optimization_setting.generate_setting()
         target_name = optimization_setting.target_name
 
-        if not settings:
-            self.output("优化参数组合为空，请检查")
+        self.begin_optimization()
+
+        return self.run_optimization_settings(
+            settings, target_name, output, use_store, callback
+        )
+
+    def run_random_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        count: int = 100,
+        output=True,
+        use_store=False,
+        callback: Callable = None
+    ):
+        """
+        Run backtesting of settings sampled randomly, count is the most
+        backtesting to run.
+        """
+        if not self.check_optimization_setting(optimization_setting):
             return
 
-        if not target_name:
-            self.output("优化目标未设置，请检查")
+        settings = optimization_setting.generate_setting_random(count)
+        target_name = optimization_setting.target_name
+
+        self.output(f"参数优化空间：{optimization_setting.get_size()}")
+        self.output(f"随机抽样个数：{len(settings)}")
+
+        self.begin_optimization()
+
+        return self.run_optimization_settings(
+            settings, target_name, output, use_store, callback
+        )
+
+    def run_halving_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        count: int = 81,
+        eta: int = 3,
+        output=True,
+        use_store=False,
+        callback: Callable = None
+    ):
+        """
+        Run successive halving: settings sampled randomly are backtested
+        on the latest part of data first, and only the best 1/eta of them
+        are backtested again on data eta times longer, until the last
+        round on all data.
+
+        Callback is called with results of every round, count of results
+        finished and total count of all rounds.
+
+        Return results of the last round.
+        """
+        if not self.check_optimization_setting(optimization_setting):
             return
 
-        # Use multiprocessing pool for running backtesting with different setting
+        settings = optimization_setting.generate_setting_random(count)
+        target_name = optimization_setting.target_name
+
+        rounds = 1
+        while len(settings) // eta ** rounds:
+            rounds += 1
+
+        sizes = [len(settings)]
+        for _ in range(rounds - 1):
+            sizes.append(max(1, sizes[-1] // eta))
+        total = sum(sizes)
+
+        start = self.start
+        original_end = self.end
+        end = self.end or datetime.now()
+        total_delta = end - start
+
+        self.output(f"参数优化空间：{optimization_setting.get_size()}")
+        self.output(f"随机抽样个数：{len(settings)}")
+        self.output(f"筛选轮数：{rounds}")
+
+        # Check before end is changed for rounds.
+        if use_store:
+            use_store = self.check_store_end()
+
+        self.begin_optimization()
+        result_values = []
+
+        try:
+            for n in range(rounds):
+                if not self.optimization_active:
+                    break
+
+                # Data of the last round starts from start
+                fraction = eta ** (n + 1 - rounds)
+                self.start = max(start, end - total_delta * fraction)
+                self.end = end
+
+                self.output(
+                    f"第{n + 1}轮：参数{len(settings)}组，"
+                    f"数据区间{self.start}-{self.end}"
+                )
+
+                round_callback = None
+                if callback:
+                    finished = sum(sizes[:n])
+                    round_callback = partial(
+                        report_round_result, callback, finished, total
+                    )
+
+                result_values = self.run_optimization_settings(
+                    settings, target_name, False, use_store, round_callback
+                )
+
+                # Keep the best ones for next round
+                setting_map = {str(setting): setting for setting in settings}
+                keep_count = max(1, len(settings) // eta)
+
+                settings = [
+                    setting_map[result[0]]
+                    for result in result_values[:keep_count]
+                ]
+        finally:
+            self.start = start
+            self.end = original_end
+
+        if output:
+            for value in result_values:
+                msg = f"参数：{value[0]}, 目标：{value[1]}"
+                self.output(msg)
+
+        return result_values
+
+    def run_tpe_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        count: int = 100,
+        batch_size: int = 0,
+        output=True,
+        use_store=False,
+        callback: Callable = None
+    ):
+        """
+        Run sequential search with Tree-structured Parzen Estimator, count
+        is the most backtesting to run.
+
+        Settings are suggested by results finished in batches of batch_size,
+        which is count of processes if not specified. The first quarter
+        of backtesting is sampled randomly.
+        """
+        if not self.check_optimization_setting(optimization_setting):
+            return
+
+        target_name = optimization_setting.target_name
+
+        count = min(count, optimization_setting.get_size())
+        batch_size = batch_size or multiprocessing.cpu_count()
+        random_count = max(batch_size, count // 4)
+
+        self.output(f"参数优化空间：{optimization_setting.get_size()}")
+        self.output(f"优化回测次数：{count}")
+
+        self.begin_optimization()
+        result_values = []
+
+        if use_store:
+            use_store = self.check_store_end()
+
+        # Use the same pool and shared data for all batches
+        shared_data = self.create_shared_data()
         pool = multiprocessing.Pool(multiprocessing.cpu_count())
 
-        results = []
-        for setting in settings:
-            result = (pool.apply_async(optimize, (
-                target_name,
-                self.strategy_class,
-                setting,
-                self.vt_symbol,
-                self.interval,
-                self.start,
-                self.rate,
-                self.slippage,
-                self.size,
-                self.pricetick,
-                self.capital,
-                self.end,
-                self.mode
-            )))
-            results.append(result)
-
-        pool.close()
-        pool.join()
+        try:
+            while len(result_values) < count and self.optimization_active:
+                size = min(batch_size, count - len(result_values))
+
+                if len(result_values) < random_count:
+                    exclude = set(result[0] for result in result_values)
+                    settings = optimization_setting.generate_setting_random(
+                        size, exclude
+                    )
+                else:
+                    results = [
+                        (eval_setting(result[0]), result[1])
+                        for result in result_values
+                    ]
+                    settings = optimization_setting.generate_setting_tpe(
+                        results, size
+                    )
+
+                if not settings:
+                    break
+
+                batch_start = len(result_values)
+
+                for result in self.iter_optimization(
+                    settings, target_name, use_store, pool, shared_data
+                ):
+                    result_values.append(result)
+
+                    if callback:
+                        callback(result, len(result_values), count)
+
+                # Results finish in random order, keep them in order of
+                # settings so that search with the same seed is repeatable.
+                result_values[batch_start:] = sort_by_settings(
+                    result_values[batch_start:], settings
+                )
+        finally:
+            pool.terminate()
+            pool.join()
+
+            if shared_data:
+                shared_data.close()
 
         # Sort results and output
-        result_values = [result.get() for result in results]
         result_values.sort(reverse=True, key=lambda result: result[1])
 
         if output:
@@ -562,7 +934,268 @@ class BacktestingEngine:
 
         return result_values
 
-    def run_ga_optimization(self, optimization_setting: OptimizationSetting, population_size=100, ngen_size=30, output=True):
+    def check_optimization_setting(self, optimization_setting: OptimizationSetting):
+        """"""
+        if not optimization_setting.params:
+            self.output("优化参数组合为空，请检查")
+            return False
+
+        if not optimization_setting.target_name:
+            self.output("优化目标未设置，请检查")
+            return False
+
+        return True
+
+    def run_optimization_settings(
+        self,
+        settings: list,
+        target_name: str,
+        output=True,
+        use_store=False,
+        callback: Callable = None
+    ):
+        """
+        Run backtesting of all settings, and return results sorted by
+        target value.
+
+        Optimization should be activated by begin_optimization before.
+        """
+        result_values = []
+        total = len(settings)
+
+        for result in self.iter_optimization(settings, target_name, use_store):
+            result_values.append(result)
+
+            if callback:
+                callback(result, len(result_values), total)
+
+        # Sort results and output, results of the same target value are
+        # kept in order of settings.
+        result_values = sort_by_settings(result_values, settings)
+        result_values.sort(reverse=True, key=lambda result: result[1])
+
+        if output:
+            for value in result_values:
+                msg = f"参数：{value[0]}, 目标：{value[1]}"
+                self.output(msg)
+
+        return result_values
+
+    def iter_optimization(
+        self,
+        settings: list,
+        target_name: str,
+        use_store: bool = False,
+        pool: multiprocessing.pool.Pool = None,
+        shared_data=None
+    ):
+        """
+        Run backtesting of settings in process pool, and yield result of
+        (setting, target value, statistics) in order of finished.
+
+        If use_store is set, results are saved into optimization store as
+        soon as finished, and saved results of the same backtesting are not
+        run again.
+
+        Pool and shared data are created and closed inside if not provided,
+        otherwise they should be closed by caller.
+        """
+        own_pool = pool is None
+        if use_store:
+            use_store = self.check_store_end()
+
+        # History data is loaded only once and shared with all processes,
+        # which is also used by optimization store.
+        if own_pool:
+            shared_data = self.create_shared_data()
+
+        finished = False
+
+        try:
+            # Get results saved in store
+            store = None
+            saved = {}
+
+            if use_store:
+                store = self.get_optimization_store()
+                if store:
+                    saved = store.load()
+
+            new_settings = []
+            saved_count = 0
+
+            for setting in settings:
+                statistics = saved.get(str(setting), None)
+                if statistics:
+                    saved_count += 1
+                    yield (str(setting), statistics[target_name], statistics)
+                else:
+                    new_settings.append(setting)
+
+            if saved_count:
+                self.output(f"读取已保存优化结果：{saved_count}")
+
+            # Run backtesting only if any setting not saved
+            if not new_settings:
+                finished = True
+                return
+
+            if not self.optimization_active:
+                self.output("参数优化已停止")
+                return
+
+            # Use multiprocessing pool for running backtesting with different setting
+            if own_pool:
+                pool = multiprocessing.Pool(multiprocessing.cpu_count())
+
+            evaluate = partial(
+                optimize_setting,
+                target_name=target_name,
+                strategy_class=self.strategy_class,
+                args=self.get_optimize_args(shared_data)
+            )
+            it = pool.imap_unordered(evaluate, new_settings)
+
+            for _ in range(len(new_settings)):
+                # Wait result with timeout, to check if stopped meanwhile.
+                while self.optimization_active:
+                    try:
+                        result = it.next(timeout=1)
+                        break
+                    except multiprocessing.TimeoutError:
+                        pass
+                else:
+                    self.output("参数优化已停止")
+                    return
+
+                if store:
+                    store.save(result)
+
+                yield result
+
+            finished = True
+        # Workers still running are terminated if stopped, or generator
+        # closed before all finished.
+        finally:
+            if own_pool:
+                if pool:
+                    if finished:
+                        pool.close()
+                    else:
+                        pool.terminate()
+                    pool.join()
+
+                if shared_data:
+                    shared_data.close()
+
+    def request_optimization(self):
+        """
+        Activate optimization when it is requested, before running in other
+        thread, so that stop_optimization called meanwhile is kept.
+        """
+        self.optimization_requested = True
+        self.optimization_active = True
+
+    def begin_optimization(self):
+        """
+        Activate optimization at beginning of running, if not requested.
+        """
+        if self.optimization_requested:
+            self.optimization_requested = False
+        else:
+            self.optimization_active = True
+
+    def stop_optimization(self):
+        """
+        Stop optimization running, called from other thread.
+        """
+        self.optimization_active = False
+
+    def get_optimize_args(self, shared_data=None):
+        """
+        Get arguments of optimize after setting.
+        """
+        return (
+            self.vt_symbol,
+            self.interval,
+            self.start,
+            self.rate,
+            self.slippage,
+            self.size,
+            self.pricetick,
+            self.capital,
+            self.end,
+            self.mode,
+            shared_data
+        )
+
+    def check_store_end(self):
+        """
+        Optimization store is only used with end set, since data keeps
+        growing without it. Check before loading data, which sets end.
+        """
+        if self.end:
+            return True
+
+        self.output("未设置结束日期，不保存优化结果")
+        return False
+
+    def get_data_fingerprint(self):
+        """
+        Get count and the last datetime of history data loaded.
+        """
+        if not self.history_data:
+            return 0, ""
+        return len(self.history_data), self.history_data[-1].datetime.isoformat()
+
+    def get_optimization_store(self):
+        """
+        Get store of optimization results, for backtesting of the same
+        strategy code, history data and cost settings.
+
+        Data in database may be updated for the same range, so history data
+        loaded before is also used in key. Bar data is loaded for shared
+        data already, and tick data is loaded here.
+
+        Return None if source code of strategy is not available.
+        """
+        try:
+            source = inspect.getsource(inspect.getmodule(self.strategy_class))
+        except (OSError, TypeError):
+            return None
+
+        if self.mode == BacktestingMode.TICK:
+            self.load_data()
+
+        key = repr((
+            self.strategy_class.__module__,
+            self.strategy_class.__name__,
+            source,
+            self.vt_symbol,
+            self.interval.value,
+            self.mode.value,
+            self.start.isoformat(),
+            self.end.isoformat(),
+            self.get_data_fingerprint(),
+            self.rate,
+            self.slippage,
+            self.size,
+            self.pricetick,
+            self.capital,
+        ))
+        digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+
+        filename = f"{self.strategy_class.__name__}_{digest}.pkl"
+        return OptimizationStore(get_folder_path("optimization").joinpath(filename))
+
+    def run_ga_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        population_size=100,
+        ngen_size=30,
+        output=True,
+        use_store=False
+    ):
         """"""
         # Get optimization setting and target
         settings = optimization_setting.generate_setting_ga()
@@ -590,34 +1223,65 @@ class BacktestingEngine:
                     individual[i] = paramlist[i]
             return individual,
 
-        # Create ga object function
-        global ga_target_name
-        global ga_strategy_class
-        global ga_setting
-        global ga_vt_symbol
-        global ga_interval
-        global ga_start
-        global ga_rate
-        global ga_slippage
-        global ga_size
-        global ga_pricetick
-        global ga_capital
-        global ga_end
-        global ga_mode
-
-        ga_target_name = target_name
-        ga_strategy_class = self.strategy_class
-        ga_setting = settings[0]
-        ga_vt_symbol = self.vt_symbol
-        ga_interval = self.interval
-        ga_start = self.start
-        ga_rate = self.rate
-        ga_slippage = self.slippage
-        ga_size = self.size
-        ga_pricetick = self.pricetick
-        ga_capital = self.capital
-        ga_end = self.end
-        ga_mode = self.mode
+        if use_store:
+            use_store = self.check_store_end()
+
+        # History data is loaded only once and shared with all processes
+        shared_data = self.create_shared_data()
+
+        # Results saved in store are not run again
+        store = None
+        saved = {}
+
+        if use_store:
+            store = self.get_optimization_store()
+            if store:
+                saved = store.load()
+
+        # Create ga object function, with arguments other than parameter
+        # values bound, so that it can be sent to worker processes.
+        evaluate = partial(
+            ga_optimize,
+            target_name=target_name,
+            strategy_class=self.strategy_class,
+            args=self.get_optimize_args(shared_data)
+        )
+
+        # Fitness of each parameter values is cached, individuals are
+        # evaluated in parallel and the same one is never evaluated again.
+        pool = multiprocessing.Pool(multiprocessing.cpu_count())
+        cache = {}
+
+        def map_individual(func, individuals):
+            """"""
+            keys = [tuple(individual) for individual in individuals]
+
+            new_keys = list(dict.fromkeys(k for k in keys if k not in cache))
+
+            for k in new_keys:
+                statistics = saved.get(str(dict(k)), None)
+                if statistics:
+                    cache[k] = (statistics[target_name],)
+
+            new_keys = [k for k in new_keys if k not in cache]
+            result = pool.map_async(func, new_keys)
+
+            # Wait result with timeout, to check if stopped meanwhile.
+            while self.optimization_active:
+                try:
+                    values = result.get(timeout=1)
+                    break
+                except multiprocessing.TimeoutError:
+                    pass
+            else:
+                raise OptimizationStopped()
+
+            for k, value in zip(new_keys, values):
+                if store:
+                    store.save(value)
+                cache[k] = (value[1],)
+
+            return [cache[k] for k in keys]
 
         # Set up genetic algorithem
         toolbox = base.Toolbox() 
@@ -625,7 +1289,8 @@ class BacktestingEngine:
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)                                            
         toolbox.register("mate", tools.cxTwoPoint)                                               
         toolbox.register("mutate", mutate_individual, indpb=1)               
-        toolbox.register("evaluate", ga_optimize)                                                
+        toolbox.register("evaluate", evaluate)
+        toolbox.register("map", map_individual)
         toolbox.register("select", tools.selNSGA2)       
 
         total_size = len(settings)
@@ -647,10 +1312,6 @@ class BacktestingEngine:
         stats.register("min", np.min, axis=0)
         stats.register("max", np.max, axis=0)
 
-        # Multiprocessing is not supported yet.
-        # pool = multiprocessing.Pool(multiprocessing.cpu_count())
-        # toolbox.register("map", pool.map)
-
         # Run ga optimization
         self.output(f"参数优化空间：{total_size}")
         self.output(f"每代族群总数：{pop_size}")
@@ -660,34 +1321,74 @@ class BacktestingEngine:
         self.output(f"突变概率：{mutpb:.0%}")
 
         start = time()
+        self.begin_optimization()
+        finished = False
+
+        try:
+            algorithms.eaMuPlusLambda(
+                pop,
+                toolbox,
+                mu,
+                lambda_,
+                cxpb,
+                mutpb,
+                ngen,
+                stats,
+                halloffame=hof
+            )
+            finished = True
+        # Best ones of generations finished are still returned if stopped.
+        except OptimizationStopped:
+            self.output("参数优化已停止")
+        finally:
+            if finished:
+                pool.close()
+            else:
+                pool.terminate()
+            pool.join()
+
+            if shared_data:
+                shared_data.close()
 
-        algorithms.eaMuPlusLambda(
-            pop, 
-            toolbox, 
-            mu, 
-            lambda_, 
-            cxpb, 
-            mutpb, 
-            ngen, 
-            stats,
-            halloffame=hof
-        )    
-        
         end = time()
         cost = int((end - start))
 
-        self.output(f"遗传算法优化完成，耗时{cost}秒")
-        
+        self.output(f"遗传算法优化完成，耗时{cost}秒，回测次数{len(cache)}")
+
         # Return result list
         results = []
 
         for parameter_values in hof:
             setting = dict(parameter_values)
-            target_value = ga_optimize(parameter_values)[0]
+            target_value = cache[tuple(parameter_values)][0]
             results.append((setting, target_value, {}))
         
         return results
 
+    def create_shared_data(self):
+        """
+        Load bar history and write it into memory mapped file for
+        optimization processes.
+
+        Return None in tick mode, and each process loads data itself.
+        """
+        from .vector_backtesting import SharedBarData, VectorBacktestingEngine
+
+        if self.mode != BacktestingMode.BAR:
+            return None
+
+        # Data loaded before may be of other range, so always load again,
+        # which is mostly cached by load_bar_data.
+        self.load_data()
+
+        if isinstance(self, VectorBacktestingEngine):
+            engine = self
+        else:
+            engine = VectorBacktestingEngine()
+            engine.set_history_data(self.history_data)
+
+        return SharedBarData.create(engine)
+
     def update_daily_close(self, price: float):
         """"""
         d = self.datetime.date()
@@ -1139,13 +1840,22 @@ def optimize(
     pricetick: float,
     capital: int,
     end: datetime,
-    mode: BacktestingMode
+    mode: BacktestingMode,
+    shared_data=None
 ):
     """
     Function for running in multiprocessing.pool
+
+    History data is attached from shared data if provided, otherwise
+    loaded from database.
     """
-    engine = BacktestingEngine()
-    
+    from .vector_backtesting import VectorBacktestingEngine
+
+    if shared_data:
+        engine = VectorBacktestingEngine()
+    else:
+        engine = BacktestingEngine()
+
     engine.set_parameters(
         vt_symbol=vt_symbol,
         interval=interval,
@@ -1160,7 +1870,12 @@ def optimize(
     )
 
     engine.add_strategy(strategy_class, setting)
-    engine.load_data()
+
+    if shared_data:
+        shared_data.load(engine)
+    else:
+        engine.load_data()
+
     engine.run_backtesting()
     engine.calculate_result()
     statistics = engine.calculate_statistics(output=False)
@@ -1169,32 +1884,60 @@ def optimize(
     return (str(setting), target_value, statistics)
 
 
-@lru_cache(maxsize=1000000)
-def _ga_optimize(parameter_values: tuple):
-    """"""
+def eval_setting(setting: str):
+    """
+    Get setting dict from str of it in optimization result.
+    """
+    return literal_eval(setting)
+
+
+def optimize_setting(
+    setting: dict,
+    target_name: str,
+    strategy_class: CtaTemplate,
+    args: tuple
+):
+    """
+    Function for running in multiprocessing.pool with setting as the only
+    argument not bound, args are arguments of optimize after setting.
+    """
+    return optimize(target_name, strategy_class, setting, *args)
+
+
+def ga_optimize(
+    parameter_values: tuple,
+    target_name: str,
+    strategy_class: CtaTemplate,
+    args: tuple
+):
+    """
+    Function for running ga optimization in multiprocessing.pool, with
+    parameter values as the only argument not bound.
+    """
     setting = dict(parameter_values)
+    return optimize_setting(setting, target_name, strategy_class, args)
 
-    result = optimize(
-        ga_target_name,
-        ga_strategy_class,
-        setting,
-        ga_vt_symbol,
-        ga_interval,
-        ga_start,
-        ga_rate,
-        ga_slippage,
-        ga_size,
-        ga_pricetick,
-        ga_capital,
-        ga_end,
-        ga_mode
-    )
-    return (result[1],)
+
+def report_round_result(
+    callback: Callable,
+    finished: int,
+    total: int,
+    result: tuple,
+    count: int,
+    round_total: int
+):
+    """
+    Call callback with count of results in all rounds of halving search.
+    """
+    callback(result, finished + count, total)
 
 
-def ga_optimize(parameter_values: list):
-    """"""
-    return _ga_optimize(tuple(parameter_values))
+def sort_by_settings(result_values: list, settings: list):
+    """
+    Sort results finished in random order by order of settings.
+    """
+    index = {str(setting): n for n, setting in enumerate(settings)}
+    return sorted(result_values, key=lambda result: index[result[0]])
 
 
 @lru_cache(maxsize=999)
@@ -1222,19 +1965,3 @@ def load_tick_data(
     return database_manager.load_tick_data(
         symbol, exchange, start, end
     )
-
-
-# GA related global value
-ga_end = None
-ga_mode = None
-ga_target_name = None
-ga_strategy_class = None
-ga_setting = None
-ga_vt_symbol = None
-ga_interval = None
-ga_start = None
-ga_rate = None
-ga_slippage = None
-ga_size = None
-ga_pricetick = None
-ga_capital = None
@@ -0,0 +1,521 @@
+import os
+import tempfile
+from datetime import date, tzinfo
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+from vnpy.trader.constant import Direction, Status
+from vnpy.trader.object import OrderData, TradeData, BarData
+
+from .backtesting import BacktestingEngine, DailyResult
+from .base import BacktestingMode, StopOrderStatus
+
+
+# Ordinal of the first day of datetime64
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class VectorBacktestingEngine(BacktestingEngine):
+    """
+    Bar mode backtesting engine with history data stored in numpy arrays.
+
+    Strategy is still driven bar by bar, so result is the same as
+    BacktestingEngine trade for trade, but order matching only runs
+    when there is active order, prices are read from arrays and daily
+    close prices are calculated with numpy after replay.
+    """
+
+    def __init__(self):
+        """"""
+        super().__init__()
+
+        self.gateway_name_data = "DB"
+        self.datetime_list = []
+        self.ordinal_array = np.zeros(0, dtype=np.int64)
+        self.day_array = np.zeros(0, dtype=np.int64)
+        self.open_array = np.zeros(0)
+        self.high_array = np.zeros(0)
+        self.low_array = np.zeros(0)
+        self.close_array = np.zeros(0)
+        self.volume_array = np.zeros(0)
+        self.open_interest_array = np.zeros(0)
+        self.price_lists = None
+
+        self.ix = 0
+
+    def load_data(self):
+        """"""
+        if self.mode != BacktestingMode.BAR:
+            self.output("向量化回测引擎仅支持K线模式")
+            return
+
+        super().load_data()
+
+        # Bar objects are not kept after converted into arrays.
+        self.set_history_data(self.history_data)
+        self.history_data.clear()
+
+    def set_history_data(self, bars: Sequence[BarData]):
+        """
+        Convert bar data list into arrays.
+        """
+        if bars:
+            self.gateway_name_data = bars[0].gateway_name
+
+        self.set_history_arrays(
+            [bar.datetime for bar in bars],
+            np.array([bar.open_price for bar in bars], dtype=float),
+            np.array([bar.high_price for bar in bars], dtype=float),
+            np.array([bar.low_price for bar in bars], dtype=float),
+            np.array([bar.close_price for bar in bars], dtype=float),
+            np.array([bar.volume for bar in bars], dtype=float),
+            np.array([bar.open_interest for bar in bars], dtype=float),
+        )
+
+    def set_history_arrays(
+        self,
+        datetime_list: list,
+        open_array: np.ndarray,
+        high_array: np.ndarray,
+        low_array: np.ndarray,
+        close_array: np.ndarray,
+        volume_array: np.ndarray,
+        open_interest_array: np.ndarray,
+        ordinal_array: np.ndarray = None,
+        day_array: np.ndarray = None,
+        price_lists: Sequence[list] = None
+    ):
+        """
+        Set history data in columns, all of the same length.
+
+        Ordinal and day of month arrays of datetime, and price columns
+        converted into lists, can be provided if calculated before, so
+        that backtesting of each optimization setting does not repeat it.
+        Arguments provided are kept without copying.
+        """
+        if isinstance(datetime_list, list):
+            self.datetime_list = datetime_list
+        else:
+            self.datetime_list = list(datetime_list)
+
+        if ordinal_array is None:
+            ordinal_array = [dt.toordinal() for dt in self.datetime_list]
+        if day_array is None:
+            day_array = [dt.day for dt in self.datetime_list]
+
+        self.ordinal_array = np.asarray(ordinal_array, dtype=np.int64)
+        self.day_array = np.asarray(day_array, dtype=np.int64)
+
+        self.open_array = np.asarray(open_array, dtype=float)
+        self.high_array = np.asarray(high_array, dtype=float)
+        self.low_array = np.asarray(low_array, dtype=float)
+        self.close_array = np.asarray(close_array, dtype=float)
+        self.volume_array = np.asarray(volume_array, dtype=float)
+        self.open_interest_array = np.asarray(open_interest_array, dtype=float)
+        self.price_lists = price_lists
+
+    def get_data_fingerprint(self):
+        """"""
+        if not self.datetime_list:
+            return 0, ""
+        return len(self.datetime_list), self.datetime_list[-1].isoformat()
+
+    def get_init_end(self):
+        """
+        Get index of the first bar for backtesting, bars before it are
+        used for initializing strategy.
+        """
+        size = len(self.datetime_list)
+        if not size:
+            return 0
+
+        # Index of bars starting a new day
+        changes = np.flatnonzero(self.day_array[1:] != self.day_array[:-1]) + 1
+        if self.datetime and self.datetime.day != self.day_array[0]:
+            changes = np.r_[0, changes]
+
+        n = max(self.days, 1)
+        if len(changes) >= n:
+            return int(changes[n - 1])
+
+        # All data is used for initializing if not enough days, and the
+        # last bar is replayed once more.
+        return size
+
+    def generate_bars(self, start: int, end: int):
+        """
+        Generate bar data objects from arrays, with index of each bar.
+        """
+        # Bar is created with positional arguments in field order, which
+        # is faster than keyword arguments.
+        fixed = (self.gateway_name_data, self.symbol, self.exchange)
+        interval = self.interval
+
+        for ix, dt, volume, open_interest, open_, high, low, close in zip(
+            range(start, end),
+            self.datetime_list[start:end],
+            self.volume_list[start:end],
+            self.open_interest_list[start:end],
+            self.open_list[start:end],
+            self.high_list[start:end],
+            self.low_list[start:end],
+            self.close_list[start:end],
+        ):
+            yield ix, BarData(
+                *fixed, dt, interval, volume, open_interest,
+                open_, high, low, close
+            )
+
+    def run_backtesting(self):
+        """"""
+        if self.mode != BacktestingMode.BAR:
+            self.output("向量化回测引擎仅支持K线模式")
+            return
+
+        # Python float in list is faster than numpy scalar to read one by one.
+        if self.price_lists is None:
+            self.price_lists = [
+                array.tolist() for array in [
+                    self.open_array,
+                    self.high_array,
+                    self.low_array,
+                    self.close_array,
+                    self.volume_array,
+                    self.open_interest_array,
+                ]
+            ]
+
+        (
+            self.open_list,
+            self.high_list,
+            self.low_list,
+            self.close_list,
+            self.volume_list,
+            self.open_interest_list,
+        ) = self.price_lists
+
+        self.strategy.on_init()
+
+        # Use the first [days] of history data for initializing strategy
+        size = len(self.datetime_list)
+        init_end = self.get_init_end()
+
+        for _, bar in self.generate_bars(0, init_end):
+            self.datetime = bar.datetime
+            self.callback(bar)
+
+        self.strategy.inited = True
+        self.output("策略初始化完成")
+
+        self.strategy.on_start()
+        self.strategy.trading = True
+        self.output("开始回放历史数据")
+
+        # Use the rest of history data for running backtesting
+        start = min(init_end, size - 1) if size else 0
+
+        on_bar = self.strategy.on_bar
+        for ix, bar in self.generate_bars(start, size):
+            self.ix = ix
+            self.bar = bar
+            self.datetime = bar.datetime
+
+            if self.active_limit_orders:
+                self.cross_limit_order()
+            if self.active_stop_orders:
+                self.cross_stop_order()
+            on_bar(bar)
+
+        self.update_daily_results(start)
+
+        self.output("历史数据回放结束")
+
+    def update_daily_results(self, start: int):
+        """
+        Create daily results with close price of the last bar of each day.
+        """
+        ordinals = self.ordinal_array[start:]
+        if not len(ordinals):
+            return
+
+        ends = np.flatnonzero(np.r_[ordinals[1:] != ordinals[:-1], True])
+        ends += start
+
+        for ix in ends.tolist():
+            d = self.datetime_list[ix].date()
+            close_price = self.close_list[ix]
+
+            daily_result = self.daily_results.get(d, None)
+            if daily_result:
+                daily_result.close_price = close_price
+            else:
+                self.daily_results[d] = DailyResult(d, close_price)
+
+    def cross_limit_order(self):
+        """
+        Cross limit order with prices of current bar.
+        """
+        ix = self.ix
+        long_cross_price = self.low_list[ix]
+        short_cross_price = self.high_list[ix]
+        best_price = self.open_list[ix]
+
+        for order in list(self.active_limit_orders.values()):
+            # Push order update with status "not traded" (pending).
+            if order.status == Status.SUBMITTING:
+                order.status = Status.NOTTRADED
+                self.strategy.on_order(order)
+
+            # Check whether limit orders can be filled.
+            if order.direction == Direction.LONG:
+                if order.price < long_cross_price or long_cross_price <= 0:
+                    continue
+
+                trade_price = min(order.price, best_price)
+                pos_change = order.volume
+            else:
+                if order.price > short_cross_price or short_cross_price <= 0:
+                    continue
+
+                trade_price = max(order.price, best_price)
+                pos_change = -order.volume
+
+            # Push order udpate with status "all traded" (filled).
+            order.traded = order.volume
+            order.status = Status.ALLTRADED
+            self.strategy.on_order(order)
+
+            self.active_limit_orders.pop(order.vt_orderid)
+
+            # Push trade update
+            trade = self.new_trade_data(order, trade_price)
+
+            self.strategy.pos += pos_change
+            self.strategy.on_trade(trade)
+
+            self.trades[trade.vt_tradeid] = trade
+
+    def cross_stop_order(self):
+        """
+        Cross stop order with prices of current bar.
+        """
+        ix = self.ix
+        long_cross_price = self.high_list[ix]
+        short_cross_price = self.low_list[ix]
+        best_price = self.open_list[ix]
+
+        for stop_order in list(self.active_stop_orders.values()):
+            # Check whether stop order can be triggered.
+            if stop_order.direction == Direction.LONG:
+                if stop_order.price > long_cross_price:
+                    continue
+
+                trade_price = max(stop_order.price, best_price)
+                pos_change = stop_order.volume
+            else:
+                if stop_order.price < short_cross_price:
+                    continue
+
+                trade_price = min(stop_order.price, best_price)
+                pos_change = -stop_order.volume
+
+            # Create order data.
+            self.limit_order_count += 1
+
+            order = OrderData(
+                symbol=self.symbol,
+                exchange=self.exchange,
+                orderid=str(self.limit_order_count),
+                direction=stop_order.direction,
+                offset=stop_order.offset,
+                price=stop_order.price,
+                volume=stop_order.volume,
+                status=Status.ALLTRADED,
+                gateway_name=self.gateway_name,
+            )
+            order.datetime = self.datetime
+
+            self.limit_orders[order.vt_orderid] = order
+
+            # Create trade data.
+            trade = self.new_trade_data(order, trade_price)
+
+            self.trades[trade.vt_tradeid] = trade
+
+            # Update stop order.
+            stop_order.vt_orderid = order.vt_orderid
+            stop_order.status = StopOrderStatus.TRIGGERED
+
+            self.active_stop_orders.pop(stop_order.stop_orderid)
+
+            # Push update to strategy.
+            self.strategy.on_stop_order(stop_order)
+            self.strategy.on_order(order)
+
+            self.strategy.pos += pos_change
+            self.strategy.on_trade(trade)
+
+    def new_trade_data(self, order: OrderData, trade_price: float) -> TradeData:
+        """"""
+        self.trade_count += 1
+
+        trade = TradeData(
+            symbol=order.symbol,
+            exchange=order.exchange,
+            orderid=order.orderid,
+            tradeid=str(self.trade_count),
+            direction=order.direction,
+            offset=order.offset,
+            price=trade_price,
+            volume=order.volume,
+            time=self.datetime.time().isoformat("seconds"),
+            gateway_name=self.gateway_name,
+        )
+        trade.datetime = self.datetime
+
+        return trade
+
+
+class SharedBarData:
+    """
+    Bar history stored column by column in a memory mapped file.
+
+    The object is small to pickle, so it can be sent to optimization
+    worker processes, which attach to the file without querying database
+    again. Conversion of data into Python objects and per-day arrays is
+    done only once in each process, and shared by all settings run there.
+    """
+
+    # Price columns in order of arguments of set_history_arrays
+    columns = [
+        "open_array",
+        "high_array",
+        "low_array",
+        "close_array",
+        "volume_array",
+        "open_interest_array"
+    ]
+
+    def __init__(
+        self,
+        filename: str,
+        size: int,
+        gateway_name: str,
+        tz: tzinfo = None
+    ):
+        """"""
+        self.filename = filename
+        self.size = size
+        self.gateway_name = gateway_name
+        self.tz = tz
+
+    @classmethod
+    def create(cls, engine: VectorBacktestingEngine):
+        """
+        Write history arrays of engine into a new temp file.
+        """
+        datetime_list = engine.datetime_list
+        size = len(datetime_list)
+
+        tz = None
+        if size:
+            tz = datetime_list[0].tzinfo
+
+        # Datetime is stored as int64 of microseconds, with timezone removed.
+        datetime_array = np.array(
+            [dt.replace(tzinfo=None) for dt in datetime_list],
+            dtype="datetime64[us]"
+        )
+
+        fd, filename = tempfile.mkstemp(prefix="vnpy_bar_", suffix=".dat")
+        os.close(fd)
+
+        shared_data = cls(filename, size, engine.gateway_name_data, tz)
+
+        if size:
+            datetime_map, price_map = shared_data.map("w+")
+            datetime_map[:] = datetime_array.view(np.int64)
+            for n, name in enumerate(cls.columns):
+                price_map[n] = getattr(engine, name)
+            datetime_map.flush()
+            price_map.flush()
+            del datetime_map, price_map
+
+        return shared_data
+
+    def map(self, mode: str = "r"):
+        """
+        Map datetime and price arrays in file.
+        """
+        datetime_map = np.memmap(
+            self.filename, dtype=np.int64, mode=mode, shape=(self.size,)
+        )
+        price_map = np.memmap(
+            self.filename,
+            dtype=float,
+            mode=mode,
+            offset=self.size * 8,
+            shape=(len(self.columns), self.size)
+        )
+        return datetime_map, price_map
+
+    def load(self, engine: VectorBacktestingEngine):
+        """
+        Set history data of engine with data in file.
+        """
+        datetime_list, price_map, ordinal_array, day_array, price_lists = (
+            load_shared_data(self.filename, self.size, self.tz)
+        )
+
+        engine.gateway_name_data = self.gateway_name
+        engine.set_history_arrays(
+            datetime_list,
+            *price_map,
+            ordinal_array=ordinal_array,
+            day_array=day_array,
+            price_lists=price_lists
+        )
+
+    def close(self):
+        """
+        Remove the file, after all processes using it exited.
+        """
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=8)
+def load_shared_data(filename: str, size: int, tz: tzinfo):
+    """
+    Attach to shared bar data file and convert it for backtesting, which
+    is done only once in each process.
+
+    Return datetime list, price arrays, ordinal and day of month arrays,
+    and price lists. They are shared by all engines in the process, so
+    should not be modified.
+    """
+    if not size:
+        empty = np.zeros(0, dtype=np.int64)
+        price_map = np.zeros((len(SharedBarData.columns), 0))
+        return [], price_map, empty, empty, [[] for _ in price_map]
+
+    shared_data = SharedBarData(filename, size, "", tz)
+    datetime_map, price_map = shared_data.map()
+
+    # Local date is kept in datetime64 since timezone is removed.
+    datetime_array = datetime_map.view("datetime64[us]")
+    day_array = datetime_array.astype("datetime64[D]")
+    ordinal_array = day_array.view(np.int64) + EPOCH_ORDINAL
+    day_array = (day_array - day_array.astype("datetime64[M]")).view(np.int64) + 1
+
+    datetime_list = datetime_array.tolist()
+    if tz:
+        datetime_list = [dt.replace(tzinfo=tz) for dt in datetime_list]
+
+    price_lists = [array.tolist() for array in price_map]
+
+    return datetime_list, price_map, ordinal_array, day_array, price_lists
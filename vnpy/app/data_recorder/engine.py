@@ -3,6 +3,8 @@
 from threading import Thread
 from queue import Queue, Empty
 from copy import copy
+from time import perf_counter
+from typing import Dict, List
 
 from vnpy.event import Event, EventEngine
 from vnpy.trader.engine import BaseEngine, MainEngine
@@ -27,6 +29,15 @@ class RecorderEngine(BaseEngine):
     """"""
     setting_filename = "data_recorder_setting.json"
 
+    # Buffered data of one symbol is saved when reaching buffer size,
+    # and all buffers are saved every flush interval (seconds).
+    buffer_size = 1000
+    flush_interval = 1
+
+    # Data failed to save is put back into buffers and retried with next
+    # save, and dropped after failing more than max_retry times in a row.
+    max_retry = 3
+
     def __init__(self, main_engine: MainEngine, event_engine: EventEngine):
         """"""
         super().__init__(main_engine, event_engine, APP_NAME)
@@ -39,6 +50,16 @@ class RecorderEngine(BaseEngine):
         self.bar_recordings = {}
         self.bar_generators = {}
 
+        self.tick_buffers: Dict[str, List[TickData]] = {}
+        self.bar_buffers: Dict[str, List[BarData]] = {}
+
+        self.flush_count = 0
+        self.flush_latency = 0          # seconds used by the last flush
+        self.max_flush_latency = 0
+
+        self.retry_counts = {"tick": 0, "bar": 0}
+        self.dropped_count = 0
+
         self.load_setting()
         self.register_event()
         self.start()
@@ -60,24 +81,144 @@ class RecorderEngine(BaseEngine):
 
     def run(self):
         """"""
+        last_flush = perf_counter()
+
         while self.active:
+            # Wait at most 1 second, so that close is not blocked.
+            timeout = last_flush + self.flush_interval - perf_counter()
+            timeout = min(max(timeout, 0), 1)
+
             try:
-                task = self.queue.get(timeout=1)
-                task_type, data = task
+                task = self.queue.get(timeout=timeout)
+                self.buffer_task(task)
+            except Empty:
+                pass
+
+            if perf_counter() - last_flush >= self.flush_interval:
+                self.flush()
+                last_flush = perf_counter()
+
+        # Save all data left before exit.
+        while not self.queue.empty():
+            self.buffer_task(self.queue.get())
+        self.flush()
+
+        # Data failed in the last flush can not be retried any more.
+        for buffers in [self.tick_buffers, self.bar_buffers]:
+            for buf in buffers.values():
+                self.dropped_count += len(buf)
+            buffers.clear()
+
+    def buffer_task(self, task: tuple):
+        """
+        Add data into buffer of its symbol, save the buffer if full.
+        """
+        task_type, data = task
+
+        if task_type == "tick":
+            buffers = self.tick_buffers
+        else:
+            buffers = self.bar_buffers
+
+        buf = buffers.setdefault(data.vt_symbol, [])
+        buf.append(data)
+
+        if len(buf) >= self.buffer_size:
+            buffers[data.vt_symbol] = []
+
+            if task_type == "tick":
+                self.save_data(buf, [])
+            else:
+                self.save_data([], buf)
+
+    def flush(self):
+        """
+        Save data in all buffers.
+        """
+        ticks = []
+        for buf in self.tick_buffers.values():
+            ticks.extend(buf)
+        self.tick_buffers.clear()
+
+        bars = []
+        for buf in self.bar_buffers.values():
+            bars.extend(buf)
+        self.bar_buffers.clear()
+
+        self.save_data(ticks, bars)
+
+    def save_data(self, ticks: List[TickData], bars: List[BarData]):
+        """"""
+        if not ticks and not bars:
+            return
 
-                if task_type == "tick":
-                    database_manager.save_tick_data([data])
-                elif task_type == "bar":
-                    database_manager.save_bar_data([data])
+        start = perf_counter()
+
+        if ticks:
+            self.save_batch("tick", ticks)
+        if bars:
+            self.save_batch("bar", bars)
+
+        self.flush_count += 1
+        self.flush_latency = perf_counter() - start
+        self.max_flush_latency = max(self.max_flush_latency, self.flush_latency)
+
+    def save_batch(self, task_type: str, data: list):
+        """
+        Save data of one type, put it back into buffers if failed.
+        """
+        try:
+            if task_type == "tick":
+                database_manager.save_tick_data(data)
+            else:
+                database_manager.save_bar_data(data)
+        except Exception as e:
+            self.retry_counts[task_type] += 1
+
+            if self.retry_counts[task_type] > self.max_retry:
+                self.retry_counts[task_type] = 0
+                self.dropped_count += len(data)
+                self.write_log(f"数据保存失败，丢弃{len(data)}条数据，触发异常：{e}")
+            else:
+                self.restore_batch(task_type, data)
+                self.write_log(f"数据保存失败，等待重试，触发异常：{e}")
+            return
 
-            except Empty:
-                continue
+        self.retry_counts[task_type] = 0
+
+    def restore_batch(self, task_type: str, data: list):
+        """
+        Put data failed to save back into buffers, before data added later.
+        """
+        if task_type == "tick":
+            buffers = self.tick_buffers
+        else:
+            buffers = self.bar_buffers
+
+        restored = {}
+        for d in data:
+            restored.setdefault(d.vt_symbol, []).append(d)
+
+        for vt_symbol, buf in restored.items():
+            buffers[vt_symbol] = buf + buffers.get(vt_symbol, [])
+
+    def get_statistics(self) -> dict:
+        """
+        Get queue depth, flush latency and dropped data of writer thread.
+        """
+        return {
+            "queue_size": self.queue.qsize(),
+            "flush_count": self.flush_count,
+            "flush_latency": self.flush_latency,
+            "max_flush_latency": self.max_flush_latency,
+            "dropped_count": self.dropped_count,
+        }
 
     def close(self):
         """"""
         self.active = False
 
-        if self.thread.isAlive():
+        if self.thread.is_alive():
             self.thread.join()
 
     def start(self):
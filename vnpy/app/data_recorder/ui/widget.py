@@ -4,7 +4,7 @@ from datetime import datetime
 from vnpy.event import Event, EventEngine
 from vnpy.trader.engine import MainEngine
 from vnpy.trader.ui import QtCore, QtWidgets
-from vnpy.trader.event import EVENT_CONTRACT
+from vnpy.trader.event import EVENT_CONTRACT, EVENT_TIMER
 
 from ..engine import (
     APP_NAME,
@@ -19,6 +19,7 @@ class RecorderManager(QtWidgets.QWidget):
     signal_log = QtCore.pyqtSignal(Event)
     signal_update = QtCore.pyqtSignal(Event)
     signal_contract = QtCore.pyqtSignal(Event)
+    signal_timer = QtCore.pyqtSignal(Event)
 
     def __init__(self, main_engine: MainEngine, event_engine: EventEngine):
         super().__init__()
@@ -71,6 +72,8 @@ class RecorderManager(QtWidgets.QWidget):
         self.log_edit = QtWidgets.QTextEdit()
         self.log_edit.setReadOnly(True)
 
+        self.status_label = QtWidgets.QLabel()
+
         # Set layout
         grid = QtWidgets.QGridLayout()
         grid.addWidget(QtWidgets.QLabel("K线记录"), 0, 0)
@@ -93,6 +96,7 @@ class RecorderManager(QtWidgets.QWidget):
         grid2.addWidget(self.bar_recording_edit, 1, 0)
         grid2.addWidget(self.tick_recording_edit, 1, 1)
         grid2.addWidget(self.log_edit, 2, 0, 1, 2)
+        grid2.addWidget(self.status_label, 3, 0, 1, 2)
 
         vbox = QtWidgets.QVBoxLayout()
         vbox.addLayout(hbox)
@@ -104,12 +108,14 @@ class RecorderManager(QtWidgets.QWidget):
         self.signal_log.connect(self.process_log_event)
         self.signal_contract.connect(self.process_contract_event)
         self.signal_update.connect(self.process_update_event)
+        self.signal_timer.connect(self.process_timer_event)
 
         self.event_engine.register(EVENT_CONTRACT, self.signal_contract.emit)
         self.event_engine.register(
             EVENT_RECORDER_LOG, self.signal_log.emit)
         self.event_engine.register(
             EVENT_RECORDER_UPDATE, self.signal_update.emit)
+        self.event_engine.register(EVENT_TIMER, self.signal_timer.emit)
 
     def process_log_event(self, event: Event):
         """"""
@@ -129,6 +135,17 @@ class RecorderManager(QtWidgets.QWidget):
         tick_text = "\n".join(data["tick"])
         self.tick_recording_edit.setText(tick_text)
 
+    def process_timer_event(self, event: Event):
+        """"""
+        statistics = self.recorder_engine.get_statistics()
+        self.status_label.setText(
+            f"队列长度：{statistics['queue_size']}    "
+            f"写入次数：{statistics['flush_count']}    "
+            f"写入耗时：{statistics['flush_latency'] * 1000:.1f}ms    "
+            f"最大耗时：{statistics['max_flush_latency'] * 1000:.1f}ms    "
+            f"丢弃数据：{statistics['dropped_count']}"
+        )
+
     def process_contract_event(self, event: Event):
         """"""
         contract = event.data
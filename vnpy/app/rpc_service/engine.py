@@ -1,10 +1,23 @@
 """"""
 
 import traceback
+import zlib
+from collections import deque
+from itertools import islice
+from threading import Lock
+from time import time
 
 from vnpy.event import Event, EventEngine
-from vnpy.rpc import RpcServer
+from vnpy.rpc import RpcServer, get_codec
 from vnpy.trader.engine import BaseEngine, MainEngine
+from vnpy.trader.event import (
+    EVENT_TICK,
+    EVENT_ORDER,
+    EVENT_TRADE,
+    EVENT_POSITION,
+    EVENT_ACCOUNT,
+    EVENT_CONTRACT
+)
 from vnpy.trader.utility import load_json, save_json
 from vnpy.trader.object import LogData
 
@@ -12,6 +25,25 @@ APP_NAME = "RpcService"
 
 EVENT_RPC_LOG = "eRpcLog"
 
+# Event types also pushed with a specific suffix (e.g. EVENT_TICK + vt_symbol)
+# by BaseGateway, the suffixed ones are regenerated by RpcGateway.
+SPECIFIC_EVENT_TYPES = (
+    EVENT_TICK,
+    EVENT_ORDER,
+    EVENT_TRADE,
+    EVENT_POSITION,
+    EVENT_ACCOUNT
+)
+
+# State event types kept in snapshot, with key attribute of data.
+STATE_EVENT_KEYS = {
+    EVENT_CONTRACT: "vt_symbol",
+    EVENT_ACCOUNT: "vt_accountid",
+    EVENT_POSITION: "vt_positionid",
+    EVENT_ORDER: "vt_orderid",
+    EVENT_TRADE: "vt_tradeid",
+}
+
 
 class RpcEngine(BaseEngine):
     """"""
@@ -23,22 +55,38 @@ class RpcEngine(BaseEngine):
 
         self.rep_address = "tcp://*:2014"
         self.pub_address = "tcp://*:4102"
+        self.codec = "pickle"
+        self.worker_count = 1
+        self.update_size = 100000
 
         self.server = None
 
-        self.init_server()
+        # State events are numbered by sequence, and the latest ones are
+        # kept for clients to replay updates since their last sequence.
+        # Session changes when restarted, which invalidates sequence.
+        self.session = int(time() * 1000)
+        self.seq = 0
+        self.states = {type: {} for type in STATE_EVENT_KEYS}
+        self.updates = None
+        self.lock = Lock()
+
         self.load_setting()
+        self.init_state()
+        self.init_server()
         self.register_event()
 
     def init_server(self):
         """"""
-        self.server = RpcServer()
+        self.server = RpcServer(get_codec(self.codec), self.worker_count)
+        self.snapshot_codec = get_codec(self.codec)
 
-        self.server.register(self.main_engine.subscribe)
-        self.server.register(self.main_engine.send_order)
-        self.server.register(self.main_engine.send_orders)
-        self.server.register(self.main_engine.cancel_order)
-        self.server.register(self.main_engine.cancel_orders)
+        # Gateways are not thread-safe, so trading functions are always
+        # called one by one in order of requests.
+        self.server.register(self.main_engine.subscribe, serial=True)
+        self.server.register(self.main_engine.send_order, serial=True)
+        self.server.register(self.main_engine.send_orders, serial=True)
+        self.server.register(self.main_engine.cancel_order, serial=True)
+        self.server.register(self.main_engine.cancel_orders, serial=True)
         self.server.register(self.main_engine.query_history)
 
         self.server.register(self.main_engine.get_tick)
@@ -55,17 +103,83 @@ class RpcEngine(BaseEngine):
         self.server.register(self.main_engine.get_all_contracts)
         self.server.register(self.main_engine.get_all_active_orders)
 
+        self.server.register(self.get_snapshot)
+        self.server.register(self.get_updates)
+
+    def init_state(self):
+        """
+        Load state already in main engine.
+        """
+        self.updates = deque(maxlen=self.update_size)
+
+        for type, data_list in [
+            (EVENT_CONTRACT, self.main_engine.get_all_contracts()),
+            (EVENT_ACCOUNT, self.main_engine.get_all_accounts()),
+            (EVENT_POSITION, self.main_engine.get_all_positions()),
+            (EVENT_ORDER, self.main_engine.get_all_orders()),
+            (EVENT_TRADE, self.main_engine.get_all_trades()),
+        ]:
+            key = STATE_EVENT_KEYS[type]
+            state = self.states[type]
+
+            # Data updated by event already is not overwritten.
+            with self.lock:
+                for data in data_list:
+                    state.setdefault(getattr(data, key), data)
+
+    def get_snapshot(self):
+        """
+        Get zlib compressed snapshot of all contract, account, position,
+        order and trade data, with session and sequence of the snapshot.
+        """
+        with self.lock:
+            snapshot = {
+                "session": self.session,
+                "seq": self.seq,
+            }
+            for type, state in self.states.items():
+                snapshot[type] = list(state.values())
+
+        data = self.snapshot_codec.pack(snapshot)
+        return zlib.compress(data, 1)
+
+    def get_updates(self, session: int, seq: int):
+        """
+        Get list of (seq, event) of state events after the sequence given.
+
+        Return None if updates since then are not available, and client
+        should get snapshot instead.
+        """
+        with self.lock:
+            if session != self.session or seq > self.seq:
+                return None
+
+            if not self.updates:
+                return []
+
+            start = seq + 1 - self.updates[0][0]
+            if start < 0:
+                return None
+
+            return list(islice(self.updates, start, None))
+
     def load_setting(self):
         """"""
         setting = load_json(self.setting_filename)
         self.rep_address = setting.get("rep_address", self.rep_address)
         self.pub_address = setting.get("pub_address", self.pub_address)
+        self.codec = setting.get("codec", self.codec)
+        self.worker_count = setting.get("worker_count", self.worker_count)
+        self.update_size = setting.get("update_size", self.update_size)
 
     def save_setting(self):
         """"""
         setting = {
             "rep_address": self.rep_address,
-            "pub_address": self.pub_address
+            "pub_address": self.pub_address,
+            "codec": self.codec,
+            "worker_count": self.worker_count,
+            "update_size": self.update_size
         }
         save_json(self.setting_filename, setting)
 
@@ -108,9 +222,35 @@ class RpcEngine(BaseEngine):
         self.event_engine.register_general(self.process_event)
 
     def process_event(self, event: Event):
-        """"""
+        """
+        Publish event with topic of event type plus vt_symbol, so that
+        clients only receive ticks of symbols subscribed.
+
+        Data published is (session, seq, event), seq is 0 for events not
+        kept in state.
+        """
+        if event.type in SPECIFIC_EVENT_TYPES:
+            topic = event.type + getattr(event.data, "vt_symbol", "")
+        elif event.type.startswith(SPECIFIC_EVENT_TYPES):
+            return
+        else:
+            topic = event.type
+
+        seq = 0
+
+        key = STATE_EVENT_KEYS.get(event.type, None)
+        if key:
+            data = event.data
+
+            with self.lock:
+                self.seq += 1
+                seq = self.seq
+
+                self.states[event.type][getattr(data, key)] = data
+                self.updates.append((seq, event))
+
         if self.server.is_active():
-            self.server.publish("", event)
+            self.server.publish(topic, (self.session, seq, event))
 
     def write_log(self, msg: str) -> None:
         """"""
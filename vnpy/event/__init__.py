@@ -1 +1,9 @@
-from .engine import Event, EventEngine, EVENT_TIMER
+from .engine import (
+    Event,
+    EventEngine,
+    BatchEventEngine,
+    ShardedEventEngine,
+    shard_safe,
+    EVENT_TIMER,
+    EVENT_PROFILE
+)
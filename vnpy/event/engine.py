@@ -2,13 +2,19 @@
 Event-driven framework of vn.py framework.
 """
 
-from collections import defaultdict
+from collections import defaultdict, deque
+from heapq import heappop, heappush
+from itertools import count
 from queue import Empty, Queue
-from threading import Thread
-from time import sleep
-from typing import Any, Callable
+from threading import Condition, Event as ThreadEvent, Lock, Thread
+from time import monotonic, perf_counter
+from typing import Any, Callable, Sequence
+
+from .profiler import EventProfiler
 
 EVENT_TIMER = "eTimer"
+EVENT_TIMER_CALLBACK = "eTimerCallback"
+EVENT_PROFILE = "eProfile"
 
 
 class Event:
@@ -18,6 +24,9 @@ class Event:
     object which contains the real data. 
     """
 
+    # Time when put into event engine, only recorded when profiling.
+    put_time = 0
+
     def __init__(self, type: str, data: Any = None):
         """"""
         self.type = type
@@ -28,19 +37,47 @@ class Event:
 HandlerType = Callable[[Event], None]
 
 
+def shard_safe(handler: HandlerType):
+    """
+    Decorator to declare that handler only accesses data of the same key
+    (e.g. vt_symbol) as the event processed, so that ShardedEventEngine
+    can run it on shard worker threads in parallel.
+    """
+    handler.shard_safe = True
+    return handler
+
+
+def is_shard_safe(handler: HandlerType):
+    """
+    Check if handler is declared by shard_safe decorator.
+    """
+    return getattr(handler, "shard_safe", False)
+
+
+def get_shard_key(event: Event):
+    """
+    Default shard key of event: vt_symbol of data if exists.
+    """
+    return getattr(event.data, "vt_symbol", None)
+
+
 class EventEngine:
     """
     Event engine distributes event object based on its type 
     to those handlers registered.
 
     It also generates timer event by every interval seconds,
-    which can be used for timing purpose.
+    which can be used for timing purpose. More timers with their
+    own intervals and one-shot delayed callbacks can be added.
     """
 
-    def __init__(self, interval: int = 1):
+    # Whether events waiting in queue can be conflated by add_conflation.
+    supports_conflation = True
+
+    def __init__(self, interval: float = 1):
         """
         Timer event is generated every 1 second by default, if
-        interval not specified.
+        interval not specified. Fractional interval is supported.
         """
         self._interval = interval
         self._queue = Queue()
@@ -50,6 +87,21 @@ class EventEngine:
         self._handlers = defaultdict(list)
         self._general_handlers = []
 
+        self._timer_condition = Condition()
+        self._timer_heap = []
+        self._timer_items = {}
+        self._timer_ids = {}
+        self._timer_count = count()
+
+        self._conflations = []
+        self._conflation_lock = Lock()
+        self._latest = {}
+        self._conflation_counts = defaultdict(int)
+
+        self._profiler = None
+        self._profile_interval = 0
+        self._profile_count = 0
+
     def _run(self):
         """
         Get event from queue and then process it.
@@ -57,7 +109,13 @@ class EventEngine:
         while self._active:
             try:
                 event = self._queue.get(block=True, timeout=1)
-                self._process(event)
+                if self._conflations:
+                    self._release(event)
+
+                if self._profiler:
+                    self._process_profiled(event, self._get_handlers(event))
+                else:
+                    self._process(event)
             except Empty:
                 pass
 
@@ -75,19 +133,82 @@ class EventEngine:
         if self._general_handlers:
             [handler(event) for handler in self._general_handlers]
 
+    def _get_handlers(self, event: Event):
+        """
+        Get all handlers to process the event.
+        """
+        return self._handlers.get(event.type, []) + self._general_handlers
+
+    def _process_profiled(self, event: Event, handlers: Sequence[HandlerType]):
+        """
+        Process event with handlers and record time cost into profiler.
+        """
+        profiler = self._profiler
+        start = perf_counter()
+
+        if event.put_time:
+            profiler.record_wait(event.type, start - event.put_time)
+
+        for handler in handlers:
+            handler(event)
+
+            end = perf_counter()
+            profiler.record_handler(handler, end - start)
+            start = end
+
     def _run_timer(self):
         """
-        Sleep by interval second(s) and then generate a timer event.
+        Wait until the earliest timer is due and then generate its event.
+
+        Deadlines are scheduled on monotonic clock by adding interval to
+        the last deadline, so timer events do not drift with time spent
+        in processing. Deadlines missed (e.g. system suspended) are
+        skipped rather than generating a burst of timer events.
         """
-        while self._active:
-            sleep(self._interval)
-            event = Event(EVENT_TIMER)
-            self.put(event)
+        heap = self._timer_heap
+
+        with self._timer_condition:
+            while self._active:
+                now = monotonic()
+
+                while heap and heap[0][0] <= now:
+                    deadline, timer_id = heappop(heap)
+
+                    item = self._timer_items.get(timer_id, None)
+                    if not item:
+                        continue
+                    type, interval, callback = item
+
+                    if callback:
+                        self._timer_items.pop(timer_id)
+                        self.put(Event(EVENT_TIMER_CALLBACK, callback))
+                    else:
+                        self.put(Event(type))
+
+                        deadline += interval
+                        if deadline <= now:
+                            deadline += ((now - deadline) // interval + 1) * interval
+                        heappush(heap, (deadline, timer_id))
+
+                if heap:
+                    self._timer_condition.wait(heap[0][0] - now)
+                else:
+                    self._timer_condition.wait()
+
+    def _process_timer_callback(self, event: Event):
+        """
+        Run delayed callback on event thread.
+        """
+        callback = event.data
+        callback()
 
     def start(self):
         """
         Start event engine to process events and generate timer events.
         """
+        self.register(EVENT_TIMER_CALLBACK, self._process_timer_callback)
+        self.add_timer(EVENT_TIMER, self._interval)
+
         self._active = True
         self._thread.start()
         self._timer.start()
@@ -97,15 +218,184 @@ class EventEngine:
         Stop event engine.
         """
         self._active = False
+
+        with self._timer_condition:
+            self._timer_condition.notify()
+
         self._timer.join()
         self._thread.join()
 
+    def add_timer(self, type: str, interval: float):
+        """
+        Add a timer which generates event of the type given every
+        interval seconds. Every type can only have one timer.
+        """
+        if interval <= 0:
+            raise ValueError(f"定时器间隔必须大于0：{interval}")
+
+        self.remove_timer(type)
+
+        with self._timer_condition:
+            timer_id = self._schedule(interval, (type, interval, None))
+            self._timer_ids[type] = timer_id
+
+    def remove_timer(self, type: str):
+        """
+        Remove an existing timer.
+        """
+        with self._timer_condition:
+            timer_id = self._timer_ids.pop(type, None)
+            if timer_id is not None:
+                self._timer_items.pop(timer_id)
+
+    def call_later(self, delay: float, callback: Callable[[], None]):
+        """
+        Run callback on event thread once after delay seconds. Return
+        an id which can be used to cancel the call.
+        """
+        with self._timer_condition:
+            return self._schedule(delay, (None, delay, callback))
+
+    def cancel_call(self, timer_id: int):
+        """
+        Cancel a delayed callback not run yet.
+        """
+        with self._timer_condition:
+            self._timer_items.pop(timer_id, None)
+
+    def _schedule(self, delay: float, item: tuple):
+        """
+        Push timer item into heap and wake up timer thread.
+        """
+        timer_id = next(self._timer_count)
+        self._timer_items[timer_id] = item
+
+        heappush(self._timer_heap, (monotonic() + delay, timer_id))
+        self._timer_condition.notify()
+
+        return timer_id
+
     def put(self, event: Event):
         """
         Put an event object into event queue.
         """
+        if self._profiler:
+            event.put_time = perf_counter()
+
+        if self._conflations and self._conflate(event):
+            return
         self._queue.put(event)
 
+    def start_profiling(self, slow_threshold: float = 0.01, interval: int = 60):
+        """
+        Start recording queue wait time of each event type and time cost
+        of each handler.
+
+        Handlers cost more than slow_threshold seconds are counted as
+        slow. Every interval timer events, an EVENT_PROFILE event is put
+        with statistics since last summary.
+        """
+        self._profile_interval = interval
+        self._profile_count = 0
+        self._profiler = EventProfiler(slow_threshold)
+
+        self.register(EVENT_TIMER, self._process_profile_timer)
+
+    def stop_profiling(self):
+        """
+        Stop recording time statistics.
+        """
+        self.unregister(EVENT_TIMER, self._process_profile_timer)
+        self._profiler = None
+
+    def get_profile(self, reset: bool = False):
+        """
+        Get time statistics in dict with keys:
+        * wait: histogram of queue wait time by event type
+        * handler: histogram of time cost by handler name
+        * slow: number of slow calls by handler name
+        """
+        if not self._profiler:
+            return {}
+        return self._profiler.get_profile(reset)
+
+    def _process_profile_timer(self, event: Event):
+        """
+        Put profile summary event periodically.
+        """
+        self._profile_count += 1
+        if self._profile_count < self._profile_interval:
+            return
+        self._profile_count = 0
+
+        profile = self.get_profile(reset=True)
+        self.put(Event(EVENT_PROFILE, profile))
+
+    def add_conflation(self, type: str, key: Callable[[Event], Any]):
+        """
+        Enable conflation for events of which type starts with the type
+        string given, e.g. "eTick." also matches "eTick.rb1905.SHFE".
+
+        For those events with same type and same key (returned by the key
+        function) still waiting in queue, only the latest data is kept
+        and processed at position of the earliest one.
+
+        Check supports_conflation of engine class before enabling it.
+        """
+        self._conflations.append((type, key))
+
+    def get_conflation_counts(self, type: str):
+        """
+        Get number of events conflated for a specific event type, in a
+        dict of key: count.
+        """
+        with self._conflation_lock:
+            return {
+                key: count
+                for (event_type, key), count in self._conflation_counts.items()
+                if event_type == type
+            }
+
+    def _get_conflation_key(self, event: Event):
+        """
+        Get conflation key of event, None if event is not conflated.
+        """
+        for type, key in self._conflations:
+            if event.type.startswith(type):
+                return (event.type, key(event))
+        return None
+
+    def _conflate(self, event: Event):
+        """
+        Merge data of event into the pending one with same key. Return
+        True if merged, otherwise the event should be put into queue.
+        """
+        key = self._get_conflation_key(event)
+        if key is None:
+            return False
+
+        with self._conflation_lock:
+            pending = self._latest.get(key, None)
+            if pending:
+                pending.data = event.data
+                self._conflation_counts[key] += 1
+                return True
+
+            self._latest[key] = event
+            return False
+
+    def _release(self, event: Event):
+        """
+        Stop conflating data into event which is going to be processed.
+        """
+        key = self._get_conflation_key(event)
+        if key is None:
+            return
+
+        with self._conflation_lock:
+            if self._latest.get(key, None) is event:
+                self._latest.pop(key)
+
     def register(self, type: str, handler: HandlerType):
         """
         Register a new handler function for a specific event type. Every 
@@ -141,3 +431,247 @@ class EventEngine:
         """
         if handler in self._general_handlers:
             self._general_handlers.remove(handler)
+
+
+class BatchEventEngine(EventEngine):
+    """
+    Event engine which drains all pending events every time its thread
+    wakes up, and processes them in one batch.
+
+    Putting event into engine only appends to a deque without acquiring
+    any lock under heavy load, and handlers of each event type are
+    precomputed into a tuple (rebuilt only on register/unregister), so
+    the cost of distributing an event is kept as low as possible.
+    """
+
+    def __init__(self, interval: float = 1):
+        """"""
+        super(BatchEventEngine, self).__init__(interval)
+
+        self._pending = deque()
+        self._wakeup = ThreadEvent()
+
+        self._dispatch = {}
+        self._general_dispatch = ()
+
+    def _run(self):
+        """
+        Wait until woken up by new event, and then drain all pending
+        events in queue.
+        """
+        pending = self._pending
+        wakeup = self._wakeup
+
+        while self._active:
+            if not wakeup.wait(1):
+                continue
+
+            # Clear wakeup flag before draining, so that events put
+            # during processing will wake up the next loop.
+            wakeup.clear()
+
+            # Only drain events already in queue now. If conflation is
+            # enabled, release all of them together within the lock.
+            if self._conflations:
+                with self._conflation_lock:
+                    self._latest = {}
+                    count = len(pending)
+            else:
+                count = len(pending)
+
+            if self._profiler:
+                for _ in range(count):
+                    event = pending.popleft()
+                    self._process_profiled(event, self._get_handlers(event))
+            else:
+                for _ in range(count):
+                    event = pending.popleft()
+                    self._process(event)
+
+    def _process(self, event: Event):
+        """
+        Distribute event to the precomputed handler tuple of its type,
+        which contains both type handlers and general handlers.
+        """
+        for handler in self._dispatch.get(event.type, self._general_dispatch):
+            handler(event)
+
+    def _get_handlers(self, event: Event):
+        """"""
+        return self._dispatch.get(event.type, self._general_dispatch)
+
+    def put(self, event: Event):
+        """
+        Put an event object into event queue.
+        """
+        if self._profiler:
+            event.put_time = perf_counter()
+
+        if self._conflations and self._conflate(event):
+            return
+        self._pending.append(event)
+
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def register(self, type: str, handler: HandlerType):
+        """"""
+        super(BatchEventEngine, self).register(type, handler)
+        self._rebuild_dispatch()
+
+    def unregister(self, type: str, handler: HandlerType):
+        """"""
+        super(BatchEventEngine, self).unregister(type, handler)
+        self._rebuild_dispatch()
+
+    def register_general(self, handler: HandlerType):
+        """"""
+        super(BatchEventEngine, self).register_general(handler)
+        self._rebuild_dispatch()
+
+    def unregister_general(self, handler: HandlerType):
+        """"""
+        super(BatchEventEngine, self).unregister_general(handler)
+        self._rebuild_dispatch()
+
+    def _rebuild_dispatch(self):
+        """
+        Precompute handler tuple for every event type. New dict is
+        created and then swapped in, so the event thread always sees
+        a consistent dispatch table.
+        """
+        general_dispatch = tuple(self._general_handlers)
+
+        dispatch = {}
+        for type, handler_list in self._handlers.items():
+            dispatch[type] = tuple(handler_list) + general_dispatch
+
+        self._dispatch = dispatch
+        self._general_dispatch = general_dispatch
+
+
+class ShardedEventEngine(BatchEventEngine):
+    """
+    Event engine which runs handlers on multiple threads.
+
+    Handlers declared by shard_safe decorator run on shard workers, each
+    event is routed to a worker by its shard key, so that events with the
+    same key are processed in order while those with different keys are
+    processed in parallel. Events without key are routed by type.
+
+    Other handlers run on the global serial lane, same as BatchEventEngine.
+
+    Conflation is not supported, since one event may wait in both serial
+    lane and shard worker.
+    """
+
+    supports_conflation = False
+
+    def __init__(
+        self,
+        interval: float = 1,
+        worker_count: int = 4,
+        key: Callable[[Event], Any] = get_shard_key
+    ):
+        """"""
+        super(ShardedEventEngine, self).__init__(interval)
+
+        self._key = key
+        self._worker_count = worker_count
+        self._worker_queues = [deque() for _ in range(worker_count)]
+        self._worker_wakeups = [ThreadEvent() for _ in range(worker_count)]
+        self._workers = [
+            Thread(target=self._run_worker, args=(index,))
+            for index in range(worker_count)
+        ]
+
+        self._shard_dispatch = {}
+        self._general_shard_dispatch = ()
+
+    def _run_worker(self, index: int):
+        """
+        Drain events routed to the shard worker.
+        """
+        pending = self._worker_queues[index]
+        wakeup = self._worker_wakeups[index]
+
+        while self._active:
+            if not wakeup.wait(1):
+                continue
+            wakeup.clear()
+
+            for _ in range(len(pending)):
+                event = pending.popleft()
+                handlers = self._shard_dispatch.get(event.type, self._general_shard_dispatch)
+
+                if self._profiler:
+                    self._process_profiled(event, handlers)
+                else:
+                    for handler in handlers:
+                        handler(event)
+
+    def start(self):
+        """"""
+        super(ShardedEventEngine, self).start()
+
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self):
+        """"""
+        super(ShardedEventEngine, self).stop()
+
+        for worker in self._workers:
+            worker.join()
+
+    def put(self, event: Event):
+        """
+        Put event into serial lane if any serial handler listens to it,
+        and into shard worker if any shard safe handler listens to it.
+        """
+        if self._profiler:
+            event.put_time = perf_counter()
+
+        if self._dispatch.get(event.type, self._general_dispatch):
+            self._pending.append(event)
+
+            if not self._wakeup.is_set():
+                self._wakeup.set()
+
+        if self._shard_dispatch.get(event.type, self._general_shard_dispatch):
+            key = self._key(event)
+            if key is None:
+                key = event.type
+
+            index = hash(key) % self._worker_count
+            self._worker_queues[index].append(event)
+
+            wakeup = self._worker_wakeups[index]
+            if not wakeup.is_set():
+                wakeup.set()
+
+    def _rebuild_dispatch(self):
+        """
+        Split handlers of every event type into serial and shard safe ones.
+        """
+        general_dispatch = tuple(
+            h for h in self._general_handlers if not is_shard_safe(h)
+        )
+        general_shard_dispatch = tuple(
+            h for h in self._general_handlers if is_shard_safe(h)
+        )
+
+        dispatch = {}
+        shard_dispatch = {}
+        for type, handler_list in self._handlers.items():
+            dispatch[type] = tuple(
+                h for h in handler_list if not is_shard_safe(h)
+            ) + general_dispatch
+            shard_dispatch[type] = tuple(
+                h for h in handler_list if is_shard_safe(h)
+            ) + general_shard_dispatch
+
+        self._dispatch = dispatch
+        self._general_dispatch = general_dispatch
+        self._shard_dispatch = shard_dispatch
+        self._general_shard_dispatch = general_shard_dispatch
@@ -0,0 +1,130 @@
+"""
+Latency statistics of event engine.
+"""
+
+from collections import defaultdict
+from threading import Lock
+from typing import Any
+
+
+class Histogram:
+    """
+    Histogram of time cost in seconds, with buckets growing by power of 2
+    from 1 microsecond, so that recording a value costs O(1) and memory
+    is fixed no matter how many values recorded.
+    """
+
+    bucket_count = 32
+
+    def __init__(self):
+        """"""
+        self.buckets = [0] * self.bucket_count
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value: float):
+        """
+        Record a new value.
+        """
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+        index = min(int(value * 1_000_000).bit_length(), self.bucket_count - 1)
+        self.buckets[index] += 1
+
+    def percentile(self, percent: float):
+        """
+        Get upper bound of the bucket where the percentile lies in.
+        """
+        if not self.count:
+            return 0
+
+        target = self.count * percent / 100
+        accumulated = 0
+
+        for index, n in enumerate(self.buckets):
+            accumulated += n
+            if accumulated >= target:
+                return min((1 << index) / 1_000_000, self.max)
+
+        return self.max
+
+    def to_dict(self):
+        """"""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+def get_handler_name(handler: Any):
+    """
+    Get readable name of handler, e.g. OmsEngine.process_tick_event.
+    """
+    return getattr(handler, "__qualname__", repr(handler))
+
+
+class EventProfiler:
+    """
+    Records time each event waited in queue by event type, and time each
+    handler cost for processing event.
+    """
+
+    def __init__(self, slow_threshold: float):
+        """
+        Handler cost more than slow_threshold seconds is counted as slow.
+        """
+        self.slow_threshold = slow_threshold
+
+        self.lock = Lock()
+        self.clear()
+
+    def clear(self):
+        """
+        Clear all statistics.
+        """
+        self.wait_histograms = defaultdict(Histogram)
+        self.handler_histograms = defaultdict(Histogram)
+        self.slow_counts = defaultdict(int)
+
+    def record_wait(self, type: str, wait: float):
+        """
+        Record queue wait time of an event.
+        """
+        with self.lock:
+            self.wait_histograms[type].add(wait)
+
+    def record_handler(self, handler: Any, cost: float):
+        """
+        Record time cost of a handler processing an event.
+        """
+        name = get_handler_name(handler)
+
+        with self.lock:
+            self.handler_histograms[name].add(cost)
+
+            if cost > self.slow_threshold:
+                self.slow_counts[name] += 1
+
+    def get_profile(self, reset: bool = False):
+        """
+        Get statistics in dict, optionally clear them afterwards.
+        """
+        with self.lock:
+            profile = {
+                "wait": {k: v.to_dict() for k, v in self.wait_histograms.items()},
+                "handler": {k: v.to_dict() for k, v in self.handler_histograms.items()},
+                "slow": dict(self.slow_counts),
+            }
+
+            if reset:
+                self.clear()
+
+        return profile
@@ -6,7 +6,7 @@ import sys
 import json
 from threading import Lock
 from datetime import datetime
-from vnpy.api.rest import Request, RestClient
+from vnpy.api.rest import Request, RequestPriority, RestClient
 from vnpy.api.websocket import WebsocketClient
 from vnpy.event import Event
 from vnpy.trader.event import EVENT_TIMER
@@ -287,6 +287,7 @@ class AlpacaRestApi(RestClient):
             extra=order,
             on_failed=self.on_send_order_failed,
             on_error=self.on_send_order_error,
+            priority=RequestPriority.high,
         )
 
         return order.vt_orderid
@@ -304,7 +305,8 @@ class AlpacaRestApi(RestClient):
             "DELETE",
             path,
             callback=self.on_cancel_order,
-            extra=req
+            extra=req,
+            priority=RequestPriority.high,
         )
 
     def on_query_contract(self, data, request: Request):
@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 from enum import Enum
 from threading import Lock
 
-from vnpy.api.rest import RestClient, Request
+from vnpy.api.rest import RestClient, Request, RequestPriority
 from vnpy.api.websocket import WebsocketClient
 from vnpy.trader.constant import (
     Direction,
@@ -168,6 +168,10 @@ class BinanceRestApi(RestClient):
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
 
+        # Requests are signed with timestamp instead of increasing nonce,
+        # so queries can be sent concurrently.
+        self.concurrent = True
+
         self.trade_ws_api = self.gateway.trade_ws_api
 
         self.key = ""
@@ -347,7 +351,8 @@ class BinanceRestApi(RestClient):
             params=params,
             extra=order,
             on_error=self.on_send_order_error,
-            on_failed=self.on_send_order_failed
+            on_failed=self.on_send_order_failed,
+            priority=RequestPriority.high,
         )
 
         return order.vt_orderid
@@ -369,7 +374,8 @@ class BinanceRestApi(RestClient):
             callback=self.on_cancel_order,
             params=params,
             data=data,
-            extra=req
+            extra=req,
+            priority=RequestPriority.high,
         )
 
     def start_user_stream(self):
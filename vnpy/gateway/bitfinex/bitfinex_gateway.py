@@ -21,6 +21,7 @@ from vnpy.trader.constant import (
     Interval
 )
 from vnpy.trader.gateway import BaseGateway
+from vnpy.trader.utility import OrderBook
 from vnpy.trader.object import (
     TickData,
     OrderData,
@@ -84,6 +85,7 @@ class BitfinexGateway(BaseGateway):
         "session": 3,
         "proxy_host": "127.0.0.1",
         "proxy_port": 1080,
+        "depth": 0,
     }
 
     exchanges = [Exchange.BITFINEX]
@@ -102,10 +104,11 @@ class BitfinexGateway(BaseGateway):
         session = setting["session"]
         proxy_host = setting["proxy_host"]
         proxy_port = setting["proxy_port"]
+        depth = setting["depth"]
 
         self.rest_api.connect(key, secret, session, proxy_host, proxy_port)
 
-        self.ws_api.connect(key, secret, proxy_host, proxy_port)
+        self.ws_api.connect(key, secret, proxy_host, proxy_port, depth)
 
     def subscribe(self, req: SubscribeRequest):
         """"""
@@ -360,17 +363,25 @@ class BitfinexWebsocketApi(WebsocketClient):
         self.orders = {}
         self.trades = set()
         self.tickDict = {}
-        self.bidDict = {}
-        self.askDict = {}
+        self.books = {}             # symbol : OrderBook
+        self.depth = 0
         self.orderLocalDict = {}
         self.channelDict = {}       # channel_id : (Channel, Symbol)
 
     def connect(
-        self, key: str, secret: str, proxy_host: str, proxy_port: int
+        self,
+        key: str,
+        secret: str,
+        proxy_host: str,
+        proxy_port: int,
+        depth: int = 0
     ):
-        """"""
+        """
+        :param depth: levels of depth data pushed, 0 for no depth data.
+        """
         self.key = key
         self.secret = secret.encode()
+        self.depth = depth
         self.init(WEBSOCKET_HOST, proxy_host, proxy_port)
         self.start()
 
@@ -443,6 +454,7 @@ class BitfinexWebsocketApi(WebsocketClient):
     def on_connected(self):
         """"""
         self.gateway.write_log("Websocket API连接成功")
+        self.enable_checksum()
         self.authenticate()
 
     def on_disconnected(self):
@@ -509,70 +521,44 @@ class BitfinexWebsocketApi(WebsocketClient):
 
         # Update deep quote
         elif channel == "book":
-            bid = self.bidDict.setdefault(symbol, {})
-            ask = self.askDict.setdefault(symbol, {})
-
-            if len(l_data1) > 3:
-                for price, count, amount in l_data1:
-                    price = float(price)
-                    count = int(count)
-                    amount = float(amount)
-
-                    if amount > 0:
-                        bid[price] = amount
-                    else:
-                        ask[price] = -amount
+            book = self.books.setdefault(symbol, OrderBook())
+
+            # Checksum of top 25 levels
+            if l_data1 == "cs":
+                self.on_checksum(channel_id, symbol, book, data[2])
+                return
+
+            # Snapshot is a list of levels
+            if not l_data1 or isinstance(l_data1[0], list):
+                book.clear()
+                levels = l_data1
             else:
-                price, count, amount = l_data1
-                price = float(price)
-                count = int(count)
-                amount = float(amount)
-
-                if not count:
-                    if price in bid:
-                        del bid[price]
-                    elif price in ask:
-                        del ask[price]
+                levels = [l_data1]
+
+            for price, count, amount in levels:
+                if amount > 0:
+                    side = book.bids
                 else:
-                    if amount > 0:
-                        bid[price] = amount
-                    else:
-                        ask[price] = -amount
-
-            try:
-                # BID
-                bid_keys = bid.keys()
-                bidPriceList = sorted(bid_keys, reverse=True)
-
-                tick.bid_price_1 = bidPriceList[0]
-                tick.bid_price_2 = bidPriceList[1]
-                tick.bid_price_3 = bidPriceList[2]
-                tick.bid_price_4 = bidPriceList[3]
-                tick.bid_price_5 = bidPriceList[4]
-
-                tick.bid_volume_1 = bid[tick.bid_price_1]
-                tick.bid_volume_2 = bid[tick.bid_price_2]
-                tick.bid_volume_3 = bid[tick.bid_price_3]
-                tick.bid_volume_4 = bid[tick.bid_price_4]
-                tick.bid_volume_5 = bid[tick.bid_price_5]
-
-                # ASK
-                ask_keys = ask.keys()
-                askPriceList = sorted(ask_keys, reverse=True)
-
-                tick.ask_price_1 = askPriceList[0]
-                tick.ask_price_2 = askPriceList[1]
-                tick.ask_price_3 = askPriceList[2]
-                tick.ask_price_4 = askPriceList[3]
-                tick.ask_price_5 = askPriceList[4]
-
-                tick.ask_volume_1 = ask[tick.ask_price_1]
-                tick.ask_volume_2 = ask[tick.ask_price_2]
-                tick.ask_volume_3 = ask[tick.ask_price_3]
-                tick.ask_volume_4 = ask[tick.ask_price_4]
-                tick.ask_volume_5 = ask[tick.ask_price_5]
-            except IndexError:
+                    side = book.asks
+
+                if count:
+                    side.update(price, abs(amount))
+                else:
+                    side.update(price, 0)
+
+            if self.depth:
+                depth = book.to_depth(
+                    symbol,
+                    Exchange.BITFINEX,
+                    datetime.now(),
+                    self.gateway_name,
+                    self.depth
+                )
+                self.gateway.on_depth(depth)
+
+            if len(book.bids) < 5 or len(book.asks) < 5:
                 return
+            book.update_tick(tick)
 
         dt = datetime.now()
         tick.date = dt.strftime("%Y%m%d")
@@ -581,6 +567,25 @@ class BitfinexWebsocketApi(WebsocketClient):
 
         self.gateway.on_tick(copy(tick))
 
+    def on_checksum(
+        self, channel_id: int, symbol: str, book: OrderBook, checksum: int
+    ):
+        """
+        Resubscribe to book channel if local order book is out of sync.
+        """
+        if book.checksum(25, ask_sign=-1) == checksum:
+            return
+
+        self.gateway.write_log(f"{symbol}委托簿校验失败，重新订阅")
+        book.clear()
+
+        self.send_packet({"event": "unsubscribe", "chanId": channel_id})
+        self.send_packet({
+            "event": "subscribe",
+            "channel": "book",
+            "symbol": symbol,
+        })
+
     def on_wallet(self, data):
         """"""
         if str(data[0]) == "exchange":
@@ -628,6 +633,16 @@ class BitfinexWebsocketApi(WebsocketClient):
             self.exception_detail(exception_type, exception_value, tb)
         )
 
+    def enable_checksum(self):
+        """
+        Receive checksum of order book after every book update.
+        """
+        req = {
+            "event": "conf",
+            "flags": 131072
+        }
+        self.send_packet(req)
+
     def authenticate(self):
         """
         Authenticate websocket connection to subscribe private topic.
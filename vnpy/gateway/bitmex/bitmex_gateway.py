@@ -12,7 +12,7 @@ from urllib.parse import urlencode
 from requests import ConnectionError
 
 from vnpy.event import Event
-from vnpy.api.rest import Request, RestClient
+from vnpy.api.rest import Request, RequestPriority, RestClient
 from vnpy.api.websocket import WebsocketClient
 from vnpy.trader.event import EVENT_TIMER
 from vnpy.trader.constant import (
@@ -167,6 +167,10 @@ class BitmexRestApi(RestClient):
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
 
+        # Requests are signed with timestamp instead of increasing nonce,
+        # so queries can be sent concurrently.
+        self.concurrent = True
+
         self.key = ""
         self.secret = ""
 
@@ -291,6 +295,7 @@ class BitmexRestApi(RestClient):
             extra=order,
             on_failed=self.on_send_order_failed,
             on_error=self.on_send_order_error,
+            priority=RequestPriority.high,
         )
 
         self.gateway.on_order(order)
@@ -314,6 +319,7 @@ class BitmexRestApi(RestClient):
             callback=self.on_cancel_order,
             params=params,
             on_error=self.on_cancel_order_error,
+            priority=RequestPriority.high,
         )
 
     def query_history(self, req: HistoryRequest):
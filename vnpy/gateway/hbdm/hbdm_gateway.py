@@ -6,7 +6,6 @@ import re
 import urllib
 import base64
 import json
-import zlib
 import hashlib
 import hmac
 import sys
@@ -16,8 +15,8 @@ from threading import Lock
 from typing import Sequence
 
 from vnpy.event import Event
-from vnpy.api.rest import RestClient, Request
-from vnpy.api.websocket import WebsocketClient
+from vnpy.api.rest import RestClient, Request, RequestPriority
+from vnpy.api.websocket import WebsocketClient, ZlibJsonDecoder
 from vnpy.trader.constant import (
     Direction,
     Offset,
@@ -196,6 +195,10 @@ class HbdmRestApi(RestClient):
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
 
+        # Requests are signed with timestamp instead of increasing nonce,
+        # so queries can be sent concurrently.
+        self.concurrent = True
+
         self.host = ""
         self.key = ""
         self.secret = ""
@@ -206,6 +209,7 @@ class HbdmRestApi(RestClient):
         self.connect_time = 0
 
         self.positions = {}
+        self.position_lock = Lock()
         self.currencies = set()
 
     def sign(self, request):
@@ -422,7 +426,8 @@ class HbdmRestApi(RestClient):
             data=data,
             extra=order,
             on_error=self.on_send_order_error,
-            on_failed=self.on_send_order_failed
+            on_failed=self.on_send_order_failed,
+            priority=RequestPriority.high,
         )
 
         self.gateway.on_order(order)
@@ -470,7 +475,8 @@ class HbdmRestApi(RestClient):
             data=data,
             extra=orders,
             on_error=self.on_send_orders_error,
-            on_failed=self.on_send_orders_failed
+            on_failed=self.on_send_orders_failed,
+            priority=RequestPriority.high,
         )
 
         return vt_orderids
@@ -495,7 +501,8 @@ class HbdmRestApi(RestClient):
             callback=self.on_cancel_order,
             on_failed=self.on_cancel_order_failed,
             data=data,
-            extra=req
+            extra=req,
+            priority=RequestPriority.high,
         )
 
     def on_query_account(self, data, request):
@@ -518,33 +525,35 @@ class HbdmRestApi(RestClient):
         if self.check_error(data, "查询持仓"):
             return
 
-        # Clear all buf data
-        for position in self.positions.values():
-            position.volume = 0
-            position.frozen = 0
-            position.price = 0
-            position.pnl = 0
+        # Positions of each currency are queried concurrently
+        with self.position_lock:
+            # Clear all buf data
+            for position in self.positions.values():
+                position.volume = 0
+                position.frozen = 0
+                position.price = 0
+                position.pnl = 0
+
+            for d in data["data"]:
+                key = f"{d['contract_code']}_{d['direction']}"
+                position = self.positions.get(key, None)
+
+                if not position:
+                    position = PositionData(
+                        symbol=d["contract_code"],
+                        exchange=Exchange.HUOBI,
+                        direction=DIRECTION_HBDM2VT[d["direction"]],
+                        gateway_name=self.gateway_name
+                    )
+                    self.positions[key] = position
 
-        for d in data["data"]:
-            key = f"{d['contract_code']}_{d['direction']}"
-            position = self.positions.get(key, None)
-
-            if not position:
-                position = PositionData(
-                    symbol=d["contract_code"],
-                    exchange=Exchange.HUOBI,
-                    direction=DIRECTION_HBDM2VT[d["direction"]],
-                    gateway_name=self.gateway_name
-                )
-                self.positions[key] = position
-
-            position.volume = d["volume"]
-            position.frozen = d["frozen"]
-            position.price = d["cost_hold"]
-            position.pnl = d["profit"]
-
-        for position in self.positions.values():
-            self.gateway.on_position(position)
+                position.volume = d["volume"]
+                position.frozen = d["frozen"]
+                position.price = d["cost_hold"]
+                position.pnl = d["profit"]
+
+            for position in self.positions.values():
+                self.gateway.on_position(position)
 
     def on_query_active_order(self, data, request):
         """"""
@@ -785,6 +794,9 @@ class HbdmWebsocketApiBase(WebsocketClient):
         """"""
         super(HbdmWebsocketApiBase, self).__init__()
 
+        self.decoder = ZlibJsonDecoder(31)
+        self.record_received_text = False
+
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
 
@@ -829,11 +841,6 @@ class HbdmWebsocketApiBase(WebsocketClient):
         """"""
         pass
 
-    @staticmethod
-    def unpack_data(data):
-        """"""
-        return json.loads(zlib.decompress(data, 31)) 
-
     def on_packet(self, packet):
         """"""
         if "ping" in packet:
@@ -6,16 +6,17 @@ import re
 import urllib
 import base64
 import json
-import zlib
 import hashlib
 import hmac
 import sys
 from copy import copy
 from datetime import datetime
 
+import numpy as np
+
 from vnpy.event import Event
-from vnpy.api.rest import RestClient, Request
-from vnpy.api.websocket import WebsocketClient
+from vnpy.api.rest import RestClient, Request, RequestPriority
+from vnpy.api.websocket import WebsocketClient, ZlibJsonDecoder
 from vnpy.trader.constant import (
     Direction,
     Exchange,
@@ -26,6 +27,7 @@ from vnpy.trader.constant import (
 from vnpy.trader.gateway import BaseGateway, LocalOrderManager
 from vnpy.trader.object import (
     TickData,
+    DepthData,
     OrderData,
     TradeData,
     AccountData,
@@ -74,6 +76,7 @@ class HuobiGateway(BaseGateway):
         "会话数": 3,
         "代理地址": "",
         "代理端口": "",
+        "深度档位": 0,
     }
 
     exchanges = [Exchange.HUOBI]
@@ -95,6 +98,7 @@ class HuobiGateway(BaseGateway):
         session_number = setting["会话数"]
         proxy_host = setting["代理地址"]
         proxy_port = setting["代理端口"]
+        depth = setting["深度档位"]
 
         if proxy_port.isdigit():
             proxy_port = int(proxy_port)
@@ -104,7 +108,7 @@ class HuobiGateway(BaseGateway):
         self.rest_api.connect(key, secret, session_number,
                               proxy_host, proxy_port)
         self.trade_ws_api.connect(key, secret, proxy_host, proxy_port)
-        self.market_ws_api.connect(key, secret, proxy_host, proxy_port)
+        self.market_ws_api.connect(key, secret, proxy_host, proxy_port, depth)
 
         self.init_query()
 
@@ -160,6 +164,10 @@ class HuobiRestApi(RestClient):
 
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
+
+        # Requests are signed with timestamp instead of increasing nonce,
+        # so queries can be sent concurrently.
+        self.concurrent = True
         self.order_manager = gateway.order_manager
 
         self.host = ""
@@ -279,7 +287,8 @@ class HuobiRestApi(RestClient):
             data=data,
             extra=order,
             on_error=self.on_send_order_error,
-            on_failed=self.on_send_order_failed
+            on_failed=self.on_send_order_failed,
+            priority=RequestPriority.high,
         )
 
         self.order_manager.on_order(order)
@@ -294,7 +303,8 @@ class HuobiRestApi(RestClient):
             method="POST",
             path=path,
             callback=self.on_cancel_order,
-            extra=req
+            extra=req,
+            priority=RequestPriority.high,
         )
 
     def on_query_account(self, data, request):
@@ -474,6 +484,9 @@ class HuobiWebsocketApiBase(WebsocketClient):
         """"""
         super().__init__()
 
+        self.decoder = ZlibJsonDecoder(31)
+        self.record_received_text = False
+
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
 
@@ -511,11 +524,6 @@ class HuobiWebsocketApiBase(WebsocketClient):
         """"""
         pass
 
-    @staticmethod
-    def unpack_data(data):
-        """"""
-        return json.loads(zlib.decompress(data, 31)) 
-
     def on_packet(self, packet):
         """"""
         if "ping" in packet:
@@ -634,9 +642,20 @@ class HuobiDataWebsocketApi(HuobiWebsocketApiBase):
 
         self.req_id = 0
         self.ticks = {}
+        self.depth = 0
 
-    def connect(self, key: str, secret: str, proxy_host: str, proxy_port: int):
-        """"""
+    def connect(
+        self,
+        key: str,
+        secret: str,
+        proxy_host: str,
+        proxy_port: int,
+        depth: int = 0
+    ):
+        """
+        :param depth: levels of depth data pushed, 0 for no depth data.
+        """
+        self.depth = depth
         super().connect(key, secret, WEBSOCKET_DATA_HOST, proxy_host, proxy_port)
 
     def on_connected(self):
@@ -693,12 +712,24 @@ class HuobiDataWebsocketApi(HuobiWebsocketApiBase):
         tick.datetime = datetime.fromtimestamp(data["ts"] / 1000)
         
         bids = data["tick"]["bids"]
+        asks = data["tick"]["asks"]
+
+        if self.depth:
+            depth = DepthData(
+                symbol=symbol,
+                exchange=Exchange.HUOBI,
+                datetime=tick.datetime,
+                bids=np.array(bids[:self.depth], dtype=float).reshape(-1, 2),
+                asks=np.array(asks[:self.depth], dtype=float).reshape(-1, 2),
+                gateway_name=self.gateway_name,
+            )
+            self.gateway.on_depth(depth)
+
         for n in range(5):
             price, volume = bids[n]
             tick.__setattr__("bid_price_" + str(n + 1), float(price))
             tick.__setattr__("bid_volume_" + str(n + 1), float(volume))
 
-        asks = data["tick"]["asks"]
         for n in range(5):
             price, volume = asks[n]
             tick.__setattr__("ask_price_" + str(n + 1), float(price))
@@ -15,8 +15,8 @@ from urllib.parse import urlencode
 
 from requests import ConnectionError
 
-from vnpy.api.rest import Request, RestClient
-from vnpy.api.websocket import WebsocketClient
+from vnpy.api.rest import Request, RequestPriority, RestClient
+from vnpy.api.websocket import WebsocketClient, ZlibJsonDecoder
 from vnpy.trader.constant import (
     Direction,
     Exchange,
@@ -172,6 +172,10 @@ class OkexRestApi(RestClient):
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
 
+        # Requests are signed with timestamp instead of increasing nonce,
+        # so queries can be sent concurrently.
+        self.concurrent = True
+
         self.key = ""
         self.secret = ""
         self.passphrase = ""
@@ -270,6 +274,7 @@ class OkexRestApi(RestClient):
             extra=order,
             on_failed=self.on_send_order_failed,
             on_error=self.on_send_order_error,
+            priority=RequestPriority.high,
         )
 
         self.gateway.on_order(order)
@@ -290,7 +295,8 @@ class OkexRestApi(RestClient):
             data=data,
             on_error=self.on_cancel_order_error,
             on_failed=self.on_cancel_order_failed,
-            extra=req
+            extra=req,
+            priority=RequestPriority.high,
         )
 
     def query_contract(self):
@@ -546,6 +552,8 @@ class OkexWebsocketApi(WebsocketClient):
         """"""
         super(OkexWebsocketApi, self).__init__()
         self.ping_interval = 20     # OKEX use 30 seconds for ping
+        self.decoder = ZlibJsonDecoder(-zlib.MAX_WBITS)
+        self.record_received_text = False
 
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
@@ -578,10 +586,6 @@ class OkexWebsocketApi(WebsocketClient):
         self.init(WEBSOCKET_HOST, proxy_host, proxy_port)
         # self.start()
 
-    def unpack_data(self, data):
-        """"""
-        return json.loads(zlib.decompress(data, -zlib.MAX_WBITS))
-
     def subscribe(self, req: SubscribeRequest):
         """
         Subscribe to tick data upate.
@@ -16,8 +16,8 @@ from urllib.parse import urlencode
 
 from requests import ConnectionError
 
-from vnpy.api.rest import Request, RestClient
-from vnpy.api.websocket import WebsocketClient
+from vnpy.api.rest import Request, RequestPriority, RestClient
+from vnpy.api.websocket import WebsocketClient, ZlibJsonDecoder
 from vnpy.trader.constant import (
     Direction,
     Exchange,
@@ -171,6 +171,10 @@ class OkexfRestApi(RestClient):
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
 
+        # Requests are signed with timestamp instead of increasing nonce,
+        # so queries can be sent concurrently.
+        self.concurrent = True
+
         self.key = ""
         self.secret = ""
         self.passphrase = ""
@@ -273,6 +277,7 @@ class OkexfRestApi(RestClient):
             extra=order,
             on_failed=self.on_send_order_failed,
             on_error=self.on_send_order_error,
+            priority=RequestPriority.high,
         )
 
         self.gateway.on_order(order)
@@ -287,7 +292,8 @@ class OkexfRestApi(RestClient):
             callback=self.on_cancel_order,
             on_error=self.on_cancel_order_error,
             on_failed=self.on_cancel_order_failed,
-            extra=req
+            extra=req,
+            priority=RequestPriority.high,
         )
 
     def query_contract(self):
@@ -598,6 +604,8 @@ class OkexfWebsocketApi(WebsocketClient):
         """"""
         super(OkexfWebsocketApi, self).__init__()
         self.ping_interval = 20     # OKEX use 30 seconds for ping
+        self.decoder = ZlibJsonDecoder(-zlib.MAX_WBITS)
+        self.record_received_text = False
 
         self.gateway = gateway
         self.gateway_name = gateway.gateway_name
@@ -629,10 +637,6 @@ class OkexfWebsocketApi(WebsocketClient):
 
         self.init(WEBSOCKET_HOST, proxy_host, proxy_port)
 
-    def unpack_data(self, data):
-        """"""
-        return json.loads(zlib.decompress(data, -zlib.MAX_WBITS))
-
     def subscribe(self, req: SubscribeRequest):
         """
         Subscribe to tick data upate.
@@ -13,7 +13,7 @@ from copy import copy
 
 from requests import ConnectionError
 
-from vnpy.api.rest import Request, RestClient
+from vnpy.api.rest import Request, RequestPriority, RestClient
 from vnpy.api.websocket import WebsocketClient
 from vnpy.trader.constant import (
     Direction,
@@ -298,7 +298,8 @@ class OnetokenRestApi(RestClient):
             params={},
             extra=order,
             on_failed=self.on_send_order_failed,
-            on_error=self.on_send_order_error
+            on_error=self.on_send_order_error,
+            priority=RequestPriority.high,
         )
 
         self.gateway.on_order(order)
@@ -316,7 +317,8 @@ class OnetokenRestApi(RestClient):
             callback=self.on_cancel_order,
             params=params,
             on_error=self.on_cancel_order_error,
-            extra=req
+            extra=req,
+            priority=RequestPriority.high,
         )
 
     def on_send_order(self, data, request):
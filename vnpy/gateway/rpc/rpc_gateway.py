@@ -1,6 +1,19 @@
+import zlib
+from concurrent.futures import Future
+from typing import Any
+
 from vnpy.event import Event
-from vnpy.rpc import RpcClient
+from vnpy.rpc import RpcClient, get_codec
 from vnpy.trader.gateway import BaseGateway
+from vnpy.trader.event import (
+    EVENT_TICK,
+    EVENT_ORDER,
+    EVENT_TRADE,
+    EVENT_POSITION,
+    EVENT_ACCOUNT,
+    EVENT_CONTRACT,
+    EVENT_LOG
+)
 from vnpy.trader.object import (
     SubscribeRequest,
     CancelRequest,
@@ -16,7 +29,8 @@ class RpcGateway(BaseGateway):
 
     default_setting = {
         "主动请求地址": "tcp://127.0.0.1:2014",
-        "推送订阅地址": "tcp://127.0.0.1:4102"
+        "推送订阅地址": "tcp://127.0.0.1:4102",
+        "序列化格式": ["pickle", "binary"]
     }
 
     exchanges = list(Exchange)
@@ -27,15 +41,54 @@ class RpcGateway(BaseGateway):
 
         self.symbol_gateway_map = {}
 
-        self.client = RpcClient()
-        self.client.callback = self.client_callback
+        self.client = None
+
+        self.callbacks = {
+            EVENT_TICK: self.on_tick,
+            EVENT_ORDER: self.on_order,
+            EVENT_TRADE: self.on_trade,
+            EVENT_POSITION: self.on_position,
+            EVENT_ACCOUNT: self.on_account,
+            EVENT_CONTRACT: self.on_contract,
+        }
+
+        # Session and sequence of the last state event processed, data
+        # received while syncing with server is buffered.
+        self.session = 0
+        self.seq = 0
+        self.syncing = False
+        self.buf = []
 
     def connect(self, setting: dict):
         """"""
         req_address = setting["主动请求地址"]
         pub_address = setting["推送订阅地址"]
+        codec = setting.get("序列化格式", "pickle")
+
+        # Stop client of last connection, otherwise its thread keeps
+        # pushing data too.
+        if self.client:
+            self.client.stop()
+
+        self.buf = []
+
+        self.codec = get_codec(codec)
+        self.client = RpcClient(self.codec)
+        self.client.callback = self.client_callback
+
+        # Tick data is only subscribed for symbols in subscribe().
+        for topic in [
+            EVENT_ORDER,
+            EVENT_TRADE,
+            EVENT_POSITION,
+            EVENT_ACCOUNT,
+            EVENT_CONTRACT,
+            EVENT_LOG
+        ]:
+            self.client.subscribe_topic(topic)
 
-        self.client.subscribe_topic("")
+        # Buffer state data pushed before synced with server.
+        self.syncing = True
         self.client.start(req_address, pub_address)
 
         self.write_log("服务器连接成功，开始初始化查询")
@@ -44,6 +97,8 @@ class RpcGateway(BaseGateway):
 
     def subscribe(self, req: SubscribeRequest):
         """"""
+        self.client.subscribe_topic(EVENT_TICK + req.vt_symbol)
+
         gateway_name = self.symbol_gateway_map.get(req.vt_symbol, "")
         self.client.subscribe(req, gateway_name)
 
@@ -66,51 +121,144 @@ class RpcGateway(BaseGateway):
         pass
 
     def query_all(self):
+        """
+        Sync state from server: replay updates since last sequence if
+        reconnecting to the same server session, otherwise get snapshot.
+        """
+        if self.session:
+            self.query_updates()
+        else:
+            self.query_snapshot()
+
+    def query_snapshot(self):
         """"""
-        contracts = self.client.get_all_contracts()
-        for contract in contracts:
-            self.symbol_gateway_map[contract.vt_symbol] = contract.gateway_name
-            contract.gateway_name = self.gateway_name
-            self.on_contract(contract)
-        self.write_log("合约信息查询成功")
-
-        accounts = self.client.get_all_accounts()
-        for account in accounts:
-            account.gateway_name = self.gateway_name
-            self.on_account(account)
-        self.write_log("资金信息查询成功")
-
-        positions = self.client.get_all_positions()
-        for position in positions:
-            position.gateway_name = self.gateway_name
-            self.on_position(position)
-        self.write_log("持仓信息查询成功")
-
-        orders = self.client.get_all_orders()
-        for order in orders:
-            order.gateway_name = self.gateway_name
-            self.on_order(order)
-        self.write_log("委托信息查询成功")
-
-        trades = self.client.get_all_trades()
-        for trade in trades:
-            trade.gateway_name = self.gateway_name
-            self.on_trade(trade)
-        self.write_log("成交信息查询成功")
+        self.syncing = True
+        self.client.call_async("get_snapshot", callback=self.process_snapshot)
+
+    def query_updates(self):
+        """"""
+        self.syncing = True
+        self.client.call_async(
+            "get_updates",
+            (self.session, self.seq),
+            callback=self.process_updates
+        )
+
+    def process_snapshot(self, future: Future):
+        """
+        Load all data in snapshot, then process data buffered meanwhile.
+        """
+        try:
+            snapshot = self.codec.unpack(zlib.decompress(future.result()))
+        except Exception as e:
+            self.write_log(f"快照数据查询失败：{e}")
+
+            # Query again if server not replied, but not after client stopped.
+            if isinstance(e, TimeoutError):
+                self.query_snapshot()
+            return
+
+        for type, name in [
+            (EVENT_CONTRACT, "合约"),
+            (EVENT_ACCOUNT, "资金"),
+            (EVENT_POSITION, "持仓"),
+            (EVENT_ORDER, "委托"),
+            (EVENT_TRADE, "成交"),
+        ]:
+            for data in snapshot[type]:
+                self.process_data(type, data)
+            self.write_log(f"{name}信息查询成功")
+
+        self.session = snapshot["session"]
+        self.seq = snapshot["seq"]
+        self.finish_sync()
+
+    def process_updates(self, future: Future):
+        """
+        Replay updates missed, or get snapshot if updates not available.
+        """
+        try:
+            updates = future.result()
+        except Exception as e:
+            self.write_log(f"增量数据查询失败：{e}")
+
+            if isinstance(e, TimeoutError):
+                self.query_snapshot()
+            return
+
+        if updates is None:
+            self.query_snapshot()
+            return
+
+        for seq, event in updates:
+            if seq > self.seq:
+                self.seq = seq
+                self.process_data(event.type, event.data)
+
+        self.write_log(f"补发增量数据{len(updates)}条")
+        self.finish_sync()
+
+    def finish_sync(self):
+        """
+        Process data received while syncing.
+        """
+        self.syncing = False
+
+        buf = self.buf
+        self.buf = []
+
+        for data in buf:
+            self.process_state(*data)
 
     def close(self):
         """"""
-        self.client.stop()
+        if self.client:
+            self.client.stop()
 
-    def client_callback(self, topic: str, event: Event):
+    def client_callback(self, topic: str, data: tuple):
         """"""
-        if event is None:
-            print("none event", topic, event)
+        session, seq, event = data
+
+        # Event not in state is not numbered.
+        if not seq:
+            self.process_data(event.type, event.data)
+        else:
+            self.process_state(session, seq, event)
+
+    def process_state(self, session: int, seq: int, event: Event):
+        """
+        Process state event in order of sequence, and replay updates if
+        any event missed.
+        """
+        if self.syncing:
+            self.buf.append((session, seq, event))
+            return
+
+        if session != self.session or seq > self.seq + 1:
+            self.buf.append((session, seq, event))
+            self.write_log(f"推送数据序号不连续：{self.seq}->{seq}，开始补发")
+            self.query_all()
             return
 
-        data = event.data
+        # Already processed in snapshot or updates
+        if seq <= self.seq:
+            return
+
+        self.seq = seq
+        self.process_data(event.type, event.data)
+
+    def process_data(self, type: str, data: Any):
+        """"""
+        if type == EVENT_CONTRACT:
+            self.symbol_gateway_map[data.vt_symbol] = data.gateway_name
 
         if hasattr(data, "gateway_name"):
             data.gateway_name = self.gateway_name
 
-        self.event_engine.put(event)
+        # Event of specific vt_symbol/vt_orderid is not published by server,
+        # so push data with gateway callback to generate both events.
+        callback = self.callbacks.get(type, None)
+        if callback:
+            callback(data)
+        else:
+            self.on_event(type, data)
@@ -1,13 +1,24 @@
+import asyncio
 import threading
 import traceback
 import signal
 import zmq
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import count
+from time import monotonic
 from typing import Any, Callable
 
+from .codec import BinaryCodec, PickleCodec, get_codec
+
 
 # Achieve Ctrl-c interrupt recv
 signal.signal(signal.SIGINT, signal.SIG_DFL)
 
+# Commands passed from caller threads to RpcClient thread
+COMMAND_REQUEST = b"r"
+COMMAND_SUBSCRIBE = b"s"
+COMMAND_UNSUBSCRIBE = b"u"
+
 
 class RemoteException(Exception):
     """
@@ -28,27 +39,53 @@ class RemoteException(Exception):
 
 
 class RpcServer:
-    """"""
+    """
+    Requests are received by a ROUTER socket and executed by a pool of
+    worker threads, so that a slow function does not block others.
+    Functions registered as serial (e.g. sending orders) are executed one
+    by one in order of requests by a separate worker thread.
+    Both RpcClient and plain REQ socket clients are supported.
+    """
 
-    def __init__(self):
+    def __init__(self, codec: Any = None, worker_count: int = 1):
         """
-        Constructor
+        Constructor, data is serialized by PickleCodec if codec not specified.
+
+        Functions are executed one by one in order of requests if
+        worker_count is 1.
         """
         # Save functions dict: key is fuction name, value is fuction object
         self.__functions = {}
+        self.__serial_functions = set()
+
+        # Codec for serializing request, reply and published data
+        self.__codec = codec or PickleCodec()
 
         # Zmq port related
         self.__context = zmq.Context()
 
-        # Reply socket (Request–reply pattern)
-        self.__socket_rep = self.__context.socket(zmq.REP)
+        # Router socket (Request–reply pattern)
+        self.__socket_router = self.__context.socket(zmq.ROUTER)
 
         # Publish socket (Publish–subscribe pattern)
         self.__socket_pub = self.__context.socket(zmq.PUB)
 
+        # Reply from worker threads are passed back by inproc socket,
+        # since zmq socket can only be used in one thread.
+        reply_address = f"inproc://rpc_server_reply_{id(self)}"
+        self.__socket_reply = self.__context.socket(zmq.PULL)
+        self.__socket_reply.bind(reply_address)
+
+        self.__socket_push = self.__context.socket(zmq.PUSH)
+        self.__socket_push.connect(reply_address)
+        self.__push_lock = threading.Lock()
+
         # Worker thread related
         self.__active = False                               # RpcServer status
         self.__thread = None                                # RpcServer thread
+        self.__worker_count = worker_count
+        self.__executor = None                              # Worker thread pool
+        self.__serial_executor = None                       # Serial worker thread
 
     def is_active(self):
         """"""
@@ -62,13 +99,20 @@ class RpcServer:
             return
 
         # Bind socket address
-        self.__socket_rep.bind(rep_address)
+        self.__socket_router.bind(rep_address)
         self.__socket_pub.bind(pub_address)
 
         # Start RpcServer status
         self.__active = True
 
-        # Start RpcServer thread
+        # Start worker threads and RpcServer thread
+        self.__executor = ThreadPoolExecutor(self.__worker_count)
+
+        if self.__worker_count == 1:
+            self.__serial_executor = self.__executor
+        else:
+            self.__serial_executor = ThreadPoolExecutor(1)
+
         self.__thread = threading.Thread(target=self.run)
         self.__thread.start()
 
@@ -82,68 +126,154 @@ class RpcServer:
         # Stop RpcServer status
         self.__active = False
 
-        # Wait for RpcServer thread to exit
-        if self.__thread.isAlive():
+        # Wait for RpcServer thread and worker threads to exit
+        if self.__thread.is_alive():
             self.__thread.join()
         self.__thread = None
 
+        self.__serial_executor.shutdown()
+        self.__serial_executor = None
+
+        self.__executor.shutdown()
+        self.__executor = None
+
         # Unbind socket address
         self.__socket_pub.unbind(self.__socket_pub.LAST_ENDPOINT)
-        self.__socket_rep.unbind(self.__socket_rep.LAST_ENDPOINT)
+        self.__socket_router.unbind(self.__socket_router.LAST_ENDPOINT)
 
     def run(self):
         """
-        Run RpcServer functions
+        Receive requests and send replies
         """
+        poller = zmq.Poller()
+        poller.register(self.__socket_router, zmq.POLLIN)
+        poller.register(self.__socket_reply, zmq.POLLIN)
+
         while self.__active:
             # Use poll to wait event arrival, waiting time is 1 second (1000 milliseconds)
-            if not self.__socket_rep.poll(1000):
-                continue
+            events = dict(poller.poll(1000))
+
+            # Receive request data from Router socket, in format of
+            # [identity, empty delimiter, request]
+            if self.__socket_router in events:
+                frames = self.__socket_router.recv_multipart()
+
+                try:
+                    req = self.__codec.unpack(frames[-1])
+                except Exception:
+                    traceback.print_exc()
+                    continue
+
+                # Request of RpcClient starts with request id, while request
+                # of REQ socket client does not
+                if len(req) == 4:
+                    name = req[1]
+                else:
+                    name = req[0]
+
+                if name in self.__serial_functions:
+                    executor = self.__serial_executor
+                else:
+                    executor = self.__executor
+                executor.submit(self.process_request, frames, req)
+
+            # Send reply of worker threads by Router socket
+            if self.__socket_reply in events:
+                frames = self.__socket_reply.recv_multipart()
+                self.__socket_router.send_multipart(frames)
+
+    def process_request(self, frames: list, req: list):
+        """
+        Run function requested in worker thread.
+        """
+        if len(req) == 4:
+            req_id, name, args, kwargs = req
+        else:
+            req_id = None
+            name, args, kwargs = req
 
-            # Receive request data from Reply socket
-            req = self.__socket_rep.recv_pyobj()
+        # Try to get and execute callable function object; capture exception information if it fails
+        try:
+            func = self.__functions[name]
+            r = func(*args, **kwargs)
+            rep = [True, r]
+        except Exception as e:  # noqa
+            rep = [False, traceback.format_exc()]
 
-            # Get function name and parameters
-            name, args, kwargs = req
+        if req_id is not None:
+            rep.insert(0, req_id)
 
-            # Try to get and execute callable function object; capture exception information if it fails
-            try:
-                func = self.__functions[name]
-                r = func(*args, **kwargs)
-                rep = [True, r]
-            except Exception as e:  # noqa
-                rep = [False, traceback.format_exc()]
+        # Pass reply back to RpcServer thread
+        frames[-1] = self.__codec.pack(rep)
 
-            # send callable response by Reply socket
-            self.__socket_rep.send_pyobj(rep)
+        with self.__push_lock:
+            self.__socket_push.send_multipart(frames)
 
     def publish(self, topic: str, data: Any):
         """
-        Publish data
+        Publish data with topic sent as a separate frame, so that zmq
+        filters data by topic subscribed on the server side.
         """
-        self.__socket_pub.send_pyobj([topic, data])
+        self.__socket_pub.send_multipart([
+            topic.encode("utf-8"),
+            self.__codec.pack(data)
+        ])
 
-    def register(self, func: Callable):
+    def register(self, func: Callable, serial: bool = False):
         """
-        Register function
+        Register function, serial function is never executed at the same
+        time as other serial functions, and in order of requests.
         """
         self.__functions[func.__name__] = func
 
+        if serial:
+            self.__serial_functions.add(func.__name__)
+
 
 class RpcClient:
-    """"""
+    """
+    Requests are sent by a DEALER socket with request id, so that
+    multiple requests can be in flight at the same time, and a request
+    fails with TimeoutError instead of blocking forever if server dies.
+    """
+
+    def __init__(self, codec: Any = None, timeout: float = 30):
+        """
+        Constructor, data is serialized by PickleCodec if codec not specified.
+
+        Remote call not replied in timeout seconds fails with TimeoutError.
+        """
+        # Codec for serializing request, reply and published data
+        self.__codec = codec or PickleCodec()
+        self.__timeout = timeout
 
-    def __init__(self):
-        """Constructor"""
         # zmq port related
         self.__context = zmq.Context()
 
-        # Request socket (Request–reply pattern)
-        self.__socket_req = self.__context.socket(zmq.REQ)
+        # Dealer socket (Request–reply pattern)
+        self.__socket_dealer = self.__context.socket(zmq.DEALER)
+        self.__socket_dealer.setsockopt(zmq.LINGER, 0)
 
         # Subscribe socket (Publish–subscribe pattern)
         self.__socket_sub = self.__context.socket(zmq.SUB)
 
+        # Requests and topic changes from caller threads are passed to
+        # RpcClient thread by inproc socket, since zmq socket can only be
+        # used in one thread.
+        request_address = f"inproc://rpc_client_request_{id(self)}"
+        self.__socket_request = self.__context.socket(zmq.PULL)
+        self.__socket_request.bind(request_address)
+
+        self.__socket_push = self.__context.socket(zmq.PUSH)
+        self.__socket_push.connect(request_address)
+        self.__push_lock = threading.Lock()
+
+        # Requests waiting for reply: key is request id, value is
+        # (future, deadline, name)
+        self.__request_id = count()
+        self.__pending = {}
+        self.__lock = threading.Lock()
+
         # Worker thread relate, used to process data pushed from server
         self.__active = False   # RpcClient status
         self.__thread = None    # RpcClient thread
@@ -154,20 +284,76 @@ class RpcClient:
         """
         # Perform remote call task
         def dorpc(*args, **kwargs):
-            # Generate request
-            req = [name, args, kwargs]
+            return self.call(name, args, kwargs)
+
+        return dorpc
+
+    def call(self, name: str, args: tuple = (), kwargs: dict = None, timeout: float = None):
+        """
+        Call remote function and wait for result.
+        """
+        # Reply is received by RpcClient thread, so waiting in it blocks forever.
+        if threading.current_thread() is self.__thread:
+            raise RemoteException(f"不能在RPC客户端推送线程中同步调用{name}，请使用call_async")
+
+        future = self.call_async(name, args, kwargs, timeout)
+        return future.result()
+
+    def call_async(
+        self,
+        name: str,
+        args: tuple = (),
+        kwargs: dict = None,
+        timeout: float = None,
+        callback: Callable[[Future], None] = None
+    ) -> Future:
+        """
+        Send request of calling remote function without waiting, return a
+        future of the result.
 
-            # Send request and wait for response
-            self.__socket_req.send_pyobj(req)
-            rep = self.__socket_req.recv_pyobj()
+        Callback is called with the future when done, in RpcClient thread,
+        or in the thread calling stop if the request is failed by stop.
+        """
+        if timeout is None:
+            timeout = self.__timeout
 
-            # Return response if successed; Trigger exception if failed
-            if rep[0]:
-                return rep[1]
-            else:
-                raise RemoteException(rep[1])
+        future = Future()
+        if callback:
+            future.add_done_callback(callback)
 
-        return dorpc
+        req_id = next(self.__request_id)
+
+        with self.__lock:
+            self.__pending[req_id] = (future, monotonic() + timeout, name)
+
+        # Generate request
+        req = [req_id, name, args, kwargs or {}]
+
+        # Pass request to RpcClient thread
+        data = self.__codec.pack(req)
+        self.send_command(COMMAND_REQUEST, data)
+
+        return future
+
+    def send_command(self, command: bytes, data: bytes):
+        """
+        Pass command to RpcClient thread.
+        """
+        with self.__push_lock:
+            self.__socket_push.send_multipart([command, data])
+
+    async def acall(
+        self,
+        name: str,
+        args: tuple = (),
+        kwargs: dict = None,
+        timeout: float = None
+    ):
+        """
+        Call remote function in asyncio coroutine.
+        """
+        future = self.call_async(name, args, kwargs, timeout)
+        return await asyncio.wrap_future(future)
 
     def start(self, req_address: str, sub_address: str):
         """
@@ -177,7 +363,7 @@ class RpcClient:
             return
 
         # Connect zmq port
-        self.__socket_req.connect(req_address)
+        self.__socket_dealer.connect(req_address)
         self.__socket_sub.connect(sub_address)
 
         # Start RpcClient status
@@ -198,28 +384,105 @@ class RpcClient:
         self.__active = False
 
         # Wait for RpcClient thread to exit
-        if self.__thread.isAlive():
+        if self.__thread.is_alive():
             self.__thread.join()
         self.__thread = None
 
         # Close socket
-        self.__socket_req.close()
+        self.__socket_dealer.close()
         self.__socket_sub.close()
 
+        with self.__push_lock:
+            self.__socket_push.close(linger=0)
+        self.__socket_request.close()
+
+        # Fail all requests still waiting
+        with self.__lock:
+            pending = list(self.__pending.values())
+            self.__pending.clear()
+
+        for future, _, name in pending:
+            future.set_exception(RemoteException(f"RPC客户端已停止，请求{name}失败"))
+
     def run(self):
         """
-        Run RpcClient function
+        Send requests, receive replies and data pushed from server
         """
+        poller = zmq.Poller()
+        poller.register(self.__socket_request, zmq.POLLIN)
+        poller.register(self.__socket_dealer, zmq.POLLIN)
+        poller.register(self.__socket_sub, zmq.POLLIN)
+
         while self.__active:
-            # Use poll to wait event arrival, waiting time is 1 second (1000 milliseconds)
-            if not self.__socket_sub.poll(1000):
-                continue
+            # Wait event arrival until the next request timeout, at most 1 second
+            timeout = self.check_timeout()
+            events = dict(poller.poll(timeout * 1000))
+
+            # Send requests in format of [empty delimiter, request], and
+            # change topics subscribed
+            if self.__socket_request in events:
+                command, data = self.__socket_request.recv_multipart()
+
+                if command == COMMAND_REQUEST:
+                    self.__socket_dealer.send_multipart([b"", data])
+                elif command == COMMAND_SUBSCRIBE:
+                    self.__socket_sub.setsockopt(zmq.SUBSCRIBE, data)
+                elif command == COMMAND_UNSUBSCRIBE:
+                    self.__socket_sub.setsockopt(zmq.UNSUBSCRIBE, data)
+
+            # Receive replies and complete futures
+            if self.__socket_dealer in events:
+                _, data = self.__socket_dealer.recv_multipart()
+                self.process_reply(self.__codec.unpack(data))
+
+            if self.__socket_sub in events:
+                # Receive topic and data from subscribe socket
+                topic, data = self.__socket_sub.recv_multipart()
+                topic = topic.decode("utf-8")
+                data = self.__codec.unpack(data)
+
+                # Process data by callable function
+                self.callback(topic, data)
+
+    def process_reply(self, rep: list):
+        """
+        Set result of future, reply of timeout request is ignored.
+        """
+        req_id, success, r = rep
+
+        with self.__lock:
+            pending = self.__pending.pop(req_id, None)
+
+        if not pending:
+            return
+        future = pending[0]
+
+        # Return response if successed; Trigger exception if failed
+        if success:
+            future.set_result(r)
+        else:
+            future.set_exception(RemoteException(r))
 
-            # Receive data from subscribe socket
-            topic, data = self.__socket_sub.recv_pyobj()
+    def check_timeout(self):
+        """
+        Fail requests timeout, and return seconds until the next timeout.
+        """
+        now = monotonic()
+        expired = []
+        wait = 1
+
+        with self.__lock:
+            for req_id, (future, deadline, name) in list(self.__pending.items()):
+                if deadline <= now:
+                    expired.append((future, name))
+                    self.__pending.pop(req_id)
+                else:
+                    wait = min(wait, deadline - now)
+
+        for future, name in expired:
+            future.set_exception(TimeoutError(f"RPC请求{name}超时"))
 
-            # Process data by callable function
-            self.callback(topic, data)
+        return wait
 
     def callback(self, topic: str, data: Any):
         """
@@ -229,6 +492,15 @@ class RpcClient:
 
     def subscribe_topic(self, topic: str):
         """
-        Subscribe data
+        Subscribe data of which topic starts with the string given.
+
+        Topic is subscribed in RpcClient thread, which can be called before
+        start.
+        """
+        self.send_command(COMMAND_SUBSCRIBE, topic.encode("utf-8"))
+
+    def unsubscribe_topic(self, topic: str):
+        """
+        Unsubscribe data of topic subscribed before.
         """
-        self.__socket_sub.setsockopt_string(zmq.SUBSCRIBE, topic)
+        self.send_command(COMMAND_UNSUBSCRIBE, topic.encode("utf-8"))
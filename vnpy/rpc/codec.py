@@ -0,0 +1,541 @@
+"""
+Serialization codecs used by RpcServer and RpcClient.
+"""
+
+import pickle
+from dataclasses import fields, is_dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from operator import attrgetter
+from struct import Struct
+from typing import Any, Callable, Dict, Sequence, get_type_hints
+
+import numpy as np
+
+from vnpy.event import Event
+from vnpy.trader.constant import (
+    Currency,
+    Direction,
+    Exchange,
+    Interval,
+    Offset,
+    OptionType,
+    OrderType,
+    Product,
+    Status
+)
+from vnpy.trader.object import (
+    AccountData,
+    BarData,
+    CancelRequest,
+    ContractData,
+    DepthData,
+    HistoryRequest,
+    LogData,
+    OrderData,
+    OrderRequest,
+    PositionData,
+    SubscribeRequest,
+    TickData,
+    TradeData
+)
+
+
+class PickleCodec:
+    """
+    Serialize any python object with pickle.
+
+    Wire format is the same as send_pyobj/recv_pyobj of pyzmq.
+    """
+
+    name = "pickle"
+
+    def pack(self, obj: Any) -> bytes:
+        """"""
+        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+    def unpack(self, data: bytes) -> Any:
+        """"""
+        return pickle.loads(data)
+
+
+# Type tags of binary codec
+MAGIC = b"\xb1"
+PICKLE_MAGIC = 0x80
+
+TAG_NONE = b"N"
+TAG_TRUE = b"T"
+TAG_FALSE = b"F"
+TAG_INT = b"i"
+TAG_FLOAT = b"f"
+TAG_STR = b"s"
+TAG_BYTES = b"b"
+TAG_LIST = b"l"
+TAG_TUPLE = b"t"
+TAG_DICT = b"d"
+TAG_DATETIME = b"D"
+TAG_ENUM = b"E"
+TAG_OBJECT = b"O"
+TAG_ARRAY = b"A"
+TAG_PICKLE = b"P"
+
+INT_STRUCT = Struct("<cq")
+FLOAT_STRUCT = Struct("<cd")
+SIZE_STRUCT = Struct("<cI")
+ENUM_STRUCT = Struct("<cHB")
+OBJECT_STRUCT = Struct("<cH")
+ARRAY_STRUCT = Struct("<cII")
+
+INT_MIN = -2 ** 63
+INT_MAX = 2 ** 63 - 1
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+NONE_DATETIME = INT_MIN
+
+# Field kinds of class schema
+KIND_FLOAT = "d"
+KIND_BOOL = "?"
+KIND_ENUM = "B"
+KIND_DATETIME = "q"
+KIND_STR = "s"
+KIND_ANY = "a"
+
+
+def make_getter(names: Sequence[str]) -> Callable:
+    """
+    Create function which returns tuple of attributes, even for one name.
+    """
+    if len(names) == 1:
+        name = names[0]
+        return lambda obj: (getattr(obj, name),)
+    elif names:
+        return attrgetter(*names)
+    else:
+        return lambda obj: ()
+
+
+def get_field_kind(type_: Any) -> str:
+    """
+    Get field kind from type annotation.
+    """
+    if type_ is float:
+        return KIND_FLOAT
+    elif type_ is bool:
+        return KIND_BOOL
+    elif type_ is str:
+        return KIND_STR
+    elif type_ is datetime:
+        return KIND_DATETIME
+    elif isinstance(type_, type) and issubclass(type_, Enum):
+        return KIND_ENUM
+    else:
+        return KIND_ANY
+
+
+class ClassSchema:
+    """
+    Fixed field layout of a registered class.
+
+    Float, bool, enum and datetime fields together with lengths of str
+    fields are packed by a single struct, followed by str bytes and then
+    other fields encoded with type tags.
+    """
+
+    def __init__(self, code: int, cls: type, field_types: Dict[str, Any], extra_types: Dict[str, Any]):
+        """"""
+        self.code = code
+        self.cls = cls
+        self.post_init = getattr(cls, "__post_init__", None)
+
+        groups = {
+            KIND_FLOAT: [],
+            KIND_BOOL: [],
+            KIND_ENUM: [],
+            KIND_DATETIME: [],
+            KIND_STR: [],
+            KIND_ANY: [],
+        }
+        self.enum_classes = []
+
+        for name, type_ in list(field_types.items()) + list(extra_types.items()):
+            kind = get_field_kind(type_)
+            groups[kind].append(name)
+
+            if kind == KIND_ENUM:
+                self.enum_classes.append(type_)
+
+        self.number_names = groups[KIND_FLOAT] + groups[KIND_BOOL]
+        self.enum_names = groups[KIND_ENUM]
+        self.datetime_names = groups[KIND_DATETIME]
+        self.str_names = groups[KIND_STR]
+        self.any_names = groups[KIND_ANY]
+
+        # Extra fields are set after __post_init__ called.
+        self.extra_names = list(extra_types.keys())
+
+        self.number_getter = make_getter(self.number_names)
+        self.enum_getter = make_getter(self.enum_names)
+        self.datetime_getter = make_getter(self.datetime_names)
+        self.str_getter = make_getter(self.str_names)
+        self.any_getter = make_getter(self.any_names)
+
+        self.enum_indexes = [
+            {member: index + 1 for index, member in enumerate(enum_class)}
+            for enum_class in self.enum_classes
+        ]
+        self.enum_members = [
+            [None] + list(enum_class) for enum_class in self.enum_classes
+        ]
+
+        self.struct = Struct(
+            "<"
+            + KIND_FLOAT * len(groups[KIND_FLOAT])
+            + KIND_BOOL * len(groups[KIND_BOOL])
+            + KIND_ENUM * len(self.enum_names)
+            + KIND_DATETIME * len(self.datetime_names)
+            + "I" * len(self.str_names)
+        )
+
+        self.number_end = len(self.number_names)
+        self.enum_end = self.number_end + len(self.enum_names)
+        self.datetime_end = self.enum_end + len(self.datetime_names)
+
+
+class BinaryCodec:
+    """
+    Compact binary serialization for data objects of VN Trader.
+
+    Registered classes (dataclasses in vnpy.trader.object and Event) are
+    encoded with fixed field order and no field names, enum members are
+    encoded as their index. Float fields are always decoded as float.
+    Float 2-D numpy arrays (e.g. levels of DepthData) are encoded as raw
+    bytes. Objects which do not fit the schema and classes not registered
+    are encoded with pickle.
+
+    Classes must be registered in the same order on both server and
+    client, which is guaranteed by using the same version of vn.py.
+    """
+
+    name = "binary"
+
+    def __init__(self):
+        """"""
+        self.schemas = []
+        self.class_schemas = {}
+
+        self.enum_classes = []
+        self.enum_codes = {}
+        self.enum_indexes = {}
+
+        self.register_default()
+
+    def register_default(self):
+        """
+        Register enums and data classes of VN Trader.
+        """
+        for enum_class in [
+            Direction,
+            Offset,
+            Status,
+            Product,
+            OrderType,
+            OptionType,
+            Exchange,
+            Currency,
+            Interval,
+        ]:
+            self.register_enum(enum_class)
+
+        self.register_class(Event, {"type": str, "data": Any})
+
+        for cls in [
+            TickData,
+            BarData,
+            OrderData,
+            TradeData,
+            PositionData,
+            AccountData,
+            ContractData,
+            SubscribeRequest,
+            OrderRequest,
+            CancelRequest,
+            HistoryRequest,
+        ]:
+            self.register_class(cls)
+
+        self.register_class(LogData, extra_types={"time": datetime})
+        self.register_class(DepthData)
+
+    def register_enum(self, enum_class: type):
+        """
+        Register enum class, so that members are encoded by index.
+        """
+        code = len(self.enum_classes)
+        self.enum_classes.append(list(enum_class))
+        self.enum_codes[enum_class] = code
+        self.enum_indexes[enum_class] = {
+            member: index for index, member in enumerate(enum_class)
+        }
+
+    def register_class(
+        self,
+        cls: type,
+        field_types: Dict[str, Any] = None,
+        extra_types: Dict[str, Any] = None
+    ):
+        """
+        Register class with its field types, which are got from type
+        hints of dataclass if not specified.
+
+        Extra attributes not in dataclass fields (e.g. set in
+        __post_init__) can be specified in extra_types.
+        """
+        if field_types is None:
+            if not is_dataclass(cls):
+                raise TypeError(f"需要指定{cls.__name__}的字段类型")
+
+            hints = get_type_hints(cls)
+            field_types = {f.name: hints[f.name] for f in fields(cls)}
+
+        schema = ClassSchema(
+            len(self.schemas),
+            cls,
+            field_types,
+            extra_types or {}
+        )
+        self.schemas.append(schema)
+        self.class_schemas[cls] = schema
+
+    def pack(self, obj: Any) -> bytes:
+        """"""
+        buf = [MAGIC]
+        self.encode(obj, buf)
+        return b"".join(buf)
+
+    def unpack(self, data: bytes) -> Any:
+        """
+        Data packed by PickleCodec can also be unpacked.
+        """
+        if data[0] == PICKLE_MAGIC:
+            return pickle.loads(data)
+
+        if data[:1] != MAGIC:
+            raise ValueError("无法识别的RPC数据格式")
+
+        obj, _ = self.decode(data, 1)
+        return obj
+
+    def encode(self, value: Any, buf: list):
+        """
+        Encode value with type tag into buffer.
+        """
+        type_ = type(value)
+
+        if value is None:
+            buf.append(TAG_NONE)
+        elif type_ is bool:
+            buf.append(TAG_TRUE if value else TAG_FALSE)
+        elif type_ is float:
+            buf.append(FLOAT_STRUCT.pack(TAG_FLOAT, value))
+        elif type_ is int and INT_MIN <= value <= INT_MAX:
+            buf.append(INT_STRUCT.pack(TAG_INT, value))
+        elif type_ is str:
+            data = value.encode("utf-8")
+            buf.append(SIZE_STRUCT.pack(TAG_STR, len(data)))
+            buf.append(data)
+        elif type_ is bytes:
+            buf.append(SIZE_STRUCT.pack(TAG_BYTES, len(value)))
+            buf.append(value)
+        elif type_ is list or type_ is tuple:
+            tag = TAG_LIST if type_ is list else TAG_TUPLE
+            buf.append(SIZE_STRUCT.pack(tag, len(value)))
+            for v in value:
+                self.encode(v, buf)
+        elif type_ is dict:
+            buf.append(SIZE_STRUCT.pack(TAG_DICT, len(value)))
+            for k, v in value.items():
+                self.encode(k, buf)
+                self.encode(v, buf)
+        elif type_ is datetime and value.tzinfo is None:
+            buf.append(INT_STRUCT.pack(TAG_DATETIME, (value - EPOCH) // MICROSECOND))
+        elif type_ in self.enum_codes:
+            index = self.enum_indexes[type_][value]
+            buf.append(ENUM_STRUCT.pack(TAG_ENUM, self.enum_codes[type_], index))
+        elif type_ in self.class_schemas:
+            self.encode_object(self.class_schemas[type_], value, buf)
+        elif type_ is np.ndarray and value.dtype == np.float64 and value.ndim == 2:
+            rows, columns = value.shape
+            buf.append(ARRAY_STRUCT.pack(TAG_ARRAY, rows, columns))
+            buf.append(value.tobytes())
+        else:
+            self.encode_pickle(value, buf)
+
+    def encode_pickle(self, value: Any, buf: list):
+        """"""
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        buf.append(SIZE_STRUCT.pack(TAG_PICKLE, len(data)))
+        buf.append(data)
+
+    def encode_object(self, schema: ClassSchema, obj: Any, buf: list):
+        """
+        Encode registered object by its schema, fallback to pickle if
+        any field value does not fit.
+        """
+        try:
+            enum_values = [
+                indexes[member] if member is not None else 0
+                for indexes, member in zip(schema.enum_indexes, schema.enum_getter(obj))
+            ]
+
+            datetime_values = [
+                (dt - EPOCH) // MICROSECOND if dt is not None else NONE_DATETIME
+                for dt in schema.datetime_getter(obj)
+            ]
+
+            str_values = [s.encode("utf-8") for s in schema.str_getter(obj)]
+
+            header = schema.struct.pack(
+                *schema.number_getter(obj),
+                *enum_values,
+                *datetime_values,
+                *[len(s) for s in str_values]
+            )
+        except Exception:
+            self.encode_pickle(obj, buf)
+            return
+
+        buf.append(OBJECT_STRUCT.pack(TAG_OBJECT, schema.code))
+        buf.append(header)
+        buf.extend(str_values)
+
+        for value in schema.any_getter(obj):
+            self.encode(value, buf)
+
+    def decode(self, data: bytes, offset: int):
+        """
+        Decode value from data at offset, return value and new offset.
+        """
+        tag = data[offset:offset + 1]
+        offset += 1
+
+        if tag == TAG_OBJECT:
+            return self.decode_object(data, offset)
+        elif tag == TAG_FLOAT:
+            return FLOAT_STRUCT.unpack_from(data, offset - 1)[1], offset + 8
+        elif tag == TAG_INT:
+            return INT_STRUCT.unpack_from(data, offset - 1)[1], offset + 8
+        elif tag == TAG_STR:
+            size = SIZE_STRUCT.unpack_from(data, offset - 1)[1]
+            offset += 4
+            return data[offset:offset + size].decode("utf-8"), offset + size
+        elif tag == TAG_NONE:
+            return None, offset
+        elif tag == TAG_TRUE:
+            return True, offset
+        elif tag == TAG_FALSE:
+            return False, offset
+        elif tag == TAG_LIST or tag == TAG_TUPLE:
+            size = SIZE_STRUCT.unpack_from(data, offset - 1)[1]
+            offset += 4
+
+            values = []
+            for _ in range(size):
+                value, offset = self.decode(data, offset)
+                values.append(value)
+
+            if tag == TAG_TUPLE:
+                values = tuple(values)
+            return values, offset
+        elif tag == TAG_DICT:
+            size = SIZE_STRUCT.unpack_from(data, offset - 1)[1]
+            offset += 4
+
+            values = {}
+            for _ in range(size):
+                key, offset = self.decode(data, offset)
+                value, offset = self.decode(data, offset)
+                values[key] = value
+            return values, offset
+        elif tag == TAG_DATETIME:
+            micros = INT_STRUCT.unpack_from(data, offset - 1)[1]
+            return EPOCH + micros * MICROSECOND, offset + 8
+        elif tag == TAG_ENUM:
+            _, code, index = ENUM_STRUCT.unpack_from(data, offset - 1)
+            return self.enum_classes[code][index], offset + 3
+        elif tag == TAG_BYTES:
+            size = SIZE_STRUCT.unpack_from(data, offset - 1)[1]
+            offset += 4
+            return data[offset:offset + size], offset + size
+        elif tag == TAG_ARRAY:
+            _, rows, columns = ARRAY_STRUCT.unpack_from(data, offset - 1)
+            offset += 8
+
+            size = rows * columns * 8
+            array = np.frombuffer(data, np.float64, rows * columns, offset)
+            return array.reshape(rows, columns).copy(), offset + size
+        elif tag == TAG_PICKLE:
+            size = SIZE_STRUCT.unpack_from(data, offset - 1)[1]
+            offset += 4
+            return pickle.loads(data[offset:offset + size]), offset + size
+        else:
+            raise ValueError(f"无法识别的数据类型标记：{tag}")
+
+    def decode_object(self, data: bytes, offset: int):
+        """"""
+        code = OBJECT_STRUCT.unpack_from(data, offset - 1)[1]
+        offset += 2
+
+        schema = self.schemas[code]
+        values = schema.struct.unpack_from(data, offset)
+        offset += schema.struct.size
+
+        obj = schema.cls.__new__(schema.cls)
+        d = obj.__dict__
+
+        d.update(zip(schema.number_names, values[:schema.number_end]))
+
+        for name, members, index in zip(
+            schema.enum_names,
+            schema.enum_members,
+            values[schema.number_end:schema.enum_end]
+        ):
+            d[name] = members[index]
+
+        for name, micros in zip(
+            schema.datetime_names,
+            values[schema.enum_end:schema.datetime_end]
+        ):
+            if micros == NONE_DATETIME:
+                d[name] = None
+            else:
+                d[name] = EPOCH + micros * MICROSECOND
+
+        for name, size in zip(schema.str_names, values[schema.datetime_end:]):
+            d[name] = data[offset:offset + size].decode("utf-8")
+            offset += size
+
+        for name in schema.any_names:
+            d[name], offset = self.decode(data, offset)
+
+        # Restore attributes derived from fields, like vt_symbol, then
+        # overwrite extra attributes with values received.
+        if schema.post_init:
+            extra = {name: d[name] for name in schema.extra_names}
+            schema.post_init(obj)
+            d.update(extra)
+
+        return obj, offset
+
+
+CODECS = {
+    PickleCodec.name: PickleCodec,
+    BinaryCodec.name: BinaryCodec,
+}
+
+
+def get_codec(name: str):
+    """
+    Create codec object by name.
+    """
+    return CODECS[name]()
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Sequence, TYPE_CHECKING
+from typing import List, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
 
 if TYPE_CHECKING:
     from vnpy.trader.constant import Interval, Exchange  # noqa
@@ -13,6 +15,75 @@ class Driver(Enum):
     MYSQL = "mysql"
     POSTGRESQL = "postgresql"
     MONGODB = "mongodb"
+    NUMPY = "numpy"
+
+
+BAR_FIELDS = [
+    "volume",
+    "open_interest",
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+]
+
+TICK_FIELDS = [
+    "volume",
+    "open_interest",
+    "last_price",
+    "last_volume",
+    "limit_up",
+    "limit_down",
+    "open_price",
+    "high_price",
+    "low_price",
+    "pre_close",
+]
+for prefix in ["bid_price", "ask_price", "bid_volume", "ask_volume"]:
+    TICK_FIELDS.extend(f"{prefix}_{n}" for n in range(1, 6))
+
+# Structured array returned by load_bar_array and load_tick_array,
+# datetime is saved without timezone.
+BAR_DTYPE = np.dtype([("datetime", "M8[us]")] + [(f, "f8") for f in BAR_FIELDS])
+TICK_DTYPE = np.dtype([("datetime", "M8[us]")] + [(f, "f8") for f in TICK_FIELDS])
+
+
+def to_array(datas: Sequence, dtype: np.dtype) -> np.ndarray:
+    """
+    Convert BarData or TickData list into structured array.
+    """
+    array = np.zeros(len(datas), dtype=dtype)
+    array["datetime"] = [data.datetime.replace(tzinfo=None) for data in datas]
+
+    for field in dtype.names[1:]:
+        array[field] = [getattr(data, field) or 0 for data in datas]
+
+    return array
+
+
+def columns_to_array(columns: List[list], dtype: np.dtype) -> np.ndarray:
+    """
+    Convert columns of raw database rows into structured array,
+    columns should be in the same order of dtype fields.
+    """
+    if not columns or not columns[0]:
+        return np.zeros(0, dtype=dtype)
+
+    array = np.zeros(len(columns[0]), dtype=dtype)
+
+    # Datetime string returned by SQLite is parsed by numpy directly.
+    datetimes = columns[0]
+    if getattr(datetimes[0], "tzinfo", None):
+        datetimes = [dt.replace(tzinfo=None) for dt in datetimes]
+    array["datetime"] = datetimes
+
+    for field, column in zip(dtype.names[1:], columns[1:]):
+        # None is converted into nan, which is saved as 0 in data object.
+        values = np.array(column, dtype=float)
+        values[np.isnan(values)] = 0
+        array[field] = values
+
+    return array
 
 
 class BaseDatabaseManager(ABC):
@@ -38,6 +109,37 @@ class BaseDatabaseManager(ABC):
     ) -> Sequence["TickData"]:
         pass
 
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval",
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """
+        Load bar data as structured array of BAR_DTYPE.
+
+        Driver should override this to load without creating data objects.
+        """
+        bars = self.load_bar_data(symbol, exchange, interval, start, end)
+        return to_array(bars, BAR_DTYPE)
+
+    def load_tick_array(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """
+        Load tick data as structured array of TICK_DTYPE.
+
+        Driver should override this to load without creating data objects.
+        """
+        ticks = self.load_tick_data(symbol, exchange, start, end)
+        return to_array(ticks, TICK_DTYPE)
+
     @abstractmethod
     def save_bar_data(
         self,
@@ -1,12 +1,22 @@
 from datetime import datetime
-from enum import Enum
-from typing import Optional, Sequence
+from operator import attrgetter
+from typing import List, Optional, Sequence, Type
 
+import numpy as np
 from mongoengine import DateTimeField, Document, FloatField, StringField, connect
+from pymongo import UpdateOne
 
 from vnpy.trader.constant import Exchange, Interval
 from vnpy.trader.object import BarData, TickData
-from .database import BaseDatabaseManager, Driver
+from .database import (
+    BAR_DTYPE,
+    BAR_FIELDS,
+    TICK_DTYPE,
+    TICK_FIELDS,
+    BaseDatabaseManager,
+    Driver,
+    columns_to_array,
+)
 
 
 def init(_: Driver, settings: dict):
@@ -31,7 +41,18 @@ def init(_: Driver, settings: dict):
         authentication_source=authentication_source,
     )
 
-    return MongoManager()
+    batch_size = settings.get("batch_size", DEFAULT_BATCH_SIZE)
+    ordered = settings.get("ordered_write", False)
+    return MongoManager(batch_size, ordered)
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+BAR_KEYS = ["symbol", "exchange", "interval", "datetime"]
+BAR_COLUMNS = BAR_KEYS + BAR_FIELDS
+
+TICK_KEYS = ["symbol", "exchange", "datetime"]
+TICK_COLUMNS = TICK_KEYS + ["name"] + TICK_FIELDS
 
 
 class DbBarData(Document):
@@ -261,6 +282,18 @@ class DbTickData(Document):
 
 
 class MongoManager(BaseDatabaseManager):
+    """
+    Raw documents are used for reading and writing data, instead of
+    creating mongoengine Document objects.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, ordered: bool = False):
+        """"""
+        self.batch_size = batch_size
+        self.ordered = ordered
+
+        self.get_bar_values = attrgetter("symbol", "datetime", *BAR_FIELDS)
+        self.get_tick_values = attrgetter("symbol", "datetime", "name", *TICK_FIELDS)
 
     def load_bar_data(
         self,
@@ -276,8 +309,12 @@ class MongoManager(BaseDatabaseManager):
             interval=interval.value,
             datetime__gte=start,
             datetime__lte=end,
-        )
-        data = [db_bar.to_bar() for db_bar in s]
+        ).order_by("datetime")
+
+        data = [
+            self.to_bar(doc, exchange, interval)
+            for doc in s.only(*BAR_COLUMNS).as_pymongo()
+        ]
         return data
 
     def load_tick_data(
@@ -288,61 +325,170 @@ class MongoManager(BaseDatabaseManager):
             exchange=exchange.value,
             datetime__gte=start,
             datetime__lte=end,
-        )
-        data = [db_tick.to_tick() for db_tick in s]
+        ).order_by("datetime")
+
+        data = [
+            self.to_tick(doc, exchange)
+            for doc in s.only(*TICK_COLUMNS).as_pymongo()
+        ]
         return data
 
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> np.ndarray:
+        s = DbBarData.objects(
+            symbol=symbol,
+            exchange=exchange.value,
+            interval=interval.value,
+            datetime__gte=start,
+            datetime__lte=end,
+        ).order_by("datetime")
+        return self.load_array(s, BAR_DTYPE)
+
+    def load_tick_array(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> np.ndarray:
+        s = DbTickData.objects(
+            symbol=symbol,
+            exchange=exchange.value,
+            datetime__gte=start,
+            datetime__lte=end,
+        ).order_by("datetime")
+        return self.load_array(s, TICK_DTYPE)
+
     @staticmethod
-    def to_update_param(d):
-        return {
-            "set__" + k: v.value if isinstance(v, Enum) else v
-            for k, v in d.__dict__.items()
-        }
+    def load_array(queryset, dtype: np.dtype) -> np.ndarray:
+        """
+        Load raw documents with projection, skipping Document conversion.
+        """
+        docs = list(queryset.only(*dtype.names).as_pymongo())
+        columns = [[doc.get(name) for doc in docs] for name in dtype.names]
+        return columns_to_array(columns, dtype)
+
+    @staticmethod
+    def to_bar(doc: dict, exchange: Exchange, interval: Interval) -> BarData:
+        """
+        Generate BarData object from raw document.
+        """
+        bar = BarData(
+            symbol=doc["symbol"],
+            exchange=exchange,
+            datetime=doc["datetime"],
+            interval=interval,
+            gateway_name="DB",
+        )
+
+        for name in BAR_FIELDS:
+            setattr(bar, name, doc.get(name) or 0)
+
+        return bar
+
+    @staticmethod
+    def to_tick(doc: dict, exchange: Exchange) -> TickData:
+        """
+        Generate TickData object from raw document.
+        """
+        tick = TickData(
+            symbol=doc["symbol"],
+            exchange=exchange,
+            datetime=doc["datetime"],
+            name=doc.get("name", ""),
+            gateway_name="DB",
+        )
+
+        for name in TICK_FIELDS:
+            setattr(tick, name, doc.get(name) or 0)
+
+        return tick
 
     def save_bar_data(self, datas: Sequence[BarData]):
-        for d in datas:
-            updates = self.to_update_param(d)
-            updates.pop("set__gateway_name")
-            updates.pop("set__vt_symbol")
-            (
-                DbBarData.objects(
-                    symbol=d.symbol, interval=d.interval.value, datetime=d.datetime
-                ).update_one(upsert=True, **updates)
+        rows = []
+        for bar in datas:
+            values = self.get_bar_values(bar)
+            rows.append(
+                (values[0], bar.exchange.value, bar.interval.value) + values[1:]
             )
 
+        requests = self.to_requests(BAR_COLUMNS, BAR_KEYS, rows)
+        self.bulk_write(DbBarData, requests)
+
     def save_tick_data(self, datas: Sequence[TickData]):
-        for d in datas:
-            updates = self.to_update_param(d)
-            updates.pop("set__gateway_name")
-            updates.pop("set__vt_symbol")
-            (
-                DbTickData.objects(
-                    symbol=d.symbol, exchange=d.exchange.value, datetime=d.datetime
-                ).update_one(upsert=True, **updates)
+        rows = []
+        for tick in datas:
+            values = self.get_tick_values(tick)
+            rows.append((values[0], tick.exchange.value) + values[1:])
+
+        requests = self.to_requests(TICK_COLUMNS, TICK_KEYS, rows)
+        self.bulk_write(DbTickData, requests)
+
+    @staticmethod
+    def to_requests(
+        columns: List[str], keys: List[str], rows: List[tuple]
+    ) -> List[UpdateOne]:
+        """
+        Generate upsert operations from row values.
+
+        Rows with the same keys are merged and the last one wins, since
+        upserts of the same document in one unordered batch are applied
+        in undefined order, and may even fail with duplicate key error.
+        """
+        docs = {}
+        for row in rows:
+            doc = dict(zip(columns, row))
+            docs[tuple(doc[key] for key in keys)] = doc
+
+        requests = []
+        for doc in docs.values():
+            query = {key: doc[key] for key in keys}
+            requests.append(UpdateOne(query, {"$set": doc}, upsert=True))
+        return requests
+
+    def bulk_write(self, document: Type[Document], requests: List[UpdateOne]):
+        """
+        Send upsert operations in batch. Unordered by default for parallel
+        execution on server side, set ordered to stop at the first error.
+        """
+        collection = document._get_collection()
+
+        for i in range(0, len(requests), self.batch_size):
+            collection.bulk_write(
+                requests[i:i + self.batch_size],
+                ordered=self.ordered
             )
 
     def get_newest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
     ) -> Optional["BarData"]:
-        s = (
-            DbBarData.objects(symbol=symbol, exchange=exchange.value)
+        doc = (
+            DbBarData.objects(
+                symbol=symbol, exchange=exchange.value, interval=interval.value
+            )
             .order_by("-datetime")
+            .only(*BAR_COLUMNS)
+            .as_pymongo()
             .first()
         )
-        if s:
-            return s.to_bar()
+        if doc:
+            return self.to_bar(doc, exchange, interval)
         return None
 
     def get_newest_tick_data(
         self, symbol: str, exchange: "Exchange"
     ) -> Optional["TickData"]:
-        s = (
+        doc = (
             DbTickData.objects(symbol=symbol, exchange=exchange.value)
             .order_by("-datetime")
+            .only(*TICK_COLUMNS)
+            .as_pymongo()
             .first()
         )
-        if s:
-            return s.to_tick()
+        if doc:
+            return self.to_tick(doc, exchange)
         return None
 
     def clean(self, symbol: str):
@@ -0,0 +1,353 @@
+"""
+Columnar database driver storing bar and tick data in binary files of
+numpy structured arrays, one file for each symbol and each day.
+"""
+
+import os
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, TickData
+from vnpy.trader.utility import get_folder_path
+from .database import (
+    BAR_DTYPE,
+    BAR_FIELDS,
+    TICK_DTYPE,
+    TICK_FIELDS,
+    BaseDatabaseManager,
+    Driver,
+    to_array,
+)
+
+
+FILE_SUFFIX = ".bin"
+
+
+def init(_: Driver, settings: dict):
+    database = settings["database"]
+    path = get_folder_path(database)
+    return NumpyManager(path)
+
+
+def to_datetime64(dt: datetime) -> np.datetime64:
+    """
+    Convert datetime into datetime64, timezone is ignored.
+    """
+    return np.datetime64(dt.replace(tzinfo=None), "us")
+
+
+class DayFileStore:
+    """
+    Records of one symbol saved in files named by date.
+
+    Records newer than the last one saved are appended to the end of file,
+    otherwise records of the day are merged and the file rewritten.
+    """
+
+    def __init__(self, path: Path, dtype: np.dtype):
+        """"""
+        self.path = path
+        self.dtype = dtype
+
+    def get_filepath(self, d: date) -> Path:
+        """"""
+        return self.path.joinpath(d.strftime("%Y%m%d") + FILE_SUFFIX)
+
+    def get_dates(self) -> List[date]:
+        """
+        Get dates of all files in order.
+        """
+        if not self.path.exists():
+            return []
+
+        dates = []
+        for filepath in self.path.iterdir():
+            if filepath.suffix == FILE_SUFFIX:
+                dates.append(datetime.strptime(filepath.stem, "%Y%m%d").date())
+
+        dates.sort()
+        return dates
+
+    def read_file(self, filepath: Path) -> np.ndarray:
+        """"""
+        # Record being appended by other process is not read.
+        count = filepath.stat().st_size // self.dtype.itemsize
+        return np.fromfile(str(filepath), dtype=self.dtype, count=count)
+
+    def read_last(self, filepath: Path) -> Optional[np.ndarray]:
+        """
+        Read the last record in file without reading all.
+        """
+        count = filepath.stat().st_size // self.dtype.itemsize
+        if not count:
+            return None
+
+        with open(filepath, "rb") as f:
+            f.seek((count - 1) * self.dtype.itemsize)
+            return np.fromfile(f, dtype=self.dtype, count=1)[0]
+
+    def load(self, start: datetime, end: datetime) -> np.ndarray:
+        """
+        Load records with datetime in [start, end], only files of dates
+        in range are read.
+        """
+        start_date = start.date()
+        end_date = end.date()
+
+        arrays = [
+            self.read_file(self.get_filepath(d))
+            for d in self.get_dates()
+            if start_date <= d <= end_date
+        ]
+        if not arrays:
+            return np.zeros(0, dtype=self.dtype)
+
+        data = np.concatenate(arrays)
+
+        timestamps = data["datetime"]
+        mask = (timestamps >= to_datetime64(start)) & (timestamps <= to_datetime64(end))
+        return data[mask]
+
+    def load_newest(self) -> Optional[np.ndarray]:
+        """"""
+        for d in reversed(self.get_dates()):
+            record = self.read_last(self.get_filepath(d))
+            if record is not None:
+                return record
+        return None
+
+    def save(self, data: np.ndarray):
+        """
+        Save records, record with the same datetime is replaced.
+        """
+        if not len(data):
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        days = data["datetime"].astype("M8[D]")
+        for day in np.unique(days):
+            self.save_day(self.get_filepath(day.tolist()), data[days == day])
+
+    def save_day(self, filepath: Path, data: np.ndarray):
+        """"""
+        timestamps = data["datetime"]
+        in_order = (timestamps[1:] > timestamps[:-1]).all()
+
+        # Append if all records are newer than saved ones.
+        if in_order:
+            last = None
+            if filepath.exists():
+                last = self.read_last(filepath)
+
+            if last is None or timestamps[0] > last["datetime"]:
+                with open(filepath, "ab") as f:
+                    f.write(data.tobytes())
+                return
+
+        # Otherwise merge with saved records, new one of the same datetime kept.
+        if filepath.exists():
+            data = np.concatenate([self.read_file(filepath), data])
+
+        reversed_data = data[::-1]
+        _, ix = np.unique(reversed_data["datetime"], return_index=True)
+        data = reversed_data[ix]
+
+        temp_path = filepath.with_suffix(".tmp")
+        data.tofile(str(temp_path))
+        os.replace(str(temp_path), str(filepath))
+
+
+class NumpyManager(BaseDatabaseManager):
+    """
+    Bar data is saved in folder of bar/interval/exchange/symbol, and tick
+    data in tick/exchange/symbol, each file contains data of one day.
+    """
+
+    def __init__(self, path: Path):
+        """"""
+        self.path = path
+        self.lock = Lock()
+
+        # Name of tick data is saved in a separate file of each symbol.
+        self.tick_names: Dict[Path, str] = {}
+
+    def get_bar_store(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval
+    ) -> DayFileStore:
+        """"""
+        path = self.path.joinpath("bar", interval.value, exchange.value, symbol)
+        return DayFileStore(path, BAR_DTYPE)
+
+    def get_tick_store(self, symbol: str, exchange: Exchange) -> DayFileStore:
+        """"""
+        path = self.path.joinpath("tick", exchange.value, symbol)
+        return DayFileStore(path, TICK_DTYPE)
+
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """
+        Load bar data as structured array of BAR_DTYPE.
+        """
+        store = self.get_bar_store(symbol, exchange, interval)
+        return store.load(start, end)
+
+    def load_tick_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """
+        Load tick data as structured array of TICK_DTYPE.
+        """
+        store = self.get_tick_store(symbol, exchange)
+        return store.load(start, end)
+
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> Sequence[BarData]:
+        array = self.load_bar_array(symbol, exchange, interval, start, end)
+        return self.to_bars(array, symbol, exchange, interval)
+
+    def load_tick_data(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> Sequence[TickData]:
+        array = self.load_tick_array(symbol, exchange, start, end)
+        return self.to_ticks(array, symbol, exchange)
+
+    def save_bar_data(self, datas: Sequence[BarData]):
+        with self.lock:
+            for (symbol, exchange, interval), group in self.group_data(
+                datas, lambda bar: (bar.symbol, bar.exchange, bar.interval)
+            ).items():
+                store = self.get_bar_store(symbol, exchange, interval)
+                store.save(to_array(group, BAR_DTYPE))
+
+    def save_tick_data(self, datas: Sequence[TickData]):
+        with self.lock:
+            for (symbol, exchange), group in self.group_data(
+                datas, lambda tick: (tick.symbol, tick.exchange)
+            ).items():
+                store = self.get_tick_store(symbol, exchange)
+                store.save(to_array(group, TICK_DTYPE))
+                self.save_tick_name(store.path, group[-1].name)
+
+    def get_newest_bar_data(
+        self, symbol: str, exchange: "Exchange", interval: "Interval"
+    ) -> Optional["BarData"]:
+        store = self.get_bar_store(symbol, exchange, interval)
+        record = store.load_newest()
+        if record is None:
+            return None
+        return self.to_bars(np.array([record]), symbol, exchange, interval)[0]
+
+    def get_newest_tick_data(
+        self, symbol: str, exchange: "Exchange"
+    ) -> Optional["TickData"]:
+        store = self.get_tick_store(symbol, exchange)
+        record = store.load_newest()
+        if record is None:
+            return None
+        return self.to_ticks(np.array([record]), symbol, exchange)[0]
+
+    def clean(self, symbol: str):
+        with self.lock:
+            for path in self.path.glob(f"bar/*/*/{symbol}"):
+                shutil.rmtree(str(path))
+
+            for path in self.path.glob(f"tick/*/{symbol}"):
+                shutil.rmtree(str(path))
+                self.tick_names.pop(path, None)
+
+    @staticmethod
+    def group_data(datas: Iterable, get_key) -> dict:
+        """"""
+        groups = {}
+        for data in datas:
+            groups.setdefault(get_key(data), []).append(data)
+        return groups
+
+    def to_bars(
+        self,
+        array: np.ndarray,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval
+    ) -> List[BarData]:
+        """"""
+        columns = [array[field].tolist() for field in BAR_FIELDS]
+
+        bars = []
+        for dt, values in zip(array["datetime"].tolist(), zip(*columns)):
+            bar = BarData(
+                symbol=symbol,
+                exchange=exchange,
+                datetime=dt,
+                interval=interval,
+                gateway_name="DB",
+                **dict(zip(BAR_FIELDS, values))
+            )
+            bars.append(bar)
+
+        return bars
+
+    def to_ticks(
+        self,
+        array: np.ndarray,
+        symbol: str,
+        exchange: Exchange
+    ) -> List[TickData]:
+        """"""
+        name = self.load_tick_name(self.get_tick_store(symbol, exchange).path)
+        columns = [array[field].tolist() for field in TICK_FIELDS]
+
+        ticks = []
+        for dt, values in zip(array["datetime"].tolist(), zip(*columns)):
+            tick = TickData(
+                symbol=symbol,
+                exchange=exchange,
+                datetime=dt,
+                name=name,
+                gateway_name="DB",
+                **dict(zip(TICK_FIELDS, values))
+            )
+            ticks.append(tick)
+
+        return ticks
+
+    def save_tick_name(self, path: Path, name: str):
+        """"""
+        if self.tick_names.get(path, None) == name:
+            return
+
+        path.joinpath("name.txt").write_text(name, encoding="utf-8")
+        self.tick_names[path] = name
+
+    def load_tick_name(self, path: Path) -> str:
+        """"""
+        filepath = path.joinpath("name.txt")
+        if not filepath.exists():
+            return ""
+        return filepath.read_text(encoding="utf-8")
@@ -1,7 +1,12 @@
 """"""
+import csv
 from datetime import datetime
+from io import StringIO
+from operator import attrgetter
 from typing import List, Optional, Sequence, Type
+from uuid import uuid4
 
+import numpy as np
 from peewee import (
     AutoField,
     CharField,
@@ -18,7 +23,31 @@ from peewee import (
 from vnpy.trader.constant import Exchange, Interval
 from vnpy.trader.object import BarData, TickData
 from vnpy.trader.utility import get_file_path
-from .database import BaseDatabaseManager, Driver
+from .database import (
+    BAR_DTYPE,
+    BAR_FIELDS,
+    TICK_DTYPE,
+    TICK_FIELDS,
+    BaseDatabaseManager,
+    Driver,
+    columns_to_array,
+)
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Pragmas for faster writing of large imports, which are only set during
+# bulk saving and restored after.
+SQLITE_BULK_PRAGMAS = {
+    "synchronous": "normal",
+    "cache_size": -64 * 1024,
+}
+
+BAR_KEYS = ["symbol", "exchange", "interval", "datetime"]
+BAR_COLUMNS = BAR_KEYS + BAR_FIELDS
+
+TICK_KEYS = ["symbol", "exchange", "datetime"]
+TICK_COLUMNS = TICK_KEYS + ["name"] + TICK_FIELDS
 
 
 def init(driver: Driver, settings: dict):
@@ -31,7 +60,16 @@ def init(driver: Driver, settings: dict):
 
     db = init_funcs[driver](settings)
     bar, tick = init_models(db, driver)
-    return SqlManager(bar, tick)
+
+    batch_size = settings.get("batch_size", DEFAULT_BATCH_SIZE)
+    return SqlManager(bar, tick, driver, batch_size)
+
+
+def quote(db: Database, name: str) -> str:
+    """
+    Quote name of table or column for raw SQL.
+    """
+    return db.quote[0] + name + db.quote[1]
 
 
 def init_sqlite(settings: dict):
@@ -125,29 +163,6 @@ def init_models(db: Database, driver: Driver):
             )
             return bar
 
-        @staticmethod
-        def save_all(objs: List["DbBarData"]):
-            """
-            save a list of objects, update if exists.
-            """
-            dicts = [i.to_dict() for i in objs]
-            with db.atomic():
-                if driver is Driver.POSTGRESQL:
-                    for bar in dicts:
-                        DbBarData.insert(bar).on_conflict(
-                            update=bar,
-                            conflict_target=(
-                                DbBarData.symbol,
-                                DbBarData.exchange,
-                                DbBarData.interval,
-                                DbBarData.datetime,
-                            ),
-                        ).execute()
-                else:
-                    for c in chunked(dicts, 50):
-                        DbBarData.insert_many(
-                            c).on_conflict_replace().execute()
-
     class DbTickData(ModelBase):
         """
         Tick data for database storage.
@@ -301,24 +316,6 @@ def init_models(db: Database, driver: Driver):
 
             return tick
 
-        @staticmethod
-        def save_all(objs: List["DbTickData"]):
-            dicts = [i.to_dict() for i in objs]
-            with db.atomic():
-                if driver is Driver.POSTGRESQL:
-                    for tick in dicts:
-                        DbTickData.insert(tick).on_conflict(
-                            update=tick,
-                            conflict_target=(
-                                DbTickData.symbol,
-                                DbTickData.exchange,
-                                DbTickData.datetime,
-                            ),
-                        ).execute()
-                else:
-                    for c in chunked(dicts, 50):
-                        DbTickData.insert_many(c).on_conflict_replace().execute()
-
     db.connect()
     db.create_tables([DbBarData, DbTickData])
     return DbBarData, DbTickData
@@ -326,9 +323,20 @@ def init_models(db: Database, driver: Driver):
 
 class SqlManager(BaseDatabaseManager):
 
-    def __init__(self, class_bar: Type[Model], class_tick: Type[Model]):
+    def __init__(
+        self,
+        class_bar: Type[Model],
+        class_tick: Type[Model],
+        driver: Driver = Driver.SQLITE,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
         self.class_bar = class_bar
         self.class_tick = class_tick
+        self.driver = driver
+        self.batch_size = batch_size
+
+        self.get_bar_values = attrgetter("symbol", "datetime", *BAR_FIELDS)
+        self.get_tick_values = attrgetter("symbol", "datetime", "name", *TICK_FIELDS)
 
     def load_bar_data(
         self,
@@ -369,13 +377,174 @@ class SqlManager(BaseDatabaseManager):
         data = [db_tick.to_tick() for db_tick in s]
         return data
 
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> np.ndarray:
+        fields = [getattr(self.class_bar, name) for name in BAR_DTYPE.names]
+        s = (
+            self.class_bar.select(*fields)
+                .where(
+                (self.class_bar.symbol == symbol)
+                & (self.class_bar.exchange == exchange.value)
+                & (self.class_bar.interval == interval.value)
+                & (self.class_bar.datetime >= start)
+                & (self.class_bar.datetime <= end)
+            )
+            .order_by(self.class_bar.datetime)
+        )
+        return self.load_array(s, BAR_DTYPE)
+
+    def load_tick_array(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> np.ndarray:
+        fields = [getattr(self.class_tick, name) for name in TICK_DTYPE.names]
+        s = (
+            self.class_tick.select(*fields)
+                .where(
+                (self.class_tick.symbol == symbol)
+                & (self.class_tick.exchange == exchange.value)
+                & (self.class_tick.datetime >= start)
+                & (self.class_tick.datetime <= end)
+            )
+            .order_by(self.class_tick.datetime)
+        )
+        return self.load_array(s, TICK_DTYPE)
+
+    @staticmethod
+    def load_array(query, dtype: np.dtype) -> np.ndarray:
+        """
+        Fetch raw tuples from database cursor, skipping model conversion.
+        """
+        cursor = query.model._meta.database.execute(query)
+        rows = cursor.fetchall()
+        columns = list(zip(*rows))
+        return columns_to_array(columns, dtype)
+
     def save_bar_data(self, datas: Sequence[BarData]):
-        ds = [self.class_bar.from_bar(i) for i in datas]
-        self.class_bar.save_all(ds)
+        # Row values are generated directly without creating model objects.
+        rows = []
+        for bar in datas:
+            values = self.get_bar_values(bar)
+            row = (values[0], bar.exchange.value, bar.interval.value) + values[1:]
+            rows.append(row)
+
+        self.save_rows(self.class_bar, BAR_COLUMNS, BAR_KEYS, rows)
 
     def save_tick_data(self, datas: Sequence[TickData]):
-        ds = [self.class_tick.from_tick(i) for i in datas]
-        self.class_tick.save_all(ds)
+        rows = []
+        for tick in datas:
+            values = self.get_tick_values(tick)
+            row = (values[0], tick.exchange.value) + values[1:]
+            rows.append(row)
+
+        self.save_rows(self.class_tick, TICK_COLUMNS, TICK_KEYS, rows)
+
+    def save_rows(
+        self,
+        model: Type[Model],
+        columns: List[str],
+        keys: List[str],
+        rows: List[tuple]
+    ):
+        """
+        Save rows with multi-row upsert, update if exists.
+        """
+        if not rows:
+            return
+
+        if self.driver is Driver.POSTGRESQL:
+            self.copy_rows(model, columns, keys, rows)
+            return
+
+        # Prepared statement is executed with rows in batch, MySQL driver
+        # rewrites it into multi-row statement.
+        db = model._meta.database
+        if self.driver is Driver.SQLITE:
+            verb = "INSERT OR REPLACE"
+        else:
+            verb = "REPLACE"
+
+        column_str = ", ".join(quote(db, name) for name in columns)
+        param_str = ", ".join([db.param] * len(columns))
+        sql = (
+            f"{verb} INTO {quote(db, model._meta.table_name)} ({column_str}) "
+            f"VALUES ({param_str})"
+        )
+
+        # Safety level can not be changed inside a transaction.
+        pragmas = {}
+        if self.driver is Driver.SQLITE and not db.in_transaction():
+            pragmas = {name: db.pragma(name) for name in SQLITE_BULK_PRAGMAS}
+            for name, value in SQLITE_BULK_PRAGMAS.items():
+                db.pragma(name, value)
+
+        try:
+            with db.atomic():
+                cursor = db.cursor()
+                for c in chunked(rows, self.batch_size):
+                    cursor.executemany(sql, c)
+        finally:
+            for name, value in pragmas.items():
+                db.pragma(name, value)
+
+    def copy_rows(
+        self,
+        model: Type[Model],
+        columns: List[str],
+        keys: List[str],
+        rows: List[tuple]
+    ):
+        """
+        Copy rows into a staging table of PostgreSQL, then merge into
+        the model table with one upsert statement.
+        """
+        # One row can only be updated once in upsert, the last one is kept.
+        ix = [columns.index(key) for key in keys]
+        rows = {tuple(row[i] for i in ix): row for row in rows}.values()
+
+        db = model._meta.database
+        table = quote(db, model._meta.table_name)
+
+        # Staging table is named uniquely and dropped explicitly, since
+        # it lives till the outer transaction ends if called inside one.
+        staging_name = f"staging_{model._meta.table_name}_{uuid4().hex}"
+        staging = quote(db, staging_name)
+
+        column_str = ", ".join(quote(db, name) for name in columns)
+        key_str = ", ".join(quote(db, name) for name in keys)
+        update_str = ", ".join(
+            f"{quote(db, name)} = EXCLUDED.{quote(db, name)}"
+            for name in columns if name not in keys
+        )
+
+        with db.atomic():
+            cursor = db.cursor()
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging} AS "
+                f"SELECT {column_str} FROM {table} WITH NO DATA"
+            )
+
+            for c in chunked(rows, self.batch_size):
+                buf = StringIO()
+                csv.writer(buf).writerows(c)
+                buf.seek(0)
+
+                cursor.copy_expert(
+                    f"COPY {staging} ({column_str}) FROM STDIN WITH (FORMAT csv)",
+                    buf
+                )
+
+            cursor.execute(
+                f"INSERT INTO {table} ({column_str}) "
+                f"SELECT {column_str} FROM {staging} "
+                f"ON CONFLICT ({key_str}) DO UPDATE SET {update_str}"
+            )
+            cursor.execute(f"DROP TABLE {staging}")
 
     def get_newest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
@@ -11,10 +11,11 @@ from queue import Empty, Queue
 from threading import Thread
 from typing import Any, Sequence, Type
 
-from vnpy.event import Event, EventEngine
+from vnpy.event import Event, EventEngine, BatchEventEngine, shard_safe, EVENT_PROFILE
 from .app import BaseApp
 from .event import (
     EVENT_TICK,
+    EVENT_DEPTH,
     EVENT_ORDER,
     EVENT_TRADE,
     EVENT_POSITION,
@@ -39,10 +40,15 @@ class MainEngine:
     Acts as the core of VN Trader.
     """
 
-    def __init__(self, event_engine: EventEngine = None):
-        """"""
+    def __init__(self, event_engine: EventEngine = None, batch_mode: bool = False):
+        """
+        If event_engine not specified, a new one is created. Set batch_mode
+        to use BatchEventEngine, which is faster under heavy event flow.
+        """
         if event_engine:
             self.event_engine = event_engine
+        elif batch_mode:
+            self.event_engine = BatchEventEngine()
         else:
             self.event_engine = EventEngine()
         self.event_engine.start()
@@ -103,6 +109,63 @@ class MainEngine:
         event = Event(EVENT_LOG, log)
         self.event_engine.put(event)
 
+    def enable_tick_conflation(self):
+        """
+        Keep only the latest tick of each vt_symbol waiting in event queue,
+        so that slow consumers always process the newest market data.
+        Other events like order and trade are never conflated.
+        """
+        if not self.event_engine.supports_conflation:
+            engine_name = type(self.event_engine).__name__
+            self.write_log(f"{engine_name}不支持Tick合并")
+            return False
+
+        self.event_engine.add_conflation(EVENT_TICK, get_tick_conflation_key)
+        return True
+
+    def get_tick_conflation_counts(self):
+        """
+        Get number of ticks conflated for each vt_symbol.
+        """
+        return self.event_engine.get_conflation_counts(EVENT_TICK)
+
+    def start_event_profiling(self, slow_threshold: float = 0.01, interval: int = 60):
+        """
+        Start profiling event engine, and write summary into log every
+        interval seconds.
+        """
+        self.event_engine.register(EVENT_PROFILE, self.process_profile_event)
+        self.event_engine.start_profiling(slow_threshold, interval)
+
+    def stop_event_profiling(self):
+        """"""
+        self.event_engine.stop_profiling()
+        self.event_engine.unregister(EVENT_PROFILE, self.process_profile_event)
+
+    def process_profile_event(self, event: Event):
+        """
+        Write slow handlers and event types waited longest in queue into log.
+        """
+        profile = event.data
+
+        for name, count in profile["slow"].items():
+            data = profile["handler"][name]
+            self.write_log(
+                f"事件处理函数{name}慢调用{count}次，"
+                f"平均耗时{data['mean'] * 1000:.3f}毫秒，最大耗时{data['max'] * 1000:.3f}毫秒"
+            )
+
+        waits = sorted(
+            profile["wait"].items(),
+            key=lambda item: item[1]["p99"],
+            reverse=True
+        )
+        for type, data in waits[:3]:
+            self.write_log(
+                f"事件{type}共{data['count']}个，队列等待时间"
+                f"P50为{data['p50'] * 1000:.3f}毫秒，P99为{data['p99'] * 1000:.3f}毫秒"
+            )
+
     def get_gateway(self, gateway_name: str):
         """
         Return gateway object by name.
@@ -223,6 +286,13 @@ class MainEngine:
             gateway.close()
 
 
+def get_tick_conflation_key(event: Event):
+    """
+    Conflate tick events by vt_symbol.
+    """
+    return event.data.vt_symbol
+
+
 class BaseEngine(ABC):
     """
     Abstract class for implementing an function engine.
@@ -329,6 +399,7 @@ class OmsEngine(BaseEngine):
         super(OmsEngine, self).__init__(main_engine, event_engine, "oms")
 
         self.ticks = {}
+        self.depths = {}
         self.orders = {}
         self.trades = {}
         self.positions = {}
@@ -343,12 +414,14 @@ class OmsEngine(BaseEngine):
     def add_function(self):
         """Add query function to main engine."""
         self.main_engine.get_tick = self.get_tick
+        self.main_engine.get_depth = self.get_depth
         self.main_engine.get_order = self.get_order
         self.main_engine.get_trade = self.get_trade
         self.main_engine.get_position = self.get_position
         self.main_engine.get_account = self.get_account
         self.main_engine.get_contract = self.get_contract
         self.main_engine.get_all_ticks = self.get_all_ticks
+        self.main_engine.get_all_depths = self.get_all_depths
         self.main_engine.get_all_orders = self.get_all_orders
         self.main_engine.get_all_trades = self.get_all_trades
         self.main_engine.get_all_positions = self.get_all_positions
@@ -359,17 +432,37 @@ class OmsEngine(BaseEngine):
     def register_event(self):
         """"""
         self.event_engine.register(EVENT_TICK, self.process_tick_event)
+        self.event_engine.register(EVENT_DEPTH, self.process_depth_event)
         self.event_engine.register(EVENT_ORDER, self.process_order_event)
         self.event_engine.register(EVENT_TRADE, self.process_trade_event)
         self.event_engine.register(EVENT_POSITION, self.process_position_event)
         self.event_engine.register(EVENT_ACCOUNT, self.process_account_event)
         self.event_engine.register(EVENT_CONTRACT, self.process_contract_event)
 
+    # Only market data handlers are shard safe. Handlers of order, trade,
+    # position, account and contract run on the serial lane, so that cache
+    # is updated before other serial handlers of the same event read it.
+    @shard_safe
     def process_tick_event(self, event: Event):
         """"""
         tick = event.data
         self.ticks[tick.vt_symbol] = tick
 
+    @shard_safe
+    def process_depth_event(self, event: Event):
+        """"""
+        depth = event.data
+
+        # Delta is merged into latest depth, and dropped if no depth
+        # received yet.
+        if depth.is_delta:
+            last_depth = self.depths.get(depth.vt_symbol, None)
+            if not last_depth:
+                return
+            depth = last_depth.apply_delta(depth)
+
+        self.depths[depth.vt_symbol] = depth
+
     def process_order_event(self, event: Event):
         """"""
         order = event.data
@@ -408,6 +501,12 @@ class OmsEngine(BaseEngine):
         """
         return self.ticks.get(vt_symbol, None)
 
+    def get_depth(self, vt_symbol):
+        """
+        Get latest order book depth data by vt_symbol.
+        """
+        return self.depths.get(vt_symbol, None)
+
     def get_order(self, vt_orderid):
         """
         Get latest order data by vt_orderid.
@@ -444,6 +543,12 @@ class OmsEngine(BaseEngine):
         """
         return list(self.ticks.values())
 
+    def get_all_depths(self):
+        """
+        Get all depth data.
+        """
+        return list(self.depths.values())
+
     def get_all_orders(self):
         """
         Get all order data.
@@ -5,10 +5,12 @@
 from abc import ABC, abstractmethod
 from typing import Any, Sequence
 from copy import copy
+from threading import RLock
 
 from vnpy.event import Event, EventEngine
 from .event import (
     EVENT_TICK,
+    EVENT_DEPTH,
     EVENT_ORDER,
     EVENT_TRADE,
     EVENT_POSITION,
@@ -18,6 +20,7 @@ from .event import (
 )
 from .object import (
     TickData,
+    DepthData,
     OrderData,
     TradeData,
     PositionData,
@@ -96,6 +99,14 @@ class BaseGateway(ABC):
         self.on_event(EVENT_TICK, tick)
         self.on_event(EVENT_TICK + tick.vt_symbol, tick)
 
+    def on_depth(self, depth: DepthData):
+        """
+        Depth event push.
+        Depth event of a specific vt_symbol is also pushed.
+        """
+        self.on_event(EVENT_DEPTH, depth)
+        self.on_event(EVENT_DEPTH + depth.vt_symbol, depth)
+
     def on_trade(self, trade: TradeData):
         """
         Trade event push.
@@ -273,6 +284,7 @@ class LocalOrderManager:
         self.order_prefix = ""
         self.order_count = 0
         self.orders = {}        # local_orderid:order
+        self.lock = RLock()     # callbacks may run in several threads
 
         # Map between local and system orderid
         self.local_sys_orderid_map = {}
@@ -291,19 +303,21 @@ class LocalOrderManager:
         """
         Generate a new local orderid.
         """
-        self.order_count += 1
-        local_orderid = str(self.order_count).rjust(8, "0")
-        return local_orderid
+        with self.lock:
+            self.order_count += 1
+            local_orderid = str(self.order_count).rjust(8, "0")
+            return local_orderid
 
     def get_local_orderid(self, sys_orderid: str):
         """
         Get local orderid with sys orderid.
         """
-        local_orderid = self.sys_local_orderid_map.get(sys_orderid, "")
+        with self.lock:
+            local_orderid = self.sys_local_orderid_map.get(sys_orderid, "")
 
-        if not local_orderid:
-            local_orderid = self.new_local_orderid()
-            self.update_orderid_map(local_orderid, sys_orderid)
+            if not local_orderid:
+                local_orderid = self.new_local_orderid()
+                self.update_orderid_map(local_orderid, sys_orderid)
 
         return local_orderid
 
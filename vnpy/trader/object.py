@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from logging import INFO
 
+import numpy as np
+
 from .constant import Direction, Exchange, Interval, Offset, Status, Product, OptionType, OrderType
 
 ACTIVE_STATUSES = set([Status.SUBMITTING, Status.NOTTRADED, Status.PARTTRADED])
@@ -76,6 +78,65 @@ class TickData(BaseData):
         self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
 
 
+@dataclass
+class DepthData(BaseData):
+    """
+    Order book depth data with any number of levels.
+
+    Bids and asks are float arrays of shape (n, 2) with price and volume
+    columns, sorted from best to worst price. If is_delta is True, only
+    changed levels are included and 0 volume means the level is removed.
+    """
+
+    symbol: str
+    exchange: Exchange
+    datetime: datetime
+
+    bids: np.ndarray = None
+    asks: np.ndarray = None
+    is_delta: bool = False
+
+    def __post_init__(self):
+        """"""
+        self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
+
+        if self.bids is None:
+            self.bids = np.zeros((0, 2))
+        if self.asks is None:
+            self.asks = np.zeros((0, 2))
+
+    def apply_delta(self, delta: "DepthData"):
+        """
+        Create new depth data by applying changed levels of delta.
+        """
+        return DepthData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=delta.datetime,
+            bids=merge_levels(self.bids, delta.bids, True),
+            asks=merge_levels(self.asks, delta.asks, False),
+            gateway_name=delta.gateway_name,
+        )
+
+
+def merge_levels(levels: np.ndarray, changes: np.ndarray, descending: bool):
+    """
+    Merge changed (price, volume) levels into sorted levels.
+    """
+    if not len(changes):
+        return levels
+
+    volumes = dict(levels.tolist())
+    for price, volume in changes.tolist():
+        if volume:
+            volumes[price] = volume
+        else:
+            volumes.pop(price, None)
+
+    items = sorted(volumes.items(), reverse=descending)
+    return np.array(items, dtype=float).reshape(-1, 2)
+
+
 @dataclass
 class BarData(BaseData):
     """
@@ -32,6 +32,8 @@ SETTINGS = {
     "database.user": "root",
     "database.password": "",
     "database.authentication_source": "admin",  # for mongodb
+    "database.batch_size": 1000,  # rows in each bulk insert
+    "database.ordered_write": False,  # for mongodb
 }
 
 # Load global setting from json file.
@@ -3,13 +3,17 @@ General utility functions.
 """
 
 import json
+import zlib
+from bisect import bisect_left, insort
+from decimal import Decimal
+from datetime import datetime
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable, List, Sequence, Tuple
 
 import numpy as np
 import talib
 
-from .object import BarData, TickData
+from .object import BarData, DepthData, TickData
 from .constant import Exchange, Interval
 
 
@@ -441,6 +445,195 @@ class ArrayManager(object):
         return up[-1], down[-1]
 
 
+class OrderBookSide:
+    """
+    Price levels of one side of order book, sorted from best to worst price.
+
+    Price of each level is found by binary search, so an update costs
+    O(log n) comparisons no matter how deep the book is.
+    """
+
+    def __init__(self, descending: bool):
+        """Constructor"""
+        self.descending = descending
+
+        # Sort keys in ascending order, price is negated for bid side.
+        self.keys = []
+        self.volumes = {}
+
+    def __len__(self):
+        """"""
+        return len(self.volumes)
+
+    def update(self, price: float, volume: float):
+        """
+        Set volume of a price level, the level is removed if volume is 0.
+        """
+        key = -price if self.descending else price
+
+        if volume:
+            if price not in self.volumes:
+                insort(self.keys, key)
+            self.volumes[price] = volume
+        elif price in self.volumes:
+            del self.volumes[price]
+            del self.keys[bisect_left(self.keys, key)]
+
+    def clear(self):
+        """"""
+        self.keys.clear()
+        self.volumes.clear()
+
+    def prices(self, n: int) -> List[float]:
+        """
+        Get prices of best n levels.
+        """
+        if self.descending:
+            return [-key for key in self.keys[:n]]
+        return self.keys[:n]
+
+    def top(self, n: int) -> List[Tuple[float, float]]:
+        """
+        Get (price, volume) of best n levels.
+        """
+        volumes = self.volumes
+        return [(price, volumes[price]) for price in self.prices(n)]
+
+
+class OrderBook:
+    """
+    For:
+    1. maintaining order book from snapshot and incremental updates
+    2. validating order book with checksum sent by exchange
+    3. updating best levels into tick data and depth data
+    """
+
+    def __init__(self):
+        """Constructor"""
+        self.bids = OrderBookSide(descending=True)
+        self.asks = OrderBookSide(descending=False)
+
+    def clear(self):
+        """"""
+        self.bids.clear()
+        self.asks.clear()
+
+    def apply_snapshot(
+        self,
+        bids: Iterable[Sequence[float]],
+        asks: Iterable[Sequence[float]]
+    ):
+        """
+        Replace all levels with (price, volume, ...) items of snapshot.
+        """
+        self.clear()
+        self.apply_delta(bids, asks)
+
+    def apply_delta(
+        self,
+        bids: Iterable[Sequence[float]],
+        asks: Iterable[Sequence[float]]
+    ):
+        """
+        Update levels with (price, volume, ...) items, 0 volume for removal.
+        """
+        update_bid = self.bids.update
+        for level in bids:
+            update_bid(level[0], level[1])
+
+        update_ask = self.asks.update
+        for level in asks:
+            update_ask(level[0], level[1])
+
+    def top(self, n: int):
+        """
+        Get (price, volume) of best n bid levels and ask levels.
+        """
+        return self.bids.top(n), self.asks.top(n)
+
+    def checksum(self, depth: int = 25, ask_sign: int = 1) -> int:
+        """
+        Signed CRC32 of best levels joined as "bid:bid_volume:ask:ask_volume",
+        which is the format used by Bitfinex and OKEX.
+
+        Bitfinex uses negative amount for ask, set ask_sign to -1 for it.
+        """
+        bids, asks = self.top(depth)
+        parts = []
+
+        for n in range(max(len(bids), len(asks))):
+            if n < len(bids):
+                price, volume = bids[n]
+                parts.append(format_number(price))
+                parts.append(format_number(volume))
+            if n < len(asks):
+                price, volume = asks[n]
+                parts.append(format_number(price))
+                parts.append(format_number(volume * ask_sign))
+
+        value = zlib.crc32(":".join(parts).encode())
+        if value >= 0x80000000:
+            value -= 0x100000000
+        return value
+
+    def to_depth(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        dt: datetime,
+        gateway_name: str,
+        depth: int = 20
+    ) -> DepthData:
+        """
+        Create depth data of best n levels.
+        """
+        bids, asks = self.top(depth)
+
+        return DepthData(
+            symbol=symbol,
+            exchange=exchange,
+            datetime=dt,
+            bids=np.array(bids, dtype=float).reshape(-1, 2),
+            asks=np.array(asks, dtype=float).reshape(-1, 2),
+            gateway_name=gateway_name,
+        )
+
+    def update_tick(self, tick: TickData):
+        """
+        Update best 5 levels into tick data, 0 for levels not existed.
+        """
+        bids, asks = self.top(5)
+
+        for n in range(5):
+            if n < len(bids):
+                price, volume = bids[n]
+            else:
+                price, volume = 0, 0
+            setattr(tick, f"bid_price_{n + 1}", price)
+            setattr(tick, f"bid_volume_{n + 1}", volume)
+
+            if n < len(asks):
+                price, volume = asks[n]
+            else:
+                price, volume = 0, 0
+            setattr(tick, f"ask_price_{n + 1}", price)
+            setattr(tick, f"ask_volume_{n + 1}", volume)
+
+
+def format_number(value: float) -> str:
+    """
+    Convert number into shortest text without exponent, e.g. 1e-05 into
+    0.00001 and 3500.0 into 3500.
+    """
+    text = repr(value)
+
+    if "e" in text:
+        text = format(Decimal(text), "f")
+    if text.endswith(".0"):
+        text = text[:-2]
+    return text
+
+
 def virtual(func: "callable"):
     """
     mark a function as "virtual", which means that this function can be override.